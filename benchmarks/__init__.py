@@ -0,0 +1 @@
+"""Local benchmarks for MatchPoint. Run one with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,102 @@
+"""Knockout bracket layout: a full 128-team draw, and redraws as results come in one at a time.
+
+    python -m benchmarks.bench_bracket --teams 128 --budget-ms 100
+
+Plays a whole knockout. Each result is saved on its own, and the next round's
+match is created once both of its feeders are decided. After every change the
+layout redraws what changed, and its SVG is checked against a layout built from
+scratch for the same state. A full draw must stay inside the budget; asking
+``BracketLayouts`` again for an unchanged bracket is timed too.
+"""
+
+import argparse
+import random
+import time
+
+from matchpoint.bracket import BracketLayout, BracketLayouts, winner
+from matchpoint.standings import KNOCKOUT
+
+
+def knockout(num_teams: int) -> list[dict]:
+    return [
+        {"id": i + 1, "tournament_id": 1, "team_a_id": 2 * i + 1, "team_b_id": 2 * i + 2, "status": "Pending",
+         "bracket": KNOCKOUT, "round_number": 1, "version": 0}
+        for i in range(num_teams // 2)
+    ]
+
+
+def finish(match: dict, rng: random.Random) -> None:
+    a_wins = rng.random() < 0.5
+    match.update(status="Completed", version=match["version"] + 1,
+                 team_a_set1_score=21 if a_wins else rng.randrange(19),
+                 team_b_set1_score=rng.randrange(19) if a_wins else 21)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=128, help="a power of two")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="longest a full draw may take")
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    matches = knockout(args.teams)
+    names = {team: f"Team {team}" for team in range(1, args.teams + 1)}
+
+    started = time.perf_counter()
+    full = BracketLayout(args.teams // 2)
+    full.update(matches, names)
+    full_svg = full.svg()
+    full_ms = (time.perf_counter() - started) * 1000
+    print(f"{args.teams} teams: full layout and draw {full_ms:.1f} ms, {len(full_svg) / 1024:.0f} KiB of SVG")
+    assert full_ms < args.budget_ms, f"a full draw took {full_ms:.1f} ms (budget {args.budget_ms:.0f} ms)"
+
+    layouts = BracketLayouts()
+    layouts.get(1, matches, names)
+    started = time.perf_counter()
+    for _ in range(100):
+        layouts.get(1, matches, names)
+    cached_us = (time.perf_counter() - started) * 1e6 / 100
+
+    layout = BracketLayout(args.teams // 2)
+    layout.update(matches, names)
+    position = {m["id"]: (1, m["id"] - 1) for m in matches}
+    decided = {}
+    pending = list(matches)
+    incremental_ms, rebuild_ms, redrawn = [], [], []
+    while pending:
+        match = pending.pop(rng.randrange(len(pending)))
+        finish(match, rng)
+        round_number, slot = position[match["id"]]
+        decided[(round_number, slot)] = match
+        sibling = decided.get((round_number, slot ^ 1))
+        if sibling is not None:
+            feeders = (match, sibling) if slot % 2 == 0 else (sibling, match)
+            a, b = (winner(m) for m in feeders)
+            following = {"id": len(matches) + 1, "tournament_id": 1, "team_a_id": a, "team_b_id": b, "status": "Pending",
+                         "bracket": KNOCKOUT, "round_number": round_number + 1, "version": 0}
+            matches.append(following)
+            pending.append(following)
+            position[following["id"]] = (round_number + 1, slot // 2)
+
+        started = time.perf_counter()
+        redrawn.append(layout.update(matches, names))
+        svg = layout.svg()
+        incremental_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        fresh = BracketLayout(args.teams // 2)
+        fresh.update(matches, names)
+        rebuild_ms.append((time.perf_counter() - started) * 1000)
+        assert svg == fresh.svg(), f"incremental drawing drifted after match {match['id']}"
+
+    print(f"unchanged bracket   {cached_us:8.1f} us")
+    print(f"one change          {sum(incremental_ms) / len(incremental_ms):8.2f} ms avg, "
+          f"{max(incremental_ms):.2f} ms worst, {sum(redrawn) / len(redrawn):.1f} of "
+          f"{args.teams - 1} boxes redrawn ({len(incremental_ms)} changes)")
+    print(f"full re-layout      {sum(rebuild_ms) / len(rebuild_ms):8.2f} ms avg")
+    print(f"champion: {names[winner(matches[-1])]}")
+
+
+if __name__ == "__main__":
+    main()
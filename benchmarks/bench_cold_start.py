@@ -0,0 +1,87 @@
+"""Cold-start import cost of each page, measured with ``python -X importtime``, against a budget.
+
+    python -m benchmarks.bench_cold_start --budget-ms 50
+
+Every page runs once in a fresh interpreter, the way the first visitor after a
+deploy meets it: once for a visitor who is not signed in and once for a
+signed-in organiser (on the in-memory backend, so no secrets are needed).
+Streamlit itself and a trivial warm-up page (with a page icon, which loads
+Streamlit's emoji table) run first, so what is counted is what the page's own
+imports add. For visitors who are not signed in the run fails if a page loads
+pandas, numpy, pyarrow or the Supabase client, or if its imports take longer
+than the budget.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["app.py", *sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))]
+HEAVY = ("pandas", "numpy", "pyarrow", "supabase", "postgrest")
+# Public pages reach the database without a sign-in, so they may load the client.
+PUBLIC = ("pages/6_Scoreboard.py",)
+MARKER = "matchpoint-cold-start"
+
+RUNNER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+from matchpoint.auth import AuthSession
+
+warm = AppTest.from_string("import streamlit as st\\nst.set_page_config(page_icon='🏆', layout='wide')\\nst.title('x')\\nst.warning('x')\\nst.stop()")
+warm.run()
+before = set(sys.modules)
+print({marker!r}, file=sys.stderr, flush=True)
+at = AppTest.from_file({path!r}, default_timeout=60)
+if {signed_in!r}:
+    at.session_state["auth_session"] = AuthSession("bench", "bench@example.com", "t", "r", time.time() + 3600, {{"role": "admin"}})
+at.run()
+print(json.dumps({{"modules": sorted(set(sys.modules) - before), "exceptions": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def measure(page: str, signed_in: bool) -> dict:
+    """Run one page in a fresh interpreter; microseconds of imports after the marker, and what they were."""
+    code = RUNNER.format(marker=MARKER, path=str(ROOT / page), signed_in=signed_in)
+    env = {**os.environ, "MATCHPOINT_BACKEND": "memory", "PYTHONPATH": str(ROOT)}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, f"{page} failed to run:\n{result.stderr[-2000:]}"
+    lines = result.stderr.splitlines()
+    after = lines[lines.index(MARKER) + 1:]
+    self_us = sum(int(line.split("|")[0].split(":")[1]) for line in after if line.startswith("import time:")
+                  and not line.split("|")[0].split(":")[1].strip().startswith("self"))
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert not report["exceptions"], f"{page} raised: {report['exceptions']}"
+    heavy = sorted({name.split(".")[0] for name in report["modules"] if name.split(".")[0] in HEAVY})
+    return {"ms": self_us / 1000, "modules": len(report["modules"]), "heavy": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="import time a page may add for a visitor who is not signed in")
+    parser.add_argument("--pages", nargs="*", default=PAGES)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'page':<32} {'visitor':<10} {'imports':>9} {'modules':>8}  heavy")
+    for page in args.pages:
+        for signed_in in (False, True):
+            result = measure(page, signed_in)
+            visitor = "signed in" if signed_in else "anonymous"
+            print(f"{page:<32} {visitor:<10} {result['ms']:>6.0f} ms {result['modules']:>8}  {', '.join(result['heavy']) or '-'}")
+            if signed_in or page in PUBLIC:
+                continue
+            if result["heavy"]:
+                failures.append(f"{page} loads {', '.join(result['heavy'])} before the sign-in check")
+            if result["ms"] > args.budget_ms:
+                failures.append(f"{page} adds {result['ms']:.0f} ms of imports (budget {args.budget_ms:.0f} ms)")
+    assert not failures, "cold-start budget exceeded:\n" + "\n".join(failures)
+
+
+if __name__ == "__main__":
+    main()
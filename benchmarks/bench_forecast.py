@@ -0,0 +1,153 @@
+"""Call-time forecasts over a simulated festival day: accuracy, and incremental vs full recompute.
+
+    python -m benchmarks.bench_forecast --tournaments 9 --teams 8 --courts 4
+
+Builds an event timetable, then plays the day: every match starts once its
+court, its teams and its planned slot allow, and takes a random time around
+its sport's (and court's) true length. Starts and completions are written
+through the repository, so the forecasts hear of them from the match broker.
+Each hour, every pending match's forecast start is noted and later compared
+with when it really started, next to just trusting the timetable. After every
+completion the incremental forecast is timed against loading the event afresh.
+
+The run uses a non-UTC local time zone (``--tz``) and writes times in UTC, as
+the database returns them, and checks every forecast reads in local time.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta, timezone
+from datetime import time as clock_time
+
+from benchmarks.synthetic import SPORTS, build_event
+from matchpoint.analytics import FORECAST_COLUMNS, DurationStats, EventForecast, ForecastBook, slot_clock
+from matchpoint.festival import schedule_event
+from matchpoint.memory import MemoryClient
+from matchpoint.realtime import MatchBroker
+from matchpoint.repository import Repository
+
+TRUE_MINUTES = {"Badminton": 27, "Pickleball": 21, "Captain Ball": 38}
+SLOT_MINUTES = 30
+
+
+def play_day(matches: list[dict], sport_of: dict, planned, rng: random.Random) -> dict:
+    """When each match really starts and ends: ``{id: (start, end)}``."""
+    court_free, team_free, times = {}, {}, {}
+    for match in sorted(matches, key=lambda m: (m["time_slot"], m["court_number"], m["id"])):
+        sport = sport_of[match["tournament_id"]]
+        court = (sport, match["court_number"])
+        waits = [planned(match["time_slot"]), court_free.get(court)]
+        waits += [team_free.get(match[side]) for side in ("team_a_id", "team_b_id")]
+        start = max(w for w in waits if w is not None)
+        minutes = max(rng.gauss(TRUE_MINUTES[sport] * (1 + 0.1 * (match["court_number"] - 1)), 4), 5)
+        end = start + timedelta(minutes=minutes)
+        court_free[court] = team_free[match["team_a_id"]] = team_free[match["team_b_id"]] = end
+        times[match["id"]] = (start, end)
+    return times
+
+
+def check_local(rows: list[dict]) -> None:
+    """Planned and expected starts are both local times: the delay is what the desk sees on the clock."""
+    for row in rows:
+        expected, planned = row["expected_start"], row["planned_start"]
+        assert expected.utcoffset() == planned.utcoffset() == expected.astimezone().utcoffset(), \
+            f"match {row['id']}: expected {expected.isoformat()} and planned {planned.isoformat()} mix time zones"
+        wall = (expected.replace(tzinfo=None) - planned.replace(tzinfo=None)).total_seconds() / 60
+        assert abs(wall - row["delay_minutes"]) < 1e-6, f"match {row['id']}: the clock shows a {wall:.0f} min delay"
+
+
+def write(client: MemoryClient, match_id, values: dict) -> None:
+    client.table("matches").update(values).eq("id", match_id).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=9)
+    parser.add_argument("--teams", type=int, default=8)
+    parser.add_argument("--courts", type=int, default=4, help="courts per sport")
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--tz", default="Asia/Kuala_Lumpur", help="local time zone for the run")
+    args = parser.parse_args()
+    os.environ["TZ"] = args.tz
+    time.tzset()
+
+    rng = random.Random(args.seed)
+    tables = build_event(args.tournaments, args.teams, sports=SPORTS, seed=args.seed)
+    for team in tables["teams"]:
+        # Synthetic players share a handful of first names; here every player is in one team only.
+        team.update(player1_name=f"Team {team['id']} A", player2_name=f"Team {team['id']} B")
+    client = MemoryClient(tables)
+    broker = MatchBroker()
+    client.listeners.append(broker.publish_write)
+    repository = Repository(client)
+    tournaments = repository.list_tournaments(1)
+    sport_of = {t["id"]: t["sport"] for t in tournaments}
+    timetable = schedule_event(repository, tournaments, dict.fromkeys(SPORTS, args.courts))
+
+    planned = slot_clock(date(2026, 1, 1), clock_time(9, 0), SLOT_MINUTES)
+    matches = repository.list_matches(list(sport_of), columns=FORECAST_COLUMNS)
+    actual = play_day(matches, sport_of, planned, rng)
+    steps = sorted([(end, 0, "Completed", mid) for mid, (_, end) in actual.items()]
+                   + [(start, 1, "In Progress", mid) for mid, (start, _) in actual.items()])
+    day_end = max(end for _, end in actual.values())
+    print(f"{len(matches)} matches in {timetable.num_slots} slots of {SLOT_MINUTES} min; "
+          f"planned to finish {planned(timetable.num_slots + 1):%H:%M}, really finished {day_end:%H:%M}")
+
+    book = ForecastBook(broker)
+    book.get(repository, 1)
+    checkpoint = planned(1) + timedelta(hours=1)
+    predictions = []
+    incremental_ms, full_ms = [], []
+    for now, _, status, match_id in steps:
+        while checkpoint <= now:
+            for row in book.get(repository, 1).forecast(checkpoint, planned, SLOT_MINUTES):
+                if row["status"] == "Pending":
+                    predictions.append((checkpoint, row["id"], row["expected_start"], row["planned_start"]))
+            checkpoint += timedelta(hours=1)
+        start, end = actual[match_id]
+        values = {"status": status, "start_time": start.astimezone(timezone.utc).isoformat()}
+        if status == "Completed":
+            values["end_time"] = end.astimezone(timezone.utc).isoformat()
+        write(client, match_id, values)
+        if status != "Completed":
+            continue
+
+        started = time.perf_counter()
+        incremental = book.get(repository, 1).forecast(now, planned, SLOT_MINUTES)
+        incremental_ms.append((time.perf_counter() - started) * 1000)
+        check_local(incremental)
+        started = time.perf_counter()
+        rows = repository.list_matches(list(sport_of), columns=FORECAST_COLUMNS)
+        full = EventForecast(sport_of, DurationStats()).load(rows).forecast(now, planned, SLOT_MINUTES)
+        full_ms.append((time.perf_counter() - started) * 1000)
+        assert [(r["id"], r["expected_start"]) for r in incremental] == [(r["id"], r["expected_start"]) for r in full], \
+            f"incremental forecast drifted from a full recompute at {now:%H:%M}"
+
+    print(f"{'hour':>5}  {'pending':>7}  {'forecast MAE':>12}  {'timetable MAE':>13}")
+    forecast_total = timetable_total = 0.0
+    for hour in sorted({at for at, *_ in predictions}):
+        rows = [p for p in predictions if p[0] == hour]
+        forecast_error = sum(abs((expected - actual[mid][0]).total_seconds()) for _, mid, expected, _ in rows) / 60
+        timetable_error = sum(abs((max(plan, hour) - actual[mid][0]).total_seconds()) for _, mid, _, plan in rows) / 60
+        forecast_total += forecast_error
+        timetable_total += timetable_error
+        print(f"{hour:%H:%M}  {len(rows):>7}  {forecast_error / len(rows):>9.1f} min  {timetable_error / len(rows):>10.1f} min")
+    assert forecast_total < timetable_total, "the forecast should beat the timetable once delays build up"
+
+    tournament_of = {m["id"]: m["tournament_id"] for m in matches}
+    for sport, stats in book.stats.by_sport.items():
+        durations = [(end - start).total_seconds() / 60 for mid, (start, end) in actual.items()
+                     if sport_of[tournament_of[mid]] == sport]
+        mean = sum(durations) / len(durations)
+        assert stats.count == len(durations) and abs(stats.mean - mean) < 1e-6, f"{sport} running mean drifted"
+    print(f"per completion: incremental {sum(incremental_ms) / len(incremental_ms):.2f} ms, "
+          f"full reload {sum(full_ms) / len(full_ms):.2f} ms ({len(incremental_ms)} completions)")
+    for row in book.stats.summary():
+        print(f"  {row['sport']:<13} {row['matches']:>4} matches  mean {row['mean_min']:5.1f} min  "
+              f"sd {row['std_min']:4.1f}  p90 <= {row['p90_min']} min")
+
+
+if __name__ == "__main__":
+    main()
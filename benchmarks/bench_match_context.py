@@ -0,0 +1,125 @@
+"""Reads per scoring interaction: full embedded join on every rerun vs. the cached match context.
+
+    python -m benchmarks.bench_match_context --interactions 40 --write-every 2
+
+Each interaction is one rerun of the Scoring page, showing the match. Every
+``--write-every``-th one also queues a point that the outbox then delivers; the
+others stand for reruns that change nothing (picking the set, opening the
+history). Only the page's reads are compared; the score writes are the same
+either way. Two umpires sharing one outbox then check that each counts only
+its own saves, so the other's save shows as a conflict.
+"""
+
+import argparse
+import json
+
+from matchpoint.match_context import MatchContext
+from matchpoint.memory import MemoryClient
+from matchpoint.outbox import ScoreOutbox
+from matchpoint.realtime import MatchBroker
+from matchpoint.repository import Repository
+from matchpoint.scoring import point, start
+
+
+class MeteredClient(MemoryClient):
+    """Counts the JSON bytes of every response, roughly what PostgREST would send."""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.bytes = 0
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def metered_execute():
+            response = execute()
+            self.bytes += len(json.dumps(response.data, default=str))
+            return response
+
+        query.execute = metered_execute
+        return query
+
+
+def make_client() -> MeteredClient:
+    tournament = {"id": 1, "event_id": 1, "name": "Men's Doubles - Open", "sport": "Badminton",
+                  "match_type": "Mens Doubles", "num_brackets": 2, "status": "In Progress",
+                  "description": "Open category, best of three sets to 21. " * 4,
+                  "created_at": "2026-01-01T08:00:00+00:00"}
+    teams = [{"id": i, "tournament_id": 1, "team_name": f"Shuttle Squad {i}",
+              "player1_name": f"Player {i} Alpha Longname", "player2_name": f"Player {i} Beta Longname",
+              "reserve_man_1_name": f"Reserve {i} M1", "reserve_man_2_name": f"Reserve {i} M2",
+              "reserve_woman_1_name": f"Reserve {i} W1", "created_at": "2026-01-01T08:00:00+00:00"}
+             for i in (1, 2)]
+    match = {"id": 1, "tournament_id": 1, "team_a_id": 1, "team_b_id": 2, "status": "Pending",
+             "bracket": "Bracket A", "round_number": 1, "court_number": 3, "time_slot": 2,
+             "created_at": "2026-01-01T08:00:00+00:00"}
+    return MeteredClient({"tournaments": [tournament], "teams": teams, "matches": [match]})
+
+
+def run(interactions: int, write_every: int, cached: bool) -> tuple[int, int]:
+    client = make_client()
+    repository = Repository(client)
+    outbox = ScoreOutbox()
+    reads = {"round_trips": 0, "bytes": 0}
+
+    def measured(func, *args):
+        before_trips, before_bytes = client.round_trips, client.bytes
+        result = func(*args)
+        reads["round_trips"] += client.round_trips - before_trips
+        reads["bytes"] += client.bytes - before_bytes
+        return result
+
+    context = measured(MatchContext.load, repository, 1) if cached else None
+    for i in range(interactions):
+        if cached:
+            measured(context.refresh, repository, outbox, [])
+            match = context.current(outbox)
+        else:
+            match = measured(repository.get_match, 1)
+        assert match["team_a"]["team_name"] and match["tournaments"]["sport"] == "Badminton"
+        if i % write_every == 0:
+            events = [start()] if i == 0 else [point("ab"[i % 2], 1)]
+            context.enqueue(outbox, events) if cached else outbox.enqueue(1, events)
+            outbox.flush(repository)
+    return reads["round_trips"], reads["bytes"]
+
+
+def check_two_umpires() -> None:
+    """Saves from another session in the same process are someone else's, not ours."""
+    client = make_client()
+    broker = MatchBroker()
+    client.listeners.append(broker.publish_write)
+    repository = Repository(client)
+    outbox = ScoreOutbox()
+    subscription = broker.subscribe()
+    mine, theirs = MatchContext.load(repository, 1), MatchContext.load(repository, 1)
+    seen = mine.position()
+    mine.enqueue(outbox, [start()])
+    outbox.flush(repository)
+    mine.refresh(repository, outbox, subscription.drain())
+    assert not mine.written_by_others(seen), "our own save was taken for someone else's"
+    seen = mine.position()
+    theirs.enqueue(outbox, [point("a", 1)])
+    outbox.flush(repository)
+    mine.refresh(repository, outbox, subscription.drain())
+    assert mine.written_by_others(seen), "the other umpire's save in this process went unnoticed"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interactions", type=int, default=40)
+    parser.add_argument("--write-every", type=int, default=2)
+    args = parser.parse_args()
+
+    before = run(args.interactions, args.write_every, cached=False)
+    after = run(args.interactions, args.write_every, cached=True)
+    for label, (trips, size) in [("get_match every rerun", before), ("cached match context", after)]:
+        print(f"{label:<22} reads={trips:>4} round trips  {size:>7} bytes  "
+              f"({trips / args.interactions:.2f} trips, {size / args.interactions:.0f} bytes per interaction)")
+    assert after[1] < before[1], "the cached context should read fewer bytes"
+    check_two_umpires()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Queued scoring against a backend that keeps dropping requests.
+
+    python -m benchmarks.bench_outbox --courts 6 --events 100 --failure-rate 0.3
+
+Half of the simulated failures happen after the database applied the write
+(the reply is lost), which is the case idempotency keys exist for. The first
+court's scores are also refused outright (``--reject-first``) until the run
+lets them through: the other courts must drain in the meantime, and the
+refused batch must wait as failed until it is retried.
+"""
+
+import argparse
+import random
+import time
+
+from matchpoint.memory import MemoryAPIError, MemoryClient
+from matchpoint.outbox import ScoreOutbox
+from matchpoint.repository import Repository
+from matchpoint.scoring import derive, point, set_score, start
+
+
+class FlakyClient(MemoryClient):
+    """A MemoryClient whose requests fail at random, before or after they are applied."""
+
+    def __init__(self, tables, failure_rate: float, seed: int):
+        super().__init__(tables)
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.failed = 0
+        self.rejected = set()
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def flaky_execute():
+            roll = self.rng.random()
+            if roll < self.failure_rate / 2:
+                self.failed += 1
+                raise ConnectionError("network unreachable")
+            response = execute()
+            if roll < self.failure_rate:
+                self.failed += 1
+                raise TimeoutError("reply lost")
+            return response
+
+        query.execute = flaky_execute
+        if name == "score_events":
+            insert = query.insert
+
+            def checked_insert(rows):
+                if any(row["match_id"] in self.rejected for row in rows):
+                    raise MemoryAPIError("new row violates row-level security policy", "42501")
+                return insert(rows)
+
+            query.insert = checked_insert
+        return query
+
+
+def numbered(events):
+    """Number events 1..n so they can be replayed without a database."""
+    return [{"created_at": None, **event, "seq": seq} for seq, event in enumerate(events, start=1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courts", type=int, default=6)
+    parser.add_argument("--events", type=int, default=100, help="score events per court")
+    parser.add_argument("--failure-rate", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=12)
+    parser.add_argument("--reject-first", action=argparse.BooleanOptionalAction, default=True,
+                        help="refuse the first court's scores until the others are in")
+    args = parser.parse_args()
+
+    matches = [{"id": m, "tournament_id": 1, "team_a_id": 1, "team_b_id": 2, "status": "Pending"}
+               for m in range(1, args.courts + 1)]
+    client = FlakyClient({"matches": matches}, args.failure_rate, args.seed)
+    if args.reject_first:
+        client.rejected.add(1)
+    repository = Repository(client)
+    outbox = ScoreOutbox(base_delay=0.0, batch_size=200)
+
+    rng = random.Random(args.seed)
+    queued = {m["id"]: [start()] for m in matches}
+    for _ in range(args.courts * (args.events - 1)):
+        match_id = rng.randrange(1, args.courts + 1)
+        if rng.random() < 0.05:
+            queued[match_id].append(set_score(rng.choice("ab"), rng.choice((1, 2, 3)), rng.randrange(22)))
+        else:
+            queued[match_id].append(point(rng.choice("ab"), rng.choice((1, 2, 3))))
+    for match_id, events in queued.items():
+        # One court at a time, as each umpire's screen would enqueue them.
+        for event in events:
+            outbox.enqueue(match_id, [event])
+    total = outbox.pending()
+
+    started = time.perf_counter()
+    attempts = 0
+    while outbox.pending():
+        attempts += 1
+        outbox.flush(repository)
+        assert attempts < 10_000, "the queue never drained"
+        if client.rejected and outbox.failed() and outbox.pending() == len(outbox.pending_events(1)):
+            # Everything else got through around the refused court; let it in and send its batch again.
+            print(f"court 1 refused: {outbox.failed()[0]['events']} events failed, the other courts drained")
+            client.rejected.clear()
+            outbox.retry(1)
+    assert not outbox.failed(), f"batches left failed: {outbox.failed()}"
+    elapsed = time.perf_counter() - started
+
+    log = client.tables["score_events"]
+    keys = [event["key"] for event in log]
+    assert len(keys) == len(set(keys)) == total, f"expected {total} events, found {len(keys)} ({len(set(keys))} unique)"
+    for match in client.tables["matches"]:
+        events = [event for event in log if event["match_id"] == match["id"]]
+        replayed = derive(events)
+        expected = derive(numbered(queued[match["id"]]))
+        assert all(match.get(column) == value for column, value in replayed.items()), "row differs from its log"
+        assert {k: v for k, v in replayed.items() if k != "start_time"} == \
+               {k: v for k, v in expected.items() if k != "start_time"}, "final score differs from what was entered"
+
+    print(f"events={total} courts={args.courts} failures injected={client.failed} flush attempts={attempts}")
+    print(f"round trips={client.round_trips} (a direct write per event would need >= {2 * total}) "
+          f"elapsed={elapsed * 1000:.0f} ms, nothing lost or duplicated")
+
+
+if __name__ == "__main__":
+    main()
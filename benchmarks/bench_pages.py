@@ -0,0 +1,183 @@
+"""Round trips, time and memory per page, from scripted Streamlit AppTest runs.
+
+    python -m benchmarks.bench_pages --tournaments 8 --teams 60 --latency 0.005
+    python -m benchmarks.bench_pages --save baseline.json
+    python -m benchmarks.bench_pages --baseline baseline.json
+
+Every page runs against its own ``MemoryClient`` (so it starts with a cold
+cache) filled by ``benchmarks.synthetic``, and is driven through a short
+script of clicks: the first run, then the reruns a user would cause. A run
+with ``--baseline`` fails if any page now needs more round trips than the
+saved results, or is more than ``--time-tolerance`` slower.
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import SPORTS, build_event, make_repository
+from matchpoint import connection
+from matchpoint.auth import AuthSession
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def click(key):
+    return lambda at: at.button(key=key).click()
+
+
+def click_label(label):
+    return lambda at: next(b for b in at.button if b.label == label and not b.disabled).click()
+
+
+SCENARIOS = {
+    "Admin Dashboard": ("pages/2_Admin_Dashboard.py", []),
+    "Team Registration": ("pages/3_Team_Registration.py", [
+        ("next page", click("team_next")),
+        ("search", lambda at: at.text_input(key="team_search_1").input("Team 1")),
+    ]),
+    "Match Management": ("pages/4_Match_Management.py", [
+        ("next page", click("match_next_1")),
+        ("status filter", lambda at: at.selectbox(key="match_status_1").select("Pending")),
+        ("select match", click_label("Score this Match")),
+        ("team search", lambda at: at.text_input(key="match_search_1").input("Team 3")),
+    ]),
+    "Scoring": ("pages/5_Scoring.py", [
+        ("+1 team a", click("point_a")),
+        ("+1 team b", click("point_b")),
+        ("+1 team a", click("point_a")),
+        ("save", click_label("Save Final Score")),
+    ]),
+    "Scoreboard": ("pages/6_Scoreboard.py", []),
+}
+
+
+def wait_for_outbox(timeout: float = 10.0) -> None:
+    """Let queued score events reach the database so their writes count for the step that queued them."""
+    outbox = connection.get_score_outbox()
+    deadline = time.monotonic() + timeout
+    while outbox.pending() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def open_page(tables: dict, path: str, latency: float) -> tuple[AppTest, object]:
+    repository = make_repository(tables, latency)
+    connection.set_repository(repository)
+    pending = [m for m in repository.client.tables["matches"] if m["status"] == "Pending"]
+    at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=60)
+    at.session_state["auth_session"] = AuthSession("bench", "bench@example.com", "token", "refresh",
+                                                   time.time() + 3600, {"role": "admin"})
+    at.session_state["selected_match_id"] = pending[0]["id"]
+    return at, repository.client
+
+
+def warm_up(tables: dict, pages: list) -> None:
+    """Run every page once untimed, so module imports are not charged to the first page measured."""
+    for page in pages:
+        at, _ = open_page(tables, SCENARIOS[page][0], 0.0)
+        at.run()
+    connection.set_repository(None)
+
+
+def play(tables: dict, path: str, steps: list, latency: float, traced: bool) -> list[dict]:
+    """Run the page's script once, measuring each step; ``traced`` measures peak memory instead of time."""
+    at, client = open_page(tables, path, latency)
+    runs = []
+    if traced:
+        tracemalloc.start()
+    for label, action in [("first run", None)] + steps:
+        before = client.round_trips
+        if traced:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        (action(at) if action else at).run()
+        if path.endswith("Scoring.py"):
+            wait_for_outbox()
+        elapsed = time.perf_counter() - start
+        failures = [e.value for e in at.exception] + [e.value for e in at.error]
+        assert not failures, f"{path} failed at '{label}': {failures}"
+        run = {"step": label, "round_trips": client.round_trips - before}
+        run.update({"peak_kib": tracemalloc.get_traced_memory()[1] / 1024} if traced else {"ms": elapsed * 1000})
+        runs.append(run)
+    if traced:
+        tracemalloc.stop()
+    connection.set_repository(None)
+    return runs
+
+
+def run_page(tables: dict, path: str, steps: list, latency: float) -> dict:
+    # tracemalloc slows Streamlit down several times over, so time and memory come from separate runs.
+    runs = play(tables, path, steps, latency, traced=False)
+    for run, traced in zip(runs, play(tables, path, steps, 0.0, traced=True)):
+        run["peak_kib"] = traced["peak_kib"]
+    reruns = runs[1:] or runs
+    return {
+        "cold_round_trips": runs[0]["round_trips"],
+        "rerun_round_trips": sum(r["round_trips"] for r in reruns) / len(reruns),
+        "ms": sum(r["ms"] for r in runs) / len(runs),
+        "max_ms": max(r["ms"] for r in runs),
+        "peak_kib": max(r["peak_kib"] for r in runs),
+        "steps": runs,
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float) -> list[str]:
+    regressions = []
+    for page, result in results.items():
+        before = baseline.get(page)
+        if before is None:
+            continue
+        for metric in ("cold_round_trips", "rerun_round_trips"):
+            if result[metric] > before[metric]:
+                regressions.append(f"{page}: {metric} {before[metric]:g} -> {result[metric]:g}")
+        if result["ms"] > before["ms"] * (1 + time_tolerance):
+            regressions.append(f"{page}: {before['ms']:.0f} ms -> {result['ms']:.0f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=8)
+    parser.add_argument("--teams", type=int, default=60, help="teams per tournament, more than one page of them")
+    parser.add_argument("--brackets", type=int, default=4)
+    parser.add_argument("--completed", type=float, default=0.3, help="fraction of matches already scored")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated seconds per round trip")
+    parser.add_argument("--pages", help="comma-separated page names (default: all)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    args = parser.parse_args()
+
+    # Scoring runs on tournament 1, so keep it a set-based sport.
+    tables = build_event(args.tournaments, args.teams, num_brackets=args.brackets, num_courts=2,
+                         completed=args.completed, sports=SPORTS)
+    pages = args.pages.split(",") if args.pages else list(SCENARIOS)
+    print(f"{len(tables['matches'])} matches, {len(tables['teams'])} teams, latency {args.latency * 1000:.0f} ms")
+    print(f"{'page':<18} {'cold trips':>10} {'rerun trips':>11} {'avg ms':>8} {'max ms':>8} {'peak KiB':>9}")
+
+    warm_up(tables, pages)
+    results = {}
+    for page in pages:
+        path, steps = SCENARIOS[page]
+        results[page] = result = run_page(tables, path, steps, args.latency)
+        print(f"{page:<18} {result['cold_round_trips']:>10} {result['rerun_round_trips']:>11.1f} "
+              f"{result['ms']:>8.1f} {result['max_ms']:>8.1f} {result['peak_kib']:>9.0f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"saved {args.save}")
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.time_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        assert not regressions, f"{len(regressions)} regression(s) against {args.baseline}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Rerun cost of the team and match lists: the whole tournament vs one filtered page.
+
+    python -m benchmarks.bench_paging --sizes 25,50,100,300 --latency 0.02
+
+Each size is one round-robin tournament with that many teams (300 teams is
+about 45k matches). A "rerun" loads what the Team Registration and Match
+Management pages put on screen. The paged lists should fetch the same number of
+rows however big the tournament gets. Its time still creeps up here because
+``MemoryClient`` scans the whole table for every filter; Postgres uses the
+tournament_id index.
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import build_event
+from matchpoint.memory import MemoryClient
+from matchpoint.paging import KeysetPager
+from matchpoint.repository import Repository
+
+
+def full_rerun(repository: Repository) -> int:
+    teams = repository.client.table("teams").select("*").eq("tournament_id", 1).execute().data
+    matches = repository.matches_by_tournament([1])[1]
+    return len(teams) + len(matches)
+
+
+def paged_rerun(repository: Repository, page_size: int) -> int:
+    teams, _ = repository.page_teams(1, "team 1", limit=page_size)
+    matches, _ = repository.page_matches(1, status="Pending", team_ids=[1, 2, 3], limit=page_size)
+    return len(teams) + len(matches)
+
+
+def measure(client: MemoryClient, rerun) -> tuple[int, int, float]:
+    client.round_trips = 0
+    start = time.perf_counter()
+    rows = rerun()
+    return client.round_trips, rows, time.perf_counter() - start
+
+
+def check_pages(repository: Repository, page_size: int) -> None:
+    """Walking every page with filters gives exactly the filtered rows, in id order."""
+    matches = repository.client.tables["matches"]
+    expected = [m["id"] for m in matches if m["status"] == "Pending" and {m["team_a_id"], m["team_b_id"]} & {1, 2}]
+    pager, seen = KeysetPager(page_size), []
+    pager.use_filters(("Pending", (1, 2)))
+    while True:
+        rows, remaining = repository.page_matches(1, status="Pending", team_ids=[1, 2], after=pager.after, limit=page_size)
+        pager.loaded(rows, remaining)
+        assert pager.total == len(expected), "count is off"
+        seen += [m["id"] for m in rows]
+        if not pager.has_next:
+            break
+        pager.next_page()
+    assert seen == expected, "keyset pages skipped or repeated rows"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="25,50,100,300", help="comma-separated teams per tournament")
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated seconds per round trip")
+    args = parser.parse_args()
+
+    paged_rows = set()
+    for size in map(int, args.sizes.split(",")):
+        client = MemoryClient(build_event(1, size))
+        repository = Repository(client)
+        check_pages(repository, args.page_size)
+        client.latency = args.latency
+        full = measure(client, lambda: full_rerun(repository))
+        paged = measure(client, lambda: paged_rerun(repository, args.page_size))
+        paged_rows.add(paged[1])
+        print(f"{size:>4} teams {len(client.tables['matches']):>6} matches | "
+              f"full: trips={full[0]} rows={full[1]:<6} {full[2] * 1000:7.1f} ms | "
+              f"paged: trips={paged[0]} rows={paged[1]:<3} {paged[2] * 1000:6.1f} ms")
+    assert max(paged_rows) <= 2 * args.page_size, "a paged rerun fetched more than one page per list"
+
+
+if __name__ == "__main__":
+    main()
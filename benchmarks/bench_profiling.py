@@ -0,0 +1,50 @@
+"""Cost of the profiling hooks per query, with no profile running and with one.
+
+    python -m benchmarks.bench_profiling --queries 20000
+
+With no profile running (panel off, no ``MATCHPOINT_PROFILE_LOG``), a query
+should cost the same as calling ``execute()`` directly.
+"""
+
+import argparse
+import time
+
+from matchpoint import profiling
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+
+
+def per_query_us(repository: Repository, queries: int, direct: bool = False) -> float:
+    client = repository.client
+    start = time.perf_counter()
+    for _ in range(queries):
+        query = client.table("events").select("id").eq("id", 1)
+        if direct:
+            query.execute()
+        else:
+            repository._execute(query)
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    repository = Repository(MemoryClient({"events": [{"id": 1, "event_name": "Open", "event_date": "2026-01-01"}]}))
+    per_query_us(repository, args.queries)  # warm-up
+    direct = per_query_us(repository, args.queries, direct=True)
+    off = per_query_us(repository, args.queries)
+    profile = profiling.begin("bench")
+    on = per_query_us(repository, args.queries)
+    summary = profiling.finish(profile)
+
+    print(f"execute() directly {direct:6.2f} us/query")
+    print(f"profiling off      {off:6.2f} us/query (+{off - direct:.2f})")
+    print(f"profiling on       {on:6.2f} us/query (+{on - direct:.2f})")
+    assert summary["round_trips"] == args.queries
+    assert off - direct < 0.1 * direct + 0.5, "the hook should be negligible when no profile is running"
+
+
+if __name__ == "__main__":
+    main()
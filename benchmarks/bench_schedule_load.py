@@ -0,0 +1,54 @@
+"""Round trips for loading an event's match schedule: one query per tournament vs one query.
+
+    python -m benchmarks.bench_schedule_load --tournaments 30 --latency 0.02
+    python -m benchmarks.bench_schedule_load --snapshot festival.zip
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic import build_event
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.snapshot import import_event
+
+
+def load_per_tournament(client: MemoryClient, tournament_ids: list) -> dict:
+    """The old page behaviour: one ``select("*")`` per tournament."""
+    return {tid: client.table("matches").select("*").eq("tournament_id", tid).execute().data
+            for tid in tournament_ids}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=30)
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated seconds per round trip")
+    parser.add_argument("--snapshot", help="load the event from a snapshot bundle instead of generating one")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        client = MemoryClient()
+        import_event(Repository(client), args.snapshot)
+        client.latency = args.latency
+    else:
+        client = MemoryClient(build_event(args.tournaments, args.teams), latency=args.latency)
+    repository = Repository(client)
+    tournament_ids = [t["id"] for t in client.tables["tournaments"]]
+
+    results = {}
+    for name, load in [("per tournament (N queries)", lambda: load_per_tournament(client, tournament_ids)),
+                       ("batched (1 query)", lambda: repository.matches_by_tournament(tournament_ids))]:
+        client.round_trips = 0
+        start = time.perf_counter()
+        results[name] = load()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28} round trips={client.round_trips:<4} time={elapsed * 1000:8.1f} ms")
+
+    old, new = results.values()
+    assert {tid: [m["id"] for m in rows] for tid, rows in old.items()} == \
+           {tid: [m["id"] for m in rows] for tid, rows in new.items()}, "batched load returned different matches"
+
+
+if __name__ == "__main__":
+    main()
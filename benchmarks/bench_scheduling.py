@@ -0,0 +1,58 @@
+"""Scaling of the round-robin fixture generator, with a correctness check per size.
+
+    python -m benchmarks.bench_scheduling --sizes 16 64 200 400 --courts 8
+"""
+
+import argparse
+import itertools
+import time
+from collections import Counter
+
+from matchpoint.scheduling import assign_brackets, generate_fixtures
+
+
+def check(fixtures, team_ids, num_brackets):
+    """Every pair inside a bracket meets exactly once and no team plays twice in a slot."""
+    pairs = Counter(frozenset((a, b)) for a, b in zip(fixtures.team_a, fixtures.team_b))
+    expected = Counter()
+    index_of = {team_id: i for i, team_id in enumerate(team_ids)}
+    for members in assign_brackets(team_ids, num_brackets):
+        expected.update(frozenset((index_of[a], index_of[b])) for a, b in itertools.combinations(members, 2))
+    assert pairs == expected, "fixture list does not match a complete round robin"
+
+    busy = Counter()
+    for slot, a, b in zip(fixtures.slot, fixtures.team_a, fixtures.team_b):
+        busy[(slot, a)] += 1
+        busy[(slot, b)] += 1
+    assert max(busy.values(), default=1) == 1, "a team is booked twice in one time slot"
+
+    courts = Counter(zip(fixtures.slot, fixtures.court))
+    assert max(courts.values(), default=1) == 1, "a court is booked twice in one time slot"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 200, 400])
+    parser.add_argument("--courts", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'brackets':>8} {'matches':>8} {'slots':>6} {'generate ms':>12} {'rows ms':>9}")
+    for size in args.sizes:
+        team_ids = list(range(1000, 1000 + size))
+        for num_brackets in (0, 4):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                fixtures = generate_fixtures(team_ids, num_brackets, args.courts)
+                best = min(best, time.perf_counter() - start)
+            start = time.perf_counter()
+            rows = list(fixtures.rows(tournament_id=1))
+            rows_time = time.perf_counter() - start
+            check(fixtures, team_ids, num_brackets)
+            slots = max(fixtures.slot, default=-1) + 1
+            print(f"{size:>6} {num_brackets:>8} {len(rows):>8} {slots:>6} {best * 1000:>12.1f} {rows_time * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
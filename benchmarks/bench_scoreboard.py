@@ -0,0 +1,105 @@
+"""Load test for the public scoreboard: many concurrent viewers, one shared snapshot.
+
+    python -m benchmarks.bench_scoreboard --viewers 500 --duration 10
+    python -m benchmarks.bench_scoreboard --apptest 20
+
+Viewers are threads that fetch the snapshot and build the rows the page
+renders, at a random interval each. ``--apptest N`` instead runs the real page
+N times through Streamlit's AppTest and times whole script runs.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.bench_schedule_load import build_event
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.scoreboard import ScoreboardCache
+
+
+def percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def seeded_client(latency: float) -> MemoryClient:
+    tables = build_event(num_tournaments=20, teams_per_tournament=10)
+    rng = random.Random(1)
+    for match in tables["matches"]:
+        match["status"] = rng.choice(["Pending", "Pending", "In Progress", "Completed"])
+        match["court_number"] = rng.randint(1, 12)
+        if match["status"] != "Pending":
+            match["team_a_set1_score"], match["team_b_set1_score"] = rng.randint(0, 21), rng.randint(0, 21)
+    return MemoryClient(tables, latency=latency)
+
+
+def run_viewers(args):
+    client = seeded_client(args.latency)
+    scoreboard = ScoreboardCache(Repository(client), refresh_seconds=args.refresh)
+    latencies, lock = [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def viewer(seed):
+        rng = random.Random(seed)
+        mine = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            snapshot = scoreboard.get(1)
+            rows = [{"Court": m["court"], "Team A": m["team_a"], "Team B": m["team_b"], "Score": m["score"]}
+                    for m in snapshot["live"] + snapshot["recent"]]
+            assert rows is not None
+            mine.append(time.perf_counter() - start)
+            time.sleep(rng.uniform(0.5, 1.5) * args.interval)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=viewer, args=(i,)) for i in range(args.viewers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"viewers={args.viewers} renders={len(latencies)} snapshot builds={scoreboard.builds} "
+          f"db round trips={client.round_trips}")
+    print(f"render latency p50={percentile(latencies, 0.5) * 1000:.2f} ms "
+          f"p99={percentile(latencies, 0.99) * 1000:.2f} ms max={max(latencies) * 1000:.2f} ms")
+
+
+def run_apptest(args):
+    from streamlit.testing.v1 import AppTest
+
+    from matchpoint import connection
+
+    client = seeded_client(args.latency)
+    connection.set_repository(Repository(client))
+    timings = []
+    for _ in range(args.apptest):
+        page = AppTest.from_file("../pages/6_Scoreboard.py", default_timeout=60)
+        start = time.perf_counter()
+        page.run()
+        timings.append(time.perf_counter() - start)
+        assert not page.exception, page.exception
+    print(f"sessions={args.apptest} db round trips={client.round_trips}")
+    print(f"page run p50={statistics.median(timings) * 1000:.1f} ms p99={percentile(timings, 0.99) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--interval", type=float, default=1.0, help="mean seconds between a viewer's renders")
+    parser.add_argument("--refresh", type=float, default=3.0, help="snapshot refresh period in seconds")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated seconds per round trip")
+    parser.add_argument("--apptest", type=int, default=0, help="run the page N times through AppTest instead")
+    args = parser.parse_args()
+    if args.apptest:
+        run_apptest(args)
+    else:
+        run_viewers(args)
+
+
+if __name__ == "__main__":
+    main()
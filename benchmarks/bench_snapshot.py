@@ -0,0 +1,87 @@
+"""Export and re-import a large event as a snapshot bundle.
+
+    python -m benchmarks.bench_snapshot --tournaments 20 --teams 33 --save festival.zip
+
+The export's peak memory should stay flat as the event grows, because rows are
+paged out ``--page-size`` at a time. Use ``--save`` to keep the bundle as a
+fixture for other benchmarks (``bench_schedule_load --snapshot festival.zip``).
+"""
+
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+from benchmarks.synthetic import build_event
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.snapshot import export_event, import_event
+
+FIRST_NAMES = ["Aiden", "Bella", "Chen", "Dara", "Eli", "Farah", "Gus", "Hana", "Ivan", "Jia"]
+
+
+def make_repository(num_tournaments: int, teams_per_tournament: int, seed: int) -> Repository:
+    rng = random.Random(seed)
+    tables = build_event(num_tournaments, teams_per_tournament)
+    for team in tables["teams"]:
+        team["player1_name"], team["player2_name"] = rng.sample(FIRST_NAMES, 2)
+    for match in tables["matches"][::3]:
+        match.update(status="Completed", team_a_set1_score=21, team_b_set1_score=rng.randrange(21))
+    return Repository(MemoryClient(tables))
+
+
+def measure_export(repository: Repository, page_size: int) -> tuple[bytes, dict, float, int]:
+    buffer = io.BytesIO()
+    tracemalloc.start()
+    start = time.perf_counter()
+    counts = export_event(repository, 1, buffer, page_size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The bundle itself lives in the BytesIO; subtract it to see the exporter's own working set.
+    return buffer.getvalue(), counts, elapsed, peak - len(buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=33, help="teams per tournament (round robin)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--save", help="write the exported bundle to this path")
+    parser.add_argument("--seed", type=int, default=14)
+    args = parser.parse_args()
+
+    small = make_repository(max(args.tournaments // 4, 1), args.teams, args.seed)
+    measure_export(small, args.page_size)  # warm-up: first use of pyarrow allocates its own buffers
+    _, small_counts, _, small_peak = measure_export(small, args.page_size)
+    repository = make_repository(args.tournaments, args.teams, args.seed)
+    bundle, counts, elapsed, peak = measure_export(repository, args.page_size)
+    print(f"export: {counts['matches']} matches, {counts['teams']} teams -> {len(bundle) / 1024:.0f} KiB "
+          f"in {elapsed * 1000:.0f} ms, working memory {peak / 1024:.0f} KiB "
+          f"({small_peak / 1024:.0f} KiB for {small_counts['matches']} matches)")
+    assert peak < 2 * small_peak + 1_000_000, "export memory grows with the event"
+
+    target = Repository(MemoryClient())
+    start = time.perf_counter()
+    event = import_event(target, io.BytesIO(bundle), event_name="Festival (copy)", page_size=args.page_size)
+    elapsed = time.perf_counter() - start
+    print(f"import: new event {event['id']} with {event['matches']} matches in {elapsed * 1000:.0f} ms, "
+          f"round trips={target.client.round_trips}")
+
+    source, copy = repository.client.tables, target.client.tables
+    assert len(copy["matches"]) == len(source["matches"]) and len(copy["teams"]) == len(source["teams"])
+    names = {t["id"]: t["team_name"] for t in copy["teams"]}
+    original_names = {t["id"]: t["team_name"] for t in source["teams"]}
+    assert [(names[m["team_a_id"]], names[m["team_b_id"]], m["team_b_set1_score"]) for m in copy["matches"]] == \
+           [(original_names[m["team_a_id"]], original_names[m["team_b_id"]], m.get("team_b_set1_score"))
+            for m in source["matches"]], "ids were not remapped consistently"
+
+    if args.save:
+        with open(args.save, "wb") as file:
+            file.write(bundle)
+        print(f"saved {args.save}")
+
+
+if __name__ == "__main__":
+    main()
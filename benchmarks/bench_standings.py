@@ -0,0 +1,65 @@
+"""Incremental standings vs a full recompute: equality check and cost per saved match.
+
+    python -m benchmarks.bench_standings --teams 32 --brackets 4 --corrections 200
+"""
+
+import argparse
+import random
+import time
+
+from matchpoint.scheduling import generate_fixtures
+from matchpoint.standings import KNOCKOUT, Standings
+
+
+def random_score(rng: random.Random, match: dict) -> dict:
+    sets = {}
+    wins_a = wins_b = 0
+    for n in (1, 2, 3):
+        if max(wins_a, wins_b) == 2:
+            break
+        loser = rng.randint(0, 19)
+        a, b = (21, loser) if rng.random() < 0.5 else (loser, 21)
+        wins_a += a > b
+        wins_b += b > a
+        sets[f"team_a_set{n}_score"], sets[f"team_b_set{n}_score"] = a, b
+    return {**match, **{f"team_{s}_set{n}_score": None for s in "ab" for n in (1, 2, 3)}, **sets, "status": "Completed"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--brackets", type=int, default=4)
+    parser.add_argument("--corrections", type=int, default=200, help="re-saves of already completed matches")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fixtures = generate_fixtures(list(range(1, args.teams + 1)), args.brackets)
+    matches = [{**row, "id": i} for i, row in enumerate(fixtures.rows(tournament_id=1), start=1)]
+
+    saves = [random_score(rng, m) for m in rng.sample(matches, len(matches))]
+    saves += [random_score(rng, rng.choice(matches)) for _ in range(args.corrections)]
+
+    incremental = Standings.rebuild(1, matches)
+    latest = {m["id"]: m for m in matches}
+    apply_time = recompute_time = 0.0
+    for i, saved in enumerate(saves):
+        latest[saved["id"]] = saved
+        start = time.perf_counter()
+        incremental.apply(saved)
+        apply_time += time.perf_counter() - start
+        if i % 50 == 0 or i == len(saves) - 1:
+            start = time.perf_counter()
+            full = Standings.rebuild(1, list(latest.values()))
+            recompute_time = time.perf_counter() - start
+            assert incremental.snapshot() == full.snapshot(), f"incremental standings diverged after save {i}"
+
+    assert incremental.group_stage_complete()
+    pairings = incremental.knockout_pairings()
+    print(f"matches={len(matches)} saves={len(saves)} "
+          f"apply={apply_time / len(saves) * 1e6:.1f} us/save full recompute={recompute_time * 1e3:.2f} ms")
+    print(f"knockout round 1 ({KNOCKOUT}): {pairings}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Event overview: the trigger-maintained summary vs counting every match client-side.
+
+    python -m benchmarks.bench_summary --tournaments 20 --teams 24 --updates 2000
+
+Scores a random stream of matches through the scoring log (start, points,
+complete) and registers late teams, then checks that the incrementally kept
+summary equals one rebuilt from scratch, and compares what each way of building
+the overview reads.
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.bench_match_context import MeteredClient
+from benchmarks.synthetic import build_event
+from matchpoint.repository import Repository
+from matchpoint.scoring import complete, point, record, start
+from matchpoint.summary import COUNTERS, SummaryTrigger, event_totals
+
+
+def overview_from_matches(repository: Repository, event_id) -> dict:
+    """The old way: pull the event's matches and count them in pandas."""
+    tournament_ids = [t["id"] for t in repository.list_tournaments(event_id)]
+    matches = pd.DataFrame(repository.list_matches(tournament_ids, columns="id, status, start_time, end_time"))
+    completed = matches[matches["status"] == "Completed"].dropna(subset=["start_time", "end_time"])
+    durations = pd.to_datetime(completed["end_time"]) - pd.to_datetime(completed["start_time"])
+    counts = matches["status"].value_counts()
+    return {"pending": int(counts.get("Pending", 0)), "in_progress": int(counts.get("In Progress", 0)),
+            "completed": int(counts.get("Completed", 0)),
+            "average_minutes": durations.dt.total_seconds().mean() / 60 if len(durations) else None}
+
+
+def measured(client: MeteredClient, func, *args):
+    client.round_trips = client.bytes = 0
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, client.round_trips, client.bytes, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tournaments", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=24)
+    parser.add_argument("--updates", type=int, default=2000, help="score events to apply")
+    parser.add_argument("--seed", type=int, default=19)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    client = MeteredClient(build_event(args.tournaments, args.teams, num_brackets=2, completed=0.2, seed=args.seed))
+    repository = Repository(client)
+    matches = {m["id"]: m for m in client.tables["matches"] if m["status"] == "Pending"}
+    for _ in range(args.updates):
+        match = matches[rng.choice(list(matches))]
+        if match["status"] == "Pending":
+            events = [start()]
+        elif rng.random() < 0.1:
+            events = [complete()]
+        else:
+            events = [point(rng.choice("ab"), 1)]
+        match.update(record(repository, match, events))
+        if rng.random() < 0.01:
+            repository.create_teams([{"tournament_id": rng.randint(1, args.tournaments), "team_name": "Late entry"}])
+
+    kept = {row["tournament_id"]: row for row in client.tables["tournament_summaries"]}
+    SummaryTrigger(client).backfill()
+    rebuilt = {row["tournament_id"]: row for row in client.tables["tournament_summaries"]}
+    for tournament_id, row in rebuilt.items():
+        for column in COUNTERS:
+            assert abs(kept[tournament_id][column] - row[column]) < 1e-6, f"tournament {tournament_id} {column} drifted"
+
+    summary, trips, size, elapsed = measured(client, lambda: event_totals(repository.event_summary(1)))
+    repository.cache.clear()
+    counted, old_trips, old_size, old_elapsed = measured(client, overview_from_matches, repository, 1)
+    for column in ("pending", "in_progress", "completed"):
+        assert summary[column] == counted[column], f"{column}: summary {summary[column]} vs counted {counted[column]}"
+
+    print(f"{len(client.tables['matches'])} matches: {summary['pending']} pending, {summary['in_progress']} in progress, "
+          f"{summary['completed']} completed, {summary['timed']} timed")
+    print(f"count every match   trips={old_trips}  bytes={old_size:>8}  {old_elapsed * 1000:7.1f} ms")
+    print(f"summary rows        trips={trips}  bytes={size:>8}  {elapsed * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
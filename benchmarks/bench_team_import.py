@@ -0,0 +1,73 @@
+"""Bulk team import: read, validate and insert a large CSV in chunks.
+
+    python -m benchmarks.bench_team_import --rows 5000 --bad 0.02
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.team_import import build_payloads, insert_in_chunks, read_upload, validate
+
+TOURNAMENTS = [
+    {"id": 1, "event_id": 1, "name": "Men's Doubles", "sport": "Badminton"},
+    {"id": 2, "event_id": 1, "name": "Women's Doubles", "sport": "Badminton"},
+    {"id": 3, "event_id": 1, "name": "Mixed Pickleball", "sport": "Pickleball"},
+    {"id": 4, "event_id": 1, "name": "Captain Ball Open", "sport": "Captain Ball"},
+]
+
+
+def make_csv(rows: int, bad: float, seed: int) -> str:
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Tournament", "Team Name", "Player 1 Name", "Player 2 Name",
+                     "Reserve Man 1", "Reserve Man 2", "Reserve Woman 1"])
+    for i in range(rows):
+        row = [rng.choice(TOURNAMENTS)["name"], f"Team {i}", f"P{i}a", f"P{i}b", "", "", ""]
+        if rng.random() < bad:
+            fault = rng.randrange(3)
+            if fault == 0:
+                row[3] = ""
+            elif fault == 1:
+                row[0] = "No Such Tournament"
+            else:
+                row[1] = f"Team {max(i - 1, 0)}"
+        writer.writerow(row)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--bad", type=float, default=0.02, help="fraction of deliberately invalid rows")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per round trip")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_csv(args.rows, args.bad, args.seed)
+    client = MemoryClient({"tournaments": TOURNAMENTS}, latency=args.latency)
+    repository = Repository(client)
+
+    start = time.perf_counter()
+    df = read_upload(io.StringIO(text), "teams.csv")
+    valid, errors = validate(df, TOURNAMENTS, 1, repository.list_teams([t["id"] for t in TOURNAMENTS]))
+    payloads = build_payloads(valid)
+    validated = time.perf_counter()
+    inserted, insert_errors = insert_in_chunks(repository, payloads)
+    done = time.perf_counter()
+
+    assert inserted + len(errors) + len(insert_errors) == args.rows, "rows were lost"
+    assert len(client.tables["teams"]) == inserted
+    print(f"rows={args.rows} valid={len(valid)} rejected={len(errors)} inserted={inserted} "
+          f"round trips={client.round_trips}")
+    print(f"read+validate={(validated - start) * 1000:.0f} ms insert={(done - validated) * 1000:.0f} ms "
+          f"total={(done - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Payload building: the old per-row ``iterrows`` loops against ``matchpoint.transform``.
+
+    python -m benchmarks.bench_transform --rows 10000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from matchpoint.transform import team_payloads, tournament_payloads
+
+FORMATS = ["Full Round Robin", "2 Brackets", "3 Brackets", "4 Brackets"]
+SPORTS = ["Badminton", "Pickleball", "Captain Ball"]
+
+
+# --- The loops the pages used before, kept here as the reference ---
+def legacy_tournaments(edited, event_id, sport=None):
+    tournaments_to_insert = []
+    for index, row in edited.iterrows():
+        if not row["Tournament Name"]: continue
+        if row["Format"] == "Full Round Robin": num_brackets = 0
+        else: num_brackets = int(row["Format"].split(" ")[0])
+
+        tournaments_to_insert.append({
+            "event_id": event_id, "name": row["Tournament Name"], "sport": sport if sport is not None else row["Sport"],
+            "match_type": row["Match Type"], "num_brackets": num_brackets
+        })
+    return tournaments_to_insert
+
+
+def legacy_teams(edited, tournament_id, sport):
+    teams_to_insert = []
+    for index, row in edited.iterrows():
+        if row["Team Name"]:
+            team_data = {"tournament_id": tournament_id, "team_name": row["Team Name"]}
+            if sport != "Captain Ball":
+                if "Player 1 Name" in row and "Player 2 Name" in row and row["Player 1 Name"] and row["Player 2 Name"]:
+                    team_data.update({
+                        "player1_name": row["Player 1 Name"], "player2_name": row["Player 2 Name"],
+                        "reserve_man_1_name": row["Reserve Man 1"], "reserve_man_2_name": row["Reserve Man 2"],
+                        "reserve_woman_1_name": row["Reserve Woman 1"]
+                    })
+                    teams_to_insert.append(team_data)
+            else:
+                teams_to_insert.append(team_data)
+    return teams_to_insert
+
+
+def blank(rng, value):
+    """Cleared cells come back from the data editor as "".
+
+    Rows added but left empty hold None instead, which ``iterrows`` hands over
+    as NaN and the old loops let through as a truthy name, so the reference
+    comparison only uses "". tests/test_transform.py covers None separately.
+    """
+    return "" if rng.random() < 0.05 else value
+
+
+def make_frames(rows: int, seed: int):
+    rng = random.Random(seed)
+    tournaments = pd.DataFrame([{
+        "Tournament Name": blank(rng, f"Tournament {i}"),
+        "Sport": rng.choice(SPORTS),
+        "Match Type": "Mens Doubles",
+        "Format": rng.choice(FORMATS),
+    } for i in range(rows)])
+    teams = pd.DataFrame([{
+        "Team Name": blank(rng, f"Team {i}"),
+        "Player 1 Name": blank(rng, f"P{i}a"),
+        "Player 2 Name": blank(rng, f"P{i}b"),
+        "Reserve Man 1": blank(rng, f"R{i}m1"),
+        "Reserve Man 2": "",
+        "Reserve Woman 1": blank(rng, f"R{i}w1"),
+    } for i in range(rows)])
+    return tournaments, teams
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=10)
+    args = parser.parse_args()
+
+    tournaments, teams = make_frames(args.rows, args.seed)
+    cases = [
+        ("tournaments (standalone)", legacy_tournaments, tournament_payloads, (tournaments, 7, "Badminton")),
+        ("tournaments (festival)", legacy_tournaments, tournament_payloads, (tournaments, 7)),
+        ("teams (doubles)", legacy_teams, team_payloads, (teams, 3, "Badminton")),
+        ("teams (captain ball)", legacy_teams, team_payloads, (teams, 3, "Captain Ball")),
+    ]
+    for label, legacy, vectorized, case_args in cases:
+        expected, legacy_ms = timed(legacy, *case_args)
+        actual, vectorized_ms = timed(vectorized, *case_args)
+        assert actual == expected, f"{label}: payloads differ"
+        print(f"{label:<26} rows={len(expected):>6} iterrows={legacy_ms:7.1f} ms "
+              f"vectorized={vectorized_ms:6.1f} ms ({legacy_ms / vectorized_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
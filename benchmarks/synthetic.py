@@ -0,0 +1,56 @@
+"""Synthetic events for benchmarks: tournaments, teams and full match schedules.
+
+    from benchmarks.synthetic import build_event, make_repository
+    repository = make_repository(build_event(20, 16, num_brackets=2, completed=0.3), latency=0.02)
+
+Schedules come from ``matchpoint.scheduling.generate_fixtures``, so brackets,
+rounds, courts and time slots look like the ones the app creates. The same
+arguments and ``seed`` always give the same tables, so runs can be compared.
+"""
+
+import random
+
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.scheduling import FULL_ROUND_ROBIN, generate_fixtures
+
+SPORTS = ["Badminton", "Pickleball", "Captain Ball"]
+FIRST_NAMES = ["Aiden", "Bella", "Chen", "Dara", "Eli", "Farah", "Gus", "Hana", "Ivan", "Jia"]
+
+
+def build_event(num_tournaments: int, teams_per_tournament: int, num_brackets: int = FULL_ROUND_ROBIN,
+                num_courts: int = 1, completed: float = 0.0, sports: list | None = None, seed: int = 0) -> dict:
+    """Tables for event 1 with ``num_tournaments`` scheduled tournaments.
+
+    ``completed`` is the fraction of each tournament's matches (earliest slots
+    first) that already have a final score. Tournaments cycle through ``sports``.
+    """
+    rng = random.Random(seed)
+    sports = sports or SPORTS[:1]
+    tables = {"events": [{"id": 1, "event_name": "Festival", "event_date": "2026-01-01"}],
+              "tournaments": [], "teams": [], "matches": []}
+    next_team = 1
+    for tid in range(1, num_tournaments + 1):
+        tables["tournaments"].append({"id": tid, "event_id": 1, "name": f"Tournament {tid}",
+                                      "sport": sports[(tid - 1) % len(sports)], "match_type": "Mens Doubles",
+                                      "num_brackets": num_brackets, "status": "In Progress"})
+        team_ids = list(range(next_team, next_team + teams_per_tournament))
+        next_team += teams_per_tournament
+        for team in team_ids:
+            player1, player2 = rng.sample(FIRST_NAMES, 2)
+            tables["teams"].append({"id": team, "tournament_id": tid, "team_name": f"Team {team}",
+                                    "player1_name": player1, "player2_name": player2})
+        rows = list(generate_fixtures(team_ids, num_brackets, num_courts).rows(tid))
+        rows.sort(key=lambda row: row["time_slot"])
+        for k, row in enumerate(rows):
+            row.update(id=len(tables["matches"]) + 1, start_time=None)
+            if k < completed * len(rows):
+                row.update(status="Completed", start_time="2026-01-01T09:00:00+00:00",
+                           team_a_set1_score=21, team_b_set1_score=rng.randrange(21))
+            tables["matches"].append(row)
+    return tables
+
+
+def make_repository(tables: dict, latency: float = 0.0) -> Repository:
+    """A fresh repository (and so a cold cache) over a copy of ``tables``."""
+    return Repository(MemoryClient(tables, latency=latency))
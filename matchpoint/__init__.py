@@ -0,0 +1 @@
+"""Shared, non-UI code for the MatchPoint Streamlit pages."""
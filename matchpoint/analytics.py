@@ -0,0 +1,299 @@
+"""How long matches take, and when the matches still to be played will really start.
+
+``DurationStats`` keeps running statistics of completed matches per sport and
+per (sport, court), updated with Welford's algorithm. A completion adds to them
+in constant time and a reopened or deleted match is taken back out, so nothing
+is ever recomputed from the match table.
+
+``EventForecast`` holds the matches of one event that are not finished yet and
+walks them in time-slot order. A match waits for its court to free up, for both
+teams to finish their previous match and for its planned time; it then takes as
+long as its court has been taking. ``ForecastBook`` keeps one per event for the
+whole process and feeds them from the match broker, so each completion moves
+the forecasts on without re-reading the matches.
+"""
+
+import threading
+from datetime import date, datetime, time, timedelta
+
+from matchpoint.summary import duration_seconds
+
+FORECAST_COLUMNS = "id, tournament_id, team_a_id, team_b_id, status, court_number, time_slot, start_time, end_time"
+DURATION_BUCKETS = (10, 15, 20, 30, 45, 60, 90)
+PRIOR_WEIGHT = 3
+MIN_MINUTES = 1  # shorter than this, the match was scored after the fact
+
+
+def _parse(value) -> datetime | None:
+    """A database timestamp (UTC) in the server's local time zone, like ``slot_clock``'s times."""
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).astimezone()
+
+
+class RunningStats:
+    """Count, mean and variance of a stream (Welford); a value can be taken back out again."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - value) / self.count
+        self._m2 = max(self._m2 - (value - self.mean) * (value - old_mean), 0.0)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class DurationStats:
+    """Running match-duration statistics (in minutes) per sport and per (sport, court).
+
+    Every observation is kept under its match id, so observing a match again
+    (say, after a score correction moved its end time) replaces it instead of
+    counting it twice.
+    """
+
+    def __init__(self, prior_weight: float = PRIOR_WEIGHT):
+        self.prior_weight = prior_weight
+        self.by_sport = {}
+        self.by_court = {}
+        self.histograms = {}
+        self._observed = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, minutes: float) -> int:
+        return next((i for i, bound in enumerate(DURATION_BUCKETS) if minutes <= bound), len(DURATION_BUCKETS))
+
+    def _change(self, sport, court, minutes: float, sign: int) -> None:
+        for stats in (self.by_sport.setdefault(sport, RunningStats()),
+                      self.by_court.setdefault((sport, court), RunningStats())):
+            if sign > 0:
+                stats.add(minutes)
+            else:
+                stats.remove(minutes)
+        histogram = self.histograms.setdefault(sport, [0] * (len(DURATION_BUCKETS) + 1))
+        histogram[self._bucket(minutes)] += sign
+
+    def observe(self, match_id, sport, court, minutes: float) -> None:
+        with self._lock:
+            previous = self._observed.pop(match_id, None)
+            if previous is not None:
+                self._change(*previous, -1)
+            self._observed[match_id] = (sport, court, minutes)
+            self._change(sport, court, minutes, 1)
+
+    def forget(self, match_id) -> None:
+        with self._lock:
+            previous = self._observed.pop(match_id, None)
+            if previous is not None:
+                self._change(*previous, -1)
+
+    def expected_minutes(self, sport, court, default: float) -> float:
+        """The court's mean, pulled towards the sport's mean while the court has few matches behind it."""
+        sport_stats = self.by_sport.get(sport)
+        base = sport_stats.mean if sport_stats is not None and sport_stats.count else default
+        court_stats = self.by_court.get((sport, court))
+        if court_stats is None or not court_stats.count:
+            return base
+        n = court_stats.count
+        return (n * court_stats.mean + self.prior_weight * base) / (n + self.prior_weight)
+
+    def percentile(self, sport, q: float) -> float | None:
+        """The upper bound of the histogram bucket holding the ``q`` quantile; None past the last bound."""
+        histogram = self.histograms.get(sport)
+        total = sum(histogram) if histogram else 0
+        if not total:
+            return None
+        seen = 0
+        for i, count in enumerate(histogram):
+            seen += count
+            if seen >= q * total:
+                return DURATION_BUCKETS[i] if i < len(DURATION_BUCKETS) else None
+        return None
+
+    def summary(self) -> list[dict]:
+        return [
+            {"sport": sport, "matches": stats.count, "mean_min": stats.mean, "std_min": stats.std,
+             "p90_min": self.percentile(sport, 0.9)}
+            for sport, stats in sorted(self.by_sport.items()) if stats.count
+        ]
+
+
+def slot_clock(day: date, first_slot: time, slot_minutes: float):
+    """Planned start of each (1-based) time slot, in the server's local time zone."""
+    start = datetime.combine(day, first_slot).astimezone()
+    return lambda slot: start + timedelta(minutes=(slot - 1) * slot_minutes)
+
+
+class EventForecast:
+    """The unfinished, placed matches of one event, and when each will start.
+
+    Completed matches are not kept: each leaves behind only when its court and
+    its two teams became free.
+    """
+
+    def __init__(self, sports: dict, stats: DurationStats):
+        self.sports = sports
+        self.stats = stats
+        self.matches = {}
+        self.court_free = {}
+        self.team_free = {}
+        self.version = 0
+        self._order = None
+        self._lock = threading.Lock()
+
+    def load(self, rows: list[dict]) -> "EventForecast":
+        for row in rows:
+            self._put(row)
+        return self
+
+    def _free(self, free: dict, key, at: datetime) -> None:
+        if key is not None and (key not in free or free[key] < at):
+            free[key] = at
+
+    def _put(self, row: dict) -> None:
+        sport = self.sports[row["tournament_id"]]
+        if row.get("status") == "Completed":
+            if self.matches.pop(row["id"], None) is not None:
+                self._order = None
+            seconds = duration_seconds(row)
+            if seconds is not None and seconds >= MIN_MINUTES * 60:
+                self.stats.observe(row["id"], sport, row.get("court_number"), seconds / 60)
+            end = _parse(row.get("end_time"))
+            if end is not None:
+                self._free(self.court_free, (sport, row.get("court_number")), end)
+                for side in ("team_a_id", "team_b_id"):
+                    self._free(self.team_free, row.get(side), end)
+            return
+        self.stats.forget(row["id"])
+        known = self.matches.get(row["id"])
+        if known is not None and all(known.get(c) == row.get(c) for c in ("time_slot", "court_number")):
+            known.update(row)  # a score or status update: the slot order stands
+        else:
+            self.matches[row["id"]] = row
+            self._order = None
+
+    def apply(self, change: dict) -> bool:
+        """Take in one broker change. Returns False if it is not about this event."""
+        record = change.get("record") or change.get("old_record") or {}
+        with self._lock:
+            known = self.matches.get(record.get("id"), {})
+            tournament_id = record.get("tournament_id", known.get("tournament_id"))
+            if tournament_id not in self.sports:
+                return False
+            if change["type"] == "DELETE":
+                if self.matches.pop(record.get("id"), None) is not None:
+                    self._order = None
+                self.stats.forget(record.get("id"))
+            else:
+                self._put({**known, **change["record"]})
+            self.version += 1
+            return True
+
+    def _ordered(self) -> list[dict]:
+        # Sorted again only when a match is added, moved, removed or finishes, not on every forecast.
+        if self._order is None:
+            placed = [m for m in self.matches.values() if m.get("time_slot") and m.get("court_number")]
+            self._order = sorted(placed, key=lambda m: (m["time_slot"], m["court_number"], m["id"]))
+        return self._order
+
+    def forecast(self, now: datetime, planned=None, default_minutes: float = 30) -> list[dict]:
+        """Expected start and end of every unfinished placed match, in time-slot order.
+
+        ``planned`` maps a time slot to its planned start (see ``slot_clock``);
+        without it matches are only held back by their court and teams. Every
+        time returned is in the server's local time zone, whatever ``now`` is in.
+        """
+        now = now.astimezone()
+        with self._lock:
+            order = list(self._ordered())
+            court_free, team_free = dict(self.court_free), dict(self.team_free)
+        rows = []
+        for match in order:
+            sport = self.sports[match["tournament_id"]]
+            court = (sport, match["court_number"])
+            length = timedelta(minutes=self.stats.expected_minutes(sport, match["court_number"], default_minutes))
+            planned_start = planned(match["time_slot"]) if planned is not None else None
+            started = _parse(match.get("start_time")) if match.get("status") == "In Progress" else None
+            if started is not None:
+                start, end = started, max(started + length, now)
+            else:
+                waits = [now, court_free.get(court), planned_start]
+                waits += [team_free.get(match.get(side)) for side in ("team_a_id", "team_b_id")]
+                start = max(w for w in waits if w is not None)
+                end = start + length
+            court_free[court] = end
+            for side in ("team_a_id", "team_b_id"):
+                if match.get(side) is not None:
+                    team_free[match[side]] = end
+            rows.append({
+                "id": match["id"], "tournament_id": match["tournament_id"], "sport": sport,
+                "team_a_id": match.get("team_a_id"), "team_b_id": match.get("team_b_id"),
+                "status": match.get("status"), "time_slot": match["time_slot"], "court_number": match["court_number"],
+                "planned_start": planned_start, "expected_start": start, "expected_end": end,
+                "delay_minutes": (start - planned_start).total_seconds() / 60 if planned_start is not None else None,
+            })
+        return rows
+
+
+class ForecastBook:
+    """Process-wide forecasts per event, sharing one ``DurationStats`` and fed by the match broker.
+
+    An event is loaded with one read of its matches the first time it is asked
+    for, and again only if its tournaments change.
+    """
+
+    def __init__(self, broker):
+        self.stats = DurationStats()
+        self._subscription = broker.subscribe()
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def catch_up(self) -> int:
+        """Apply the changes received since the last call. Returns how many touched a loaded event.
+
+        If the inbox overflowed, every event is dropped and reloaded on its next ``get``.
+        """
+        with self._lock:
+            changes = self._subscription.drain()
+            if changes is None:
+                self._events.clear()
+                return 0
+            forecasts = list(self._events.values())
+        return sum(any([f.apply(change) for f in forecasts]) for change in changes)
+
+    def get(self, repository, event_id) -> EventForecast:
+        self.catch_up()
+        sports = {t["id"]: t["sport"] for t in repository.list_tournaments(event_id)}
+        forecast = self._events.get(event_id)
+        if forecast is None or forecast.sports != sports:
+            matches = repository.list_matches(list(sports), columns=FORECAST_COLUMNS)
+            forecast = EventForecast(sports, self.stats).load(matches)
+            with self._lock:
+                self._events[event_id] = forecast
+        return forecast
+
+    def forget(self, event_id) -> None:
+        """Drop an event's forecast; the next ``get`` reloads it."""
+        with self._lock:
+            self._events.pop(event_id, None)
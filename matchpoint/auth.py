@@ -0,0 +1,150 @@
+"""Sign-in state for one browser session: tokens, their refresh, and the profile.
+
+An ``AuthSession`` is created at login and kept in the session state. It holds
+the access and refresh tokens and the user's ``profiles`` row (``full_name``,
+``role``), read once at login, so checking the role on later reruns costs no
+query. One ``TokenRefresher`` thread per process renews every signed-in
+session shortly before its access token expires.
+
+Tokens never go onto the shared client, which serves every session in the
+process. User-scoped queries (the ones row-level security should see as the
+user) go through ``Repository.for_session``, which sends the session's current
+token with each request over the shared client's connection pool.
+"""
+
+import threading
+import time
+import weakref
+
+PROFILE_COLUMNS = "id, full_name, role"
+ADMIN = "admin"
+REFRESH_MARGIN = 300
+
+
+class AuthSession:
+    def __init__(self, user_id, email: str, access_token: str, refresh_token: str, expires_at: float,
+                 profile: dict | None = None):
+        self.user_id = user_id
+        self.email = email
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.profile = profile or {}
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_response(cls, response) -> "AuthSession | None":
+        """Build from a ``sign_in``/``sign_up`` response; None if it carries no session (e.g. email not confirmed)."""
+        session = getattr(response, "session", None)
+        if response.user is None or session is None:
+            return None
+        expires_at = session.expires_at or time.time() + (session.expires_in or 3600)
+        return cls(response.user.id, response.user.email, session.access_token, session.refresh_token, expires_at)
+
+    @property
+    def role(self) -> str:
+        return self.profile.get("role") or "member"
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == ADMIN
+
+    @property
+    def display_name(self) -> str:
+        return self.profile.get("full_name") or self.email
+
+    def expired(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+    def needs_refresh(self, now: float | None = None, margin: float = REFRESH_MARGIN) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at - margin
+
+    def refresh(self, auth) -> None:
+        """Swap the tokens for new ones; ``auth`` is the repository's auth client."""
+        with self._lock:
+            session = auth.refresh_session(self.refresh_token).session
+            self.access_token, self.refresh_token = session.access_token, session.refresh_token
+            self.expires_at = session.expires_at or time.time() + (session.expires_in or 3600)
+            self.last_error = None
+
+
+class TokenRefresher:
+    """Refreshes every tracked session from one daemon thread, ``margin`` seconds before expiry.
+
+    Sessions are held weakly, so a session that is dropped stops being refreshed.
+    A failed refresh is kept in ``last_error`` and retried on the next pass until
+    the token runs out.
+    """
+
+    def __init__(self, auth, margin: float = REFRESH_MARGIN, clock=time.time):
+        self.auth = auth
+        self.margin = margin
+        self._clock = clock
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self.refreshed = 0
+
+    def track(self, session: AuthSession) -> None:
+        with self._lock:
+            self._sessions.add(session)
+
+    def forget(self, session: AuthSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def refresh_due(self) -> int:
+        """Refresh the sessions that are within ``margin`` of expiry. Returns how many were refreshed."""
+        now = self._clock()
+        with self._lock:
+            due = [s for s in self._sessions if s.needs_refresh(now, self.margin) and not s.expired(now)]
+        for session in due:
+            try:
+                session.refresh(self.auth)
+                self.refreshed += 1
+            except Exception as e:
+                session.last_error = e
+        return len(due)
+
+    def start(self, interval: float = 30.0) -> "TokenRefresher":
+        def run():
+            while True:
+                time.sleep(interval)
+                self.refresh_due()
+
+        threading.Thread(target=run, name="matchpoint-token-refresh", daemon=True).start()
+        return self
+
+
+class UserClient:
+    """The shared Supabase client's connection pool, sending one session's access token.
+
+    Only ``table()`` and ``rpc()`` are provided: they are all ``Repository``
+    needs. Queries go through a ``SyncPostgrestClient`` of this session's own,
+    authenticated with its token and reusing the shared client's HTTP pool; it
+    is rebuilt when the token changes, so a refresh takes effect on the next query.
+    """
+
+    def __init__(self, client, session: AuthSession):
+        self._client = client
+        self._session = session
+        self._token = None
+        self._postgrest = None
+
+    def _rest(self):
+        token = self._session.access_token
+        if token != self._token:
+            from postgrest import SyncPostgrestClient
+
+            shared = self._client.postgrest
+            rest = SyncPostgrestClient(str(shared.base_url), http_client=shared.session)
+            rest.headers = shared.headers.copy()  # apikey, schema and client info as the shared client sends them
+            self._postgrest = rest.auth(token)
+            self._token = token
+        return self._postgrest
+
+    def table(self, name: str):
+        return self._rest().from_(name)
+
+    def rpc(self, name: str, params: dict):
+        return self._rest().rpc(name, params)
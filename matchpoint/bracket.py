@@ -0,0 +1,236 @@
+"""The knockout stage drawn as a tree, laid out once and patched as results come in.
+
+A knockout of ``n`` first-round matches is a fixed tree: match ``i`` of a
+round feeds match ``i // 2`` of the next, up to the final. ``BracketLayout``
+computes every box position and connector for that shape once and keeps one
+SVG fragment per match. A later state of the same bracket only redraws the
+matches whose row changed, plus the matches above each of them on the way to
+the final, since a new winner moves up into the next box. The picture is a
+single SVG string, so the page draws it as one element instead of a grid of
+nested columns.
+
+``BracketLayouts`` keeps the latest layout of each tournament for the process,
+keyed by the bracket's version (``match_key`` of each of its matches: id,
+version, status, teams and scores). An unchanged bracket costs a comparison. Team names are read when a
+box is redrawn.
+"""
+
+import html
+import threading
+
+from matchpoint.standings import KNOCKOUT, SETS, STANDINGS_COLUMNS, winner
+
+BRACKET_COLUMNS = STANDINGS_COLUMNS + ", version"
+BOX_WIDTH = 200
+BOX_HEIGHT = 48
+ROUND_GAP = 48
+BOX_GAP = 14
+HEADER = 28
+
+
+def match_key(match: dict) -> tuple:
+    """Everything about a match that its box shows; a box is redrawn when this changes."""
+    return (match["id"], match.get("version") or 0, match.get("status"), match.get("team_a_id"),
+            match.get("team_b_id"), *(match.get(f"team_{side}_set{n}_score") for n in SETS for side in "ab"))
+
+
+def bracket_version(matches: list[dict]) -> tuple:
+    return tuple(sorted(match_key(m) for m in matches))
+
+
+def round_title(round_index: int, rounds: int) -> str:
+    remaining = rounds - round_index
+    if remaining == 1:
+        return "Final"
+    if remaining == 2:
+        return "Semi-finals"
+    if remaining == 3:
+        return "Quarter-finals"
+    return f"Round of {2 ** remaining}"
+
+
+def score_text(match: dict, side: str) -> str:
+    scores = [match.get(f"team_{side}_set{n}_score") for n in SETS]
+    return " ".join(str(s) for s in scores if s is not None)
+
+
+class Node:
+    """One box: its fixed position, and what it currently shows."""
+
+    __slots__ = ("round", "index", "x", "y", "match", "teams", "winner", "key", "svg")
+
+    def __init__(self, round_index: int, index: int, x: float, y: float):
+        self.round, self.index, self.x, self.y = round_index, index, x, y
+        self.match = None
+        self.teams = (None, None)
+        self.winner = None
+        self.key = None
+        self.svg = ""
+
+
+class BracketLayout:
+    """Positions of every box of a knockout with ``first_round`` matches, and their drawn fragments."""
+
+    def __init__(self, first_round: int):
+        if first_round < 1 or first_round & (first_round - 1):
+            raise ValueError(f"a knockout needs a power-of-two first round, not {first_round} matches")
+        self.first_round = first_round
+        self.num_rounds = first_round.bit_length()
+        self.version = None
+        self._svg = None
+        self.rounds = []
+        for r in range(self.num_rounds):
+            x = r * (BOX_WIDTH + ROUND_GAP)
+            if r == 0:
+                ys = [HEADER + i * (BOX_HEIGHT + BOX_GAP) for i in range(first_round)]
+            else:
+                below = self.rounds[r - 1]
+                ys = [(below[2 * i].y + below[2 * i + 1].y) / 2 for i in range(len(below) // 2)]
+            self.rounds.append([Node(r, i, x, y) for i, y in enumerate(ys)])
+        self.width = self.num_rounds * (BOX_WIDTH + ROUND_GAP) - ROUND_GAP
+        self.height = HEADER + first_round * (BOX_HEIGHT + BOX_GAP) - BOX_GAP
+        self._frame = self._draw_frame()
+
+    def _draw_frame(self) -> str:
+        """Round titles and connectors: they depend only on the shape, so they are drawn once."""
+        parts = []
+        for r, nodes in enumerate(self.rounds):
+            parts.append(f'<text x="{nodes[0].x + BOX_WIDTH / 2}" y="16" class="round">'
+                         f'{round_title(r, self.num_rounds)}</text>')
+            if r + 1 < self.num_rounds:
+                for node in nodes:
+                    parent = self.rounds[r + 1][node.index // 2]
+                    x0, y0 = node.x + BOX_WIDTH, node.y + BOX_HEIGHT / 2
+                    xm, y1 = x0 + ROUND_GAP / 2, parent.y + BOX_HEIGHT / 2
+                    parts.append(f'<path d="M{x0} {y0}H{xm}V{y1}H{parent.x}" class="link"/>')
+        return "".join(parts)
+
+    def _place(self, round_index: int, matches: list[dict]) -> dict:
+        """Which box each of a round's matches belongs in.
+
+        The first round goes in id order. A later match goes above the box one
+        of its teams came from; failing that, into the first free box.
+        """
+        nodes = self.rounds[round_index]
+        placed = {}
+        rest = []
+        for match in sorted(matches, key=lambda m: m["id"]):
+            if round_index == 0:
+                if len(placed) < len(nodes):
+                    placed[len(placed)] = match
+                continue
+            for child in self.rounds[round_index - 1]:
+                if child.winner is not None and child.winner in (match.get("team_a_id"), match.get("team_b_id")):
+                    if child.index // 2 not in placed:
+                        placed[child.index // 2] = match
+                        break
+            else:
+                rest.append(match)
+        free = (i for i in range(len(nodes)) if i not in placed)
+        for match, i in zip(rest, free):
+            placed[i] = match
+        return placed
+
+    def update(self, matches: list[dict], team_names: dict) -> int:
+        """Redraw the boxes whose match changed and the boxes above them. Returns how many were redrawn."""
+        by_round = {}
+        for match in matches:
+            by_round.setdefault((match.get("round_number") or 1) - 1, []).append(match)
+        redrawn = 0
+        dirty = set()
+        for r, nodes in enumerate(self.rounds):
+            placed = self._place(r, by_round.get(r, []))
+            parents = set()
+            for node in nodes:
+                match = placed.get(node.index)
+                key = match_key(match) if match else None
+                if key == node.key and node.index not in dirty and node.svg:
+                    continue
+                node.match, node.key = match, key
+                self._fill(node)
+                node.svg = self._draw_node(node, team_names)
+                redrawn += 1
+                parents.add(node.index // 2)
+            dirty = parents
+        if redrawn:
+            self._svg = None
+        return redrawn
+
+    def _fill(self, node: Node) -> None:
+        if node.round == 0 or (node.match and node.match.get("team_a_id") is not None):
+            node.teams = (node.match.get("team_a_id"), node.match.get("team_b_id")) if node.match else (None, None)
+        else:
+            below = self.rounds[node.round - 1]
+            node.teams = (below[2 * node.index].winner, below[2 * node.index + 1].winner)
+        node.winner = winner(node.match) if node.match else None
+
+    def _draw_node(self, node: Node, team_names: dict) -> str:
+        match = node.match or {}
+        lines = []
+        for k, (side, team_id) in enumerate(zip("ab", node.teams)):
+            if team_id is not None:
+                name = team_names.get(team_id, f"Team {team_id}")
+            elif node.round > 0:
+                feeder = self.rounds[node.round - 1][2 * node.index + k].match
+                name = f"Winner of match {feeder['id']}" if feeder else "TBD"
+            else:
+                name = "TBD"
+            css = "team won" if team_id is not None and team_id == node.winner else "team"
+            y = node.y + 20 + k * 20
+            lines.append(
+                f'<text x="{node.x + 8}" y="{y}" class="{css}">{html.escape(name)}</text>'
+                f'<text x="{node.x + BOX_WIDTH - 8}" y="{y}" class="score">{score_text(match, side)}</text>'
+            )
+        status = "live" if match.get("status") == "In Progress" else "box"
+        title = f"<title>Match {match['id']}</title>" if match else ""
+        return (f'<g>{title}<rect x="{node.x}" y="{node.y}" width="{BOX_WIDTH}" height="{BOX_HEIGHT}" rx="6" '
+                f'class="{status}"/>{"".join(lines)}</g>')
+
+    def svg(self) -> str:
+        """The whole bracket as one SVG document; joined again only after a redraw."""
+        if self._svg is None:
+            self._svg = self._join()
+        return self._svg
+
+    def _join(self) -> str:
+        boxes = "".join(node.svg for nodes in self.rounds for node in nodes)
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}" font-family="sans-serif" font-size="13">'
+            "<style>.round{text-anchor:middle;font-weight:600;fill:#555}"
+            ".link{fill:none;stroke:#aaa;stroke-width:1.5}.box{fill:#fff;stroke:#bbb}"
+            ".live{fill:#fff8e1;stroke:#f0a000;stroke-width:2}.team{fill:#222}.won{font-weight:700}"
+            ".score{text-anchor:end;fill:#555}</style>"
+            f"{self._frame}{boxes}</svg>"
+        )
+
+
+class BracketLayouts:
+    """The latest knockout layout per tournament, shared by every session in the process."""
+
+    def __init__(self):
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def get(self, tournament_id, matches: list[dict], team_names: dict) -> BracketLayout | None:
+        """The layout for this state of the bracket, or None if it has no first round yet."""
+        matches = [m for m in matches if m.get("bracket") == KNOCKOUT]
+        first_round = sum(1 for m in matches if (m.get("round_number") or 1) == 1)
+        if first_round < 1 or first_round & (first_round - 1):
+            return None
+        version = bracket_version(matches)
+        with self._lock:
+            layout = self._layouts.get(tournament_id)
+            if layout is not None and layout.version == version:
+                return layout
+            if layout is None or layout.first_round != first_round:
+                layout = BracketLayout(first_round)
+            layout.update(matches, team_names)
+            layout.version = version
+            layout.svg()
+            self._layouts[tournament_id] = layout
+            return layout
+
+    def forget(self, tournament_id) -> None:
+        with self._lock:
+            self._layouts.pop(tournament_id, None)
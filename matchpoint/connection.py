@@ -0,0 +1,168 @@
+"""The process-wide repository, and the objects built around it, shared by every page.
+
+``st.cache_resource`` keeps one Supabase client (and its pooled HTTP
+connections) alive for the whole server process, so a rerun no longer pays for
+building a client. The Supabase library is imported then too, so a page that
+never reaches the database (a visitor who is not signed in) never loads it. Set ``MATCHPOINT_BACKEND=memory`` or call
+``set_repository`` to swap in another backend for local runs and benchmarks.
+
+Sign-in goes through a separate auth client, so no user's token ever lands on
+the shared one; ``sign_in`` keeps the session's ``AuthSession`` in
+``st.session_state`` instead (see ``matchpoint.auth``).
+"""
+
+import os
+import threading
+import weakref
+
+import streamlit as st
+
+from matchpoint.analytics import ForecastBook
+from matchpoint.auth import AuthSession, TokenRefresher
+from matchpoint.bracket import BracketLayouts
+from matchpoint.memory import MemoryClient
+from matchpoint.outbox import ScoreOutbox
+from matchpoint.realtime import MatchBroker, SupabaseMatchFeed
+from matchpoint.repository import Repository
+from matchpoint.scoreboard import ScoreboardCache
+from matchpoint.standings import StandingsBook
+
+_override = None
+_attached_resources = weakref.WeakKeyDictionary()
+_attached_lock = threading.Lock()
+
+
+def set_repository(repository: Repository | None) -> None:
+    """Inject a repository for every page in this process. Pass None to reset."""
+    global _override
+    _override = repository
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_repository() -> Repository:
+    if os.environ.get("MATCHPOINT_BACKEND") == "memory":
+        return Repository(MemoryClient())
+    # Imported here, not at the top: the client library takes longer to import than most pages take to run.
+    from supabase import create_client
+    from supabase_auth import SyncGoTrueClient
+
+    key = st.secrets["SUPABASE_KEY"]
+    client = create_client(st.secrets["SUPABASE_URL"], key)
+    auth = SyncGoTrueClient(url=str(client.auth_url), headers={"apikey": key, "Authorization": f"Bearer {key}"},
+                            auto_refresh_token=False, persist_session=False)
+    return Repository(client, auth=auth)
+
+
+def get_repository() -> Repository:
+    if _override is not None:
+        return _override
+    return _shared_repository()
+
+
+def _attached(name: str, factory):
+    """A process-wide object that belongs to the current repository, created on first use."""
+    repository = get_repository()
+    with _attached_lock:
+        resources = _attached_resources.setdefault(repository, {})
+        if name not in resources:
+            resources[name] = factory(repository)
+        return resources[name]
+
+
+def get_standings_book() -> StandingsBook:
+    return _attached("standings", lambda repository: StandingsBook())
+
+
+def _connect_match_broker(repository: Repository) -> MatchBroker:
+    broker = MatchBroker()
+    if isinstance(repository.client, MemoryClient):
+        repository.client.listeners.append(broker.publish_write)
+    else:
+        SupabaseMatchFeed(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"], broker).start()
+    return broker
+
+
+def get_match_broker() -> MatchBroker:
+    """The process-wide broker of ``matches`` changes for the current repository.
+
+    The first call connects it to its source: MemoryClient write listeners for
+    the in-memory backend, otherwise one Supabase realtime channel.
+    """
+    return _attached("match_broker", _connect_match_broker)
+
+
+def get_forecast_book() -> ForecastBook:
+    """Match-duration statistics and call-time forecasts, kept current from the match broker."""
+    broker = get_match_broker()  # outside _attached: its lock is not reentrant
+    return _attached("forecasts", lambda repository: ForecastBook(broker))
+
+
+def get_bracket_layouts() -> BracketLayouts:
+    """Knockout bracket drawings, laid out once per bracket version and shared by every session."""
+    return _attached("brackets", lambda repository: BracketLayouts())
+
+
+def get_scoreboard_cache() -> ScoreboardCache:
+    """The scoreboard snapshots shared by every spectator in this process."""
+    return _attached("scoreboard", ScoreboardCache)
+
+
+def _open_score_outbox(repository: Repository, standings: StandingsBook) -> ScoreOutbox:
+    # An in-memory database gains nothing from a durable queue.
+    path = ":memory:" if isinstance(repository.client, MemoryClient) else os.environ.get(
+        "MATCHPOINT_OUTBOX", "matchpoint_outbox.sqlite3"
+    )
+    outbox = ScoreOutbox(path)
+    outbox.listeners.append(standings.saved)
+    return outbox.start(repository)
+
+
+def get_score_outbox() -> ScoreOutbox:
+    """The local queue score events go through on their way to the database.
+
+    The file (``MATCHPOINT_OUTBOX``, default ``matchpoint_outbox.sqlite3``)
+    keeps unsent scores across restarts; they are sent again on the next start.
+    Saved scores are passed on to the standings book.
+    """
+    standings = get_standings_book()  # outside _attached: its lock is not reentrant
+    return _attached("score_outbox", lambda repository: _open_score_outbox(repository, standings))
+
+
+def get_token_refresher() -> TokenRefresher:
+    """The thread that keeps every signed-in session's tokens fresh."""
+    return _attached("token_refresher", lambda repository: TokenRefresher(repository.auth).start())
+
+
+def sign_in(email: str, password: str) -> AuthSession | None:
+    """Sign in, load the profile once, and keep the session for this browser tab."""
+    repository = get_repository()
+    session = AuthSession.from_response(repository.sign_in(email, password))
+    if session is None:
+        return None
+    session.profile = repository.for_session(session).get_profile(session.user_id) or {}
+    get_token_refresher().track(session)
+    st.session_state.auth_session = session
+    st.session_state.logged_in = True
+    return session
+
+
+def current_session() -> AuthSession | None:
+    """The signed-in session, or None. A session whose tokens ran out is signed out."""
+    session = st.session_state.get("auth_session")
+    if session is not None and session.expired():
+        sign_out()
+        return None
+    return session
+
+
+def sign_out() -> None:
+    session = st.session_state.pop("auth_session", None)
+    if session is not None:
+        get_token_refresher().forget(session)
+    st.session_state.logged_in = False
+
+
+def get_session_repository() -> Repository:
+    """The repository querying as the signed-in user, for reads and writes row-level security should check."""
+    session = current_session()
+    return get_repository().for_session(session) if session is not None else get_repository()
@@ -0,0 +1,247 @@
+"""Event-level timetable for festival events.
+
+Per-tournament fixtures (see ``matchpoint.scheduling``) know nothing about
+other tournaments, so a player entered in several teams can be booked into two
+matches at once. ``build_timetable`` takes every pending match of an event and
+places it into (time slot, court) cells so that
+
+* each sport uses at most its own number of courts per slot, and
+* no team and no player (matched by normalised name) is in two matches in the
+  same slot,
+
+while keeping the number of slots (the event's duration) small. Matches are
+placed greedily from a priority queue, most constrained first, and the result
+is then shortened by moving matches out of the last slot, pushing a single
+blocking match into another earlier slot where needed.
+
+On a day already under way the timetable starts at the current slot (the
+earliest slot of a match in progress), and matches in progress keep their
+court and slot: they are placed first and never moved, so nothing is booked
+onto their court or with their teams and players. Only ``time_slot`` and
+``court_number`` are written, and only to matches that are still Pending
+(``sql/007_save_match_slots.sql``), so a match that starts while the timetable
+is being built keeps its row.
+"""
+
+import heapq
+from collections import Counter
+
+SCHEDULE_COLUMNS = "id, tournament_id, team_a_id, team_b_id, status, round_number, time_slot, court_number"
+PLAYER_COLUMNS = (
+    "player1_name", "player2_name", "reserve_man_1_name", "reserve_man_2_name", "reserve_woman_1_name",
+)
+
+
+def _player_key(name) -> str | None:
+    if not isinstance(name, str):
+        return None
+    key = " ".join(name.lower().split())
+    return key or None
+
+
+def match_resources(match: dict, teams: dict) -> frozenset:
+    """Everything a match occupies while it is being played: both teams and all their players."""
+    resources = set()
+    for side in ("team_a_id", "team_b_id"):
+        team_id = match[side]
+        resources.add(("team", team_id))
+        team = teams.get(team_id) or {}
+        for column in PLAYER_COLUMNS:
+            key = _player_key(team.get(column))
+            if key:
+                resources.add(("player", key))
+    return frozenset(resources)
+
+
+class Timetable:
+    """The placement of every match: ``slots[match_id]`` and ``courts[match_id]`` (both 1-based)."""
+
+    def __init__(self, slots: dict, courts: dict, lower_bound: int, first_slot: int = 1):
+        self.slots = slots
+        self.courts = courts
+        self.lower_bound = lower_bound
+        self.first_slot = first_slot
+
+    @property
+    def num_slots(self) -> int:
+        """How many slots the timetable spans, from ``first_slot`` to the last one used."""
+        return max(self.slots.values(), default=self.first_slot - 1) - self.first_slot + 1
+
+    def rows(self) -> list[dict]:
+        """``id``, ``time_slot`` and ``court_number`` of every placed match: all that is written back."""
+        return [{"id": match_id, "time_slot": slot, "court_number": self.courts[match_id]}
+                for match_id, slot in self.slots.items()]
+
+
+def lower_bound(matches: list[dict], sport_of: dict, courts_per_sport: dict, resources: dict) -> int:
+    """No timetable can be shorter than the busiest court pool or the busiest player."""
+    per_sport = Counter(sport_of[m["tournament_id"]] for m in matches)
+    per_resource = Counter(r for m in matches for r in resources[m["id"]])
+    court_bound = max((-(-count // courts_per_sport[sport]) for sport, count in per_sport.items()), default=0)
+    return max(court_bound, max(per_resource.values(), default=0))
+
+
+class _Grid:
+    """Slot occupancy used while building a timetable: members, busy resources and courts in use."""
+
+    def __init__(self, resources: dict, sport: dict, courts_per_sport: dict, fixed=frozenset()):
+        self.resources = resources
+        self.sport = sport
+        self.courts_per_sport = courts_per_sport
+        self.fixed = fixed
+        self.slot_of = {}
+        self.members = []
+        self.busy = []
+        self.used = []
+
+    def open_slot(self) -> int:
+        self.members.append(set())
+        self.busy.append(set())
+        self.used.append(Counter())
+        return len(self.members) - 1
+
+    def fits(self, match_id, slot: int) -> bool:
+        return (self.used[slot][self.sport[match_id]] < self.courts_per_sport[self.sport[match_id]]
+                and self.busy[slot].isdisjoint(self.resources[match_id]))
+
+    def place(self, match_id, slot: int) -> None:
+        previous = self.slot_of.get(match_id)
+        if previous is not None:
+            self.members[previous].discard(match_id)
+            self.busy[previous] -= self.resources[match_id]
+            self.used[previous][self.sport[match_id]] -= 1
+        self.members[slot].add(match_id)
+        self.busy[slot] |= self.resources[match_id]
+        self.used[slot][self.sport[match_id]] += 1
+        self.slot_of[match_id] = slot
+
+    def blockers(self, match_id, slot: int) -> list:
+        """Matches in ``slot`` that would have to leave for ``match_id`` to fit, or None if more than one."""
+        clashing = [other for other in self.members[slot]
+                    if not self.resources[other].isdisjoint(self.resources[match_id])]
+        if len(clashing) > 1 or not self.fixed.isdisjoint(clashing):
+            return None
+        sport = self.sport[match_id]
+        freed = sum(1 for other in clashing if self.sport[other] == sport)
+        if self.used[slot][sport] - freed < self.courts_per_sport[sport]:
+            return clashing
+        if clashing:
+            return None
+        movable = [other for other in self.members[slot] if self.sport[other] == sport and other not in self.fixed]
+        return movable or None
+
+    def relocate(self, match_id, last: int) -> bool:
+        """Move ``match_id`` before ``last`` by pushing one blocking match into another earlier slot."""
+        for target in range(last):
+            candidates = self.blockers(match_id, target)
+            if candidates is None:
+                continue
+            if not candidates:
+                self.place(match_id, target)
+                return True
+            for blocker in candidates:
+                for other in range(last):
+                    if other != target and self.fits(blocker, other):
+                        self.place(blocker, other)
+                        self.place(match_id, target)
+                        return True
+        return False
+
+
+def build_timetable(matches: list[dict], teams: dict, sport_of: dict, courts_per_sport: dict,
+                    occupied: list[dict] = (), first_slot: int = 1) -> Timetable:
+    """Place ``matches`` into slots and courts, from ``first_slot`` on.
+
+    ``teams`` maps team id to a team row, ``sport_of`` maps tournament id to
+    its sport and ``courts_per_sport`` gives the courts available per sport.
+    ``occupied`` are matches that already hold a ``time_slot`` and
+    ``court_number`` (those in progress); they stay where they are.
+    """
+    for sport in {sport_of[m["tournament_id"]] for m in matches}:
+        if courts_per_sport.get(sport, 0) < 1:
+            raise ValueError(f"No courts available for {sport}.")
+
+    occupied = [m for m in occupied if (m.get("time_slot") or 0) >= first_slot]
+    resources = {m["id"]: match_resources(m, teams) for m in [*matches, *occupied]}
+    sport = {m["id"]: sport_of[m["tournament_id"]] for m in [*matches, *occupied]}
+    load = Counter(r for m in matches for r in resources[m["id"]])
+    bound = lower_bound(matches, sport_of, courts_per_sport, resources)
+    grid = _Grid(resources, sport, courts_per_sport, frozenset(m["id"] for m in occupied))
+    taken = Counter()
+    for match in occupied:
+        slot = match["time_slot"] - first_slot
+        while len(grid.members) <= slot:
+            grid.open_slot()
+        grid.place(match["id"], slot)
+        taken[(slot, sport[match["id"]], match["court_number"])] += 1
+
+    # Greedy: fill one slot at a time, most constrained matches first (the busiest
+    # team/player still has the most matches left), then earlier rounds.
+    heap = [
+        (-max(load[r] for r in resources[m["id"]]), m.get("round_number") or 0, m["id"])
+        for m in matches
+    ]
+    heapq.heapify(heap)
+    slot = -1
+    while heap:
+        slot += 1
+        if slot == len(grid.members):
+            grid.open_slot()
+        deferred = []
+        while heap:
+            entry = heapq.heappop(heap)
+            if grid.fits(entry[2], slot):
+                grid.place(entry[2], slot)
+            else:
+                deferred.append(entry)
+        for entry in deferred:
+            heapq.heappush(heap, entry)
+
+    # Local search: empty the last slot by relocating its matches, until that stops working.
+    while len(grid.members) > max(bound, 1):
+        last = len(grid.members) - 1
+        if not grid.fixed.isdisjoint(grid.members[last]):
+            break
+        for match_id in sorted(grid.members[last]):
+            if not grid.relocate(match_id, last):
+                break
+        if grid.members[last]:
+            break
+        grid.members.pop()
+        grid.busy.pop()
+        grid.used.pop()
+
+    # Number the courts per slot and sport, skipping the ones matches in progress are on.
+    courts = {}
+    next_court = Counter()
+    placed = [m for m in grid.slot_of if m not in grid.fixed]
+    for match_id in sorted(placed, key=lambda m: (grid.slot_of[m], sport[m], m)):
+        cell = (grid.slot_of[match_id], sport[match_id])
+        next_court[cell] += 1
+        while taken[(*cell, next_court[cell])]:
+            next_court[cell] += 1
+        courts[match_id] = next_court[cell]
+    return Timetable({m: grid.slot_of[m] + first_slot for m in placed}, courts, bound, first_slot)
+
+
+def current_slot(matches: list[dict]) -> int:
+    """Where a timetable should start: the earliest slot still being played, else after the last finished one."""
+    playing = [m["time_slot"] for m in matches if m["status"] == "In Progress" and m.get("time_slot")]
+    if playing:
+        return min(playing)
+    finished = [m["time_slot"] for m in matches if m["status"] == "Completed" and m.get("time_slot")]
+    return max(finished, default=0) + 1
+
+
+def schedule_event(repository, tournaments: list[dict], courts_per_sport: dict) -> Timetable:
+    """Build a timetable for every pending match of an event and save it in one round trip."""
+    tournament_ids = [t["id"] for t in tournaments]
+    sport_of = {t["id"]: t["sport"] for t in tournaments}
+    teams = {team["id"]: team for team in repository.list_teams(tournament_ids)}
+    rows = repository.list_matches(tournament_ids, columns=SCHEDULE_COLUMNS)
+    matches = [m for m in rows if m["status"] == "Pending"]
+    occupied = [m for m in rows if m["status"] == "In Progress" and m.get("time_slot") and m.get("court_number")]
+    timetable = build_timetable(matches, teams, sport_of, courts_per_sport, occupied, current_slot(rows))
+    repository.save_match_slots(timetable.rows())
+    return timetable
+
@@ -0,0 +1,83 @@
+"""The match the Scoring page is showing, loaded once and then kept current.
+
+``MatchContext`` fetches the scoring projection (``SCORING_CONTEXT_COLUMNS``:
+the match state, the tournament's name and sport, and the two team names) when
+an umpire opens a match. After that, reruns cost no query. The cached row is
+only brought forward when:
+
+- a realtime change for the match arrives, which is merged in without a query;
+- events this session queued have left the score outbox since the last look,
+  which means a save landed, and triggers one small state read;
+- the realtime inbox overflowed and dropped changes, which triggers the same read.
+
+Events still waiting in the outbox are shown on top of the cached row. The
+outbox is shared by every session in the process, so the context remembers the
+keys of the events it queued itself and counts only those as its own writes.
+"""
+
+from matchpoint.scoring import BLANK, changes, positioned
+
+
+class MatchContext:
+    def __init__(self, match: dict):
+        self.match = match
+        self.delivered = 0
+        self.queued = set()
+
+    @property
+    def match_id(self):
+        return self.match["id"]
+
+    @classmethod
+    def load(cls, repository, match_id) -> "MatchContext | None":
+        match = repository.get_match_context(match_id)
+        return None if match is None else cls(match)
+
+    def enqueue(self, outbox, events: list[dict], session=None) -> list[dict]:
+        """Queue events for this match through ``outbox``, to be sent as ``session``'s user, and remember them.
+
+        The version shown goes with them, so set scores typed over a score that has since changed are held back.
+        """
+        queued = outbox.enqueue(self.match_id, events, session, base=self.match.get("version") or 0)
+        self.queued.update(event["key"] for event in queued)
+        return queued
+
+    def refresh(self, repository, outbox, match_changes: list[dict] | None) -> bool:
+        """Apply realtime changes and re-read the state after a save landed. Returns whether anything changed.
+
+        ``match_changes`` is None when the subscription dropped changes; the state is read again instead.
+        """
+        changed = reread = match_changes is None
+        for change in match_changes or []:
+            record = change.get("record") or {}
+            if (record.get("id") == self.match_id and change.get("type") == "UPDATE"
+                    and (record.get("version") or 0) >= (self.match.get("version") or 0)):
+                self.match.update({column: record[column] for column in BLANK if column in record})
+                changed = True
+        if self.queued:
+            self.queued -= outbox.discarded(self.queued)
+            landed = self.queued - outbox.unsent_keys(self.match_id)
+            if landed:
+                self.queued -= landed
+                self.delivered += len(landed)
+                changed = reread = True
+        if reread:
+            states = repository.list_match_states([self.match_id])
+            if states:
+                self.match.update(states[0])
+        return changed
+
+    def position(self) -> tuple:
+        """``(row version, events this session has delivered)``, to hand back to ``written_by_others``."""
+        return self.match.get("version") or 0, self.delivered
+
+    def written_by_others(self, seen: tuple) -> bool:
+        """Whether the row moved on by more than our own delivered events since ``seen``."""
+        version, delivered = seen
+        return (self.match.get("version") or 0) - version > self.delivered - delivered
+
+    def current(self, outbox) -> dict:
+        """The cached match with this match's queued score events applied."""
+        match = dict(self.match)
+        match.update(changes(match, positioned(match, outbox.pending_events(self.match_id))))
+        return match
@@ -0,0 +1,393 @@
+"""In-memory stand-in for the Supabase client.
+
+``MemoryClient`` implements the subset of the Supabase query builder that
+MatchPoint uses, so a ``Repository`` can run against it in benchmarks and
+local development without a Supabase project. Each ``execute()`` counts as one
+round trip and can be slowed down by ``latency`` seconds to mimic the network.
+Callables in ``listeners`` are called as ``listener(table, type, record,
+old_record)`` after every write, like a realtime subscription. Inserts honour
+the unique keys in ``UNIQUE_KEYS`` and fill in ``COLUMN_DEFAULTS``,
+``tournament_summaries`` is kept by ``matchpoint.summary.SummaryTrigger``, and
+``rpc()`` runs the Python twins of the SQL functions in ``FUNCTIONS``, all
+mirroring the migrations in ``sql/``.
+"""
+
+import copy
+import functools
+import itertools
+import re
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+from matchpoint.summary import SummaryTrigger
+
+UNIQUE_KEYS = {"score_events": [("match_id", "seq"), ("key",)]}
+COLUMN_DEFAULTS = {"matches": {"version": 0}, "profiles": {"role": "member"}}
+_EMBED_RE = re.compile(r"^(?:(?P<alias>\w+):)?(?P<table>\w+)(?:!(?P<hint>\w+))?\((?P<columns>.*)\)$", re.S)
+
+
+class MemoryAPIError(Exception):
+    """Raised like postgrest's ``APIError``, with the Postgres error ``code``."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class MemoryResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+@functools.lru_cache(maxsize=256)
+def _split_columns(columns: str) -> tuple[str, ...]:
+    """Split a select string on top-level commas, keeping embedded resources intact."""
+    parts, depth, current = [], 0, []
+    for char in columns:
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return tuple(parts)
+
+
+def _ilike(value, pattern) -> bool:
+    if value is None:
+        return False
+    regex = "^" + ".*".join(re.escape(part) for part in str(pattern).lower().split("%")) + "$"
+    return re.match(regex, str(value).lower(), re.S) is not None
+
+
+class _Query:
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._action = None
+        self._payload = None
+        self._columns = "*"
+        self._count = None
+        self._filters = []
+        self._order = []
+        self._offset = 0
+        self._limit = None
+        self._single = False
+        self._on_conflict = "id"
+
+    # --- ACTIONS ---
+    def select(self, columns="*", count=None):
+        self._action, self._columns, self._count = "select", columns, count
+        return self
+
+    def insert(self, rows):
+        self._action, self._payload = "insert", rows
+        return self
+
+    def update(self, values):
+        self._action, self._payload = "update", values
+        return self
+
+    def upsert(self, rows, on_conflict="id", **kwargs):
+        self._action, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # --- FILTERS ---
+    def _where(self, predicate):
+        self._filters.append(predicate)
+        return self
+
+    def eq(self, column, value):
+        return self._where(lambda row: row.get(column) == value)
+
+    def neq(self, column, value):
+        return self._where(lambda row: row.get(column) != value)
+
+    def gt(self, column, value):
+        return self._where(lambda row: row.get(column) is not None and row[column] > value)
+
+    def gte(self, column, value):
+        return self._where(lambda row: row.get(column) is not None and row[column] >= value)
+
+    def lt(self, column, value):
+        return self._where(lambda row: row.get(column) is not None and row[column] < value)
+
+    def lte(self, column, value):
+        return self._where(lambda row: row.get(column) is not None and row[column] <= value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._where(lambda row: row.get(column) in values)
+
+    def is_(self, column, value):
+        value = None if value in ("null", None) else value
+        return self._where(lambda row: row.get(column) is value)
+
+    def ilike(self, column, pattern):
+        return self._where(lambda row: _ilike(row.get(column), pattern))
+
+    def or_(self, filters: str):
+        """PostgREST ``or=(...)`` for ``column.eq.value`` and ``column.in.(a,b)`` terms."""
+        terms = []
+        for term in _split_columns(filters):
+            column, operator, value = term.split(".", 2)
+            if operator == "in":
+                terms.append((column, {v.strip().strip('"') for v in value.strip("()").split(",")}))
+            elif operator == "eq":
+                terms.append((column, {value}))
+            else:
+                raise ValueError(f"Unsupported operator in or_(): {operator}")
+        return self._where(lambda row: any(str(row.get(column)) in values for column, values in terms))
+
+    # --- MODIFIERS ---
+    def order(self, column, desc=False, nullsfirst=None):
+        # Postgres puts nulls last ascending and first descending unless told otherwise.
+        self._order.append((column, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def range(self, start, end):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    # --- EXECUTION ---
+    def execute(self):
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        with self._client.lock:
+            self._client.round_trips += 1
+            data = getattr(self, f"_run_{self._action}")()
+        if self._single:
+            if len(data) != 1:
+                raise ValueError(f"Expected a single row from '{self._table}', got {len(data)}")
+            data = data[0]
+        # Like PostgREST, a select's count is of every matching row, before limit/range.
+        count = getattr(self, "_total", len(data) if isinstance(data, list) else None) if self._count else None
+        return MemoryResponse(data, count)
+
+    def _matching(self):
+        rows = self._client.tables.setdefault(self._table, [])
+        return [row for row in rows if all(predicate(row) for predicate in self._filters)]
+
+    def _run_select(self):
+        rows = self._matching()
+        self._total = len(rows)
+        for column, desc, nullsfirst in reversed(self._order):
+            present = sorted((row for row in rows if row.get(column) is not None), key=lambda row: row[column],
+                             reverse=desc)
+            missing = [row for row in rows if row.get(column) is None]
+            rows = missing + present if nullsfirst else present + missing
+        end = None if self._limit is None else self._offset + self._limit
+        rows = rows[self._offset:end]
+        return [self._client.project(self._table, row, self._columns) for row in rows]
+
+    def _run_insert(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        self._client.check_unique(self._table, rows)
+        inserted = [self._client.add_row(self._table, row) for row in rows]
+        for row in inserted:
+            self._client.notify(self._table, "INSERT", row)
+        return copy.deepcopy(inserted)
+
+    def _run_update(self):
+        rows = self._matching()
+        for row in rows:
+            old = copy.deepcopy(row)
+            row.update(copy.deepcopy(self._payload))
+            self._client.notify(self._table, "UPDATE", row, old)
+        return copy.deepcopy(rows)
+
+    def _run_upsert(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        table = self._client.tables.setdefault(self._table, [])
+        keys = [key.strip() for key in self._on_conflict.split(",")]
+        index = {tuple(row.get(key) for key in keys): row for row in table}
+        result = []
+        for row in rows:
+            existing = index.get(tuple(row.get(key) for key in keys))
+            if existing is not None and all(row.get(key) is not None for key in keys):
+                old = copy.deepcopy(existing)
+                existing.update(copy.deepcopy(row))
+                self._client.notify(self._table, "UPDATE", existing, old)
+                result.append(existing)
+            else:
+                result.append(self._client.add_row(self._table, row))
+                self._client.notify(self._table, "INSERT", result[-1])
+        return copy.deepcopy(result)
+
+    def _run_delete(self):
+        doomed = self._matching()
+        doomed_ids = {id(row) for row in doomed}
+        self._client.tables[self._table] = [
+            row for row in self._client.tables[self._table] if id(row) not in doomed_ids
+        ]
+        for row in doomed:
+            self._client.notify(self._table, "DELETE", {}, row)
+        return copy.deepcopy(doomed)
+
+
+class _MemoryAuth:
+    """Email/password auth against a dict of users, mirroring ``client.auth``.
+
+    Sessions last ``session_seconds``; a refresh token can be used once.
+    """
+
+    def __init__(self, client, session_seconds: int = 3600):
+        self._client = client
+        self.users = {}
+        self.session_seconds = session_seconds
+        self._refresh_tokens = {}
+
+    def _session(self, user):
+        refresh_token = uuid.uuid4().hex
+        self._refresh_tokens[refresh_token] = user
+        return SimpleNamespace(
+            user=user,
+            session=SimpleNamespace(access_token=uuid.uuid4().hex, refresh_token=refresh_token,
+                                    expires_in=self.session_seconds,
+                                    expires_at=int(time.time()) + self.session_seconds),
+        )
+
+    def sign_up(self, credentials):
+        user = SimpleNamespace(id=str(uuid.uuid4()), email=credentials["email"])
+        self.users[credentials["email"]] = (credentials["password"], user)
+        self._client.add_row("profiles", {"id": user.id})
+        return self._session(user)
+
+    def sign_in_with_password(self, credentials):
+        password, user = self.users.get(credentials["email"], (None, None))
+        if user is None or password != credentials["password"]:
+            raise ValueError("Invalid login credentials")
+        return self._session(user)
+
+    def refresh_session(self, refresh_token):
+        user = self._refresh_tokens.pop(refresh_token, None)
+        if user is None:
+            raise ValueError("Invalid Refresh Token")
+        return self._session(user)
+
+
+def _save_match_slots(client, slots: list[dict]) -> list:
+    """``sql/007_save_match_slots.sql``: set the slot and court of matches that are still Pending."""
+    by_id = {row["id"]: row for row in client.tables.get("matches", [])}
+    saved = []
+    for slot in slots:
+        match = by_id.get(slot["id"])
+        if match is None or match.get("status") != "Pending":
+            continue
+        old = copy.deepcopy(match)
+        match.update(time_slot=slot["time_slot"], court_number=slot["court_number"])
+        client.notify("matches", "UPDATE", match, old)
+        saved.append(match["id"])
+    return saved
+
+
+FUNCTIONS = {"save_match_slots": _save_match_slots}
+
+
+class _Call:
+    """``client.rpc(name, params)``: one round trip running ``FUNCTIONS[name]``."""
+
+    def __init__(self, client, name: str, params: dict):
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self):
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        with self._client.lock:
+            self._client.round_trips += 1
+            return MemoryResponse(FUNCTIONS[self._name](self._client, **copy.deepcopy(self._params)))
+
+
+class MemoryClient:
+    """A dict-of-lists database that answers Supabase-style query chains."""
+
+    def __init__(self, tables: dict | None = None, latency: float = 0.0):
+        self.tables = {
+            name: [{**COLUMN_DEFAULTS.get(name, {}), **row} for row in rows] for name, rows in (tables or {}).items()
+        }
+        self.latency = latency
+        self.round_trips = 0
+        self.lock = threading.RLock()
+        self.auth = _MemoryAuth(self)
+        self._ids = {}
+        summary = SummaryTrigger(self)
+        summary.backfill()
+        self.listeners = [summary]
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: dict) -> _Call:
+        return _Call(self, name, params)
+
+    def add_row(self, table: str, row: dict) -> dict:
+        rows = self.tables.setdefault(table, [])
+        if table not in self._ids:
+            self._ids[table] = itertools.count(max((r.get("id", 0) for r in rows if isinstance(r.get("id"), int)), default=0) + 1)
+        stored = {**COLUMN_DEFAULTS.get(table, {}), **copy.deepcopy(row)}
+        if stored.get("id") is None:
+            stored["id"] = next(self._ids[table])
+        rows.append(stored)
+        return stored
+
+    def check_unique(self, table: str, rows: list[dict]) -> None:
+        """Reject the whole insert if any row repeats a unique key, like one Postgres statement."""
+        for key in UNIQUE_KEYS.get(table, []):
+            seen = {tuple(row.get(column) for column in key) for row in self.tables.get(table, [])}
+            for row in rows:
+                value = tuple(row.get(column) for column in key)
+                if None in value:
+                    continue  # NULLs never collide, as in Postgres
+                if value in seen:
+                    raise MemoryAPIError(
+                        f'duplicate key value violates unique constraint "{table}_{"_".join(key)}_key"', "23505"
+                    )
+                seen.add(value)
+
+    def notify(self, table: str, change_type: str, record: dict, old_record: dict | None = None) -> None:
+        for listener in self.listeners:
+            listener(table, change_type, copy.deepcopy(record), old_record)
+
+    def project(self, table: str, row: dict, columns: str) -> dict:
+        """Apply a PostgREST select string, including many-to-one embeds, to one row."""
+        result = {}
+        for column in _split_columns(columns):
+            embed = _EMBED_RE.match(column)
+            if column == "*":
+                result.update(copy.deepcopy(row))
+            elif embed:
+                target = embed.group("table")
+                hint = embed.group("hint")
+                if hint:
+                    fk = hint.removeprefix(f"{table}_").removesuffix("_fkey")
+                else:
+                    fk = f"{target.removesuffix('s')}_id"
+                parent = next((r for r in self.tables.get(target, []) if r.get("id") == row.get(fk)), None)
+                name = embed.group("alias") or target
+                result[name] = None if parent is None else self.project(target, parent, embed.group("columns"))
+            else:
+                result[column] = copy.deepcopy(row.get(column))
+        return result
@@ -0,0 +1,340 @@
+"""A durable write-behind queue for score events.
+
+When the Streamlit server runs at the venue and its link to Supabase is flaky,
+umpires should not wait on (or lose) a write. ``ScoreOutbox`` stores every
+score event in a local SQLite file first, so saving a score returns at once and
+survives a restart. A background thread sends the queued events one match at a
+time, each match's events in a single insert.
+
+A transient failure (no connection, a timeout, a 5xx, a database that is
+restarting or overloaded) stops the flush, which backs off exponentially while
+it lasts. Any other failure will not go away by sending again, so that match's
+batch is set aside as failed, with its error, and the other matches carry on.
+The match's later events wait behind the failed batch until someone retries or
+discards it from the Scoring page.
+
+Events are sent as the signed-in user who queued them: ``enqueue`` takes that
+user's ``AuthSession`` and the flush writes through ``Repository.for_session``,
+so row-level security sees the umpire, not the shared client. Sessions hold
+tokens, so they are kept in memory only, never in the file. Events left over
+from before a restart are sent with the shared client; if the database refuses
+them they wait as failed until an umpire retries them, which sends them as that
+umpire.
+
+Every event carries a ``key`` that ``score_events`` keeps unique. A batch
+that reached the database but whose reply got lost is recognised by its keys
+on the next attempt and dropped, so retries never apply an event twice. If
+someone else wrote to the match in the meantime, points are appended after
+their events (points are increments, so both are kept). Set scores and
+completions replace what was there, so each queued event also remembers the
+match version its umpire saw (``base``). A batch with one of those, sent after
+someone else's events moved the match past its base, is set aside as failed
+with ``StaleScores`` instead of overwriting them. Retrying it from the Scoring
+page sends it anyway.
+
+Each function in ``listeners`` is called as ``listener(repository, match)``
+once a batch is saved, with the repository it went through and the match row
+as the database now has it. This is how standings follow confirmed scores
+only. A listener that raises is logged and does not hold up the queue.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from matchpoint.auth import AuthSession
+from matchpoint.scoring import COMPLETE, SET, ScoreConflict, record
+
+log = logging.getLogger("matchpoint.outbox")
+
+MAX_REBASES = 5
+# Discarded keys are remembered so sessions do not count them as delivered; the oldest are forgotten first.
+MAX_DISCARDED = 10_000
+# SQLSTATE classes worth retrying: connection exceptions, rolled-back transactions
+# (deadlocks, serialization failures), insufficient resources, operator intervention.
+TRANSIENT_SQLSTATES = ("08", "40", "53", "57")
+# PostgREST could not reach Postgres, or its schema cache is not loaded yet.
+TRANSIENT_POSTGREST = ("PGRST000", "PGRST001", "PGRST002", "PGRST003")
+
+
+class StillChanging(RuntimeError):
+    """The match kept moving while a batch was rebased onto it; later it may settle."""
+
+
+class StaleScores(RuntimeError):
+    """Set scores or a completion entered before someone else's scores reached the match."""
+
+    def __init__(self, match_id):
+        super().__init__(f"Match {match_id} was changed by another umpire before these scores were sent. "
+                         "Check the score, then retry to save them anyway or discard them.")
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether sending the same batch again later may succeed."""
+    if isinstance(error, (OSError, TimeoutError, StillChanging)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        pass
+    else:
+        if isinstance(error, httpx.TransportError):
+            return True
+    # postgrest's APIError carries the SQLSTATE, a PostgREST code, or the HTTP status when the body is not JSON.
+    code = str(getattr(error, "code", None) or "")
+    if len(code) == 3 and code.isdigit():
+        return code[0] == "5" or code in ("408", "429")
+    return (len(code) == 5 and code[:2] in TRANSIENT_SQLSTATES) or code in TRANSIENT_POSTGREST
+
+
+class ScoreOutbox:
+    def __init__(self, path: str = ":memory:", base_delay: float = 1.0, max_delay: float = 60.0,
+                 batch_size: int = 500, clock=time.monotonic):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self._clock = clock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute(
+            "create table if not exists outbox ("
+            "id integer primary key autoincrement, key text not null unique, "
+            "match_id text not null, event text not null, error text, base integer)"
+        )
+        columns = {row[1] for row in self._db.execute("pragma table_info(outbox)")}
+        for column, kind in (("error", "text"), ("base", "integer")):
+            if column not in columns:
+                self._db.execute(f"alter table outbox add column {column} {kind}")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._retry_at = 0.0
+        self.failures = 0
+        self.last_error = None
+        self.sent = 0
+        self.delivered = {}
+        self.listeners = []
+        self._discarded = OrderedDict()
+        self._versions = {}
+        self._writers = {}
+
+    # --- QUEUE ---
+    def enqueue(self, match_id, events: list[dict], session: AuthSession | None = None,
+                base: int | None = None) -> list[dict]:
+        """Store events to be sent as ``session``'s user and return them stamped with ``key`` and ``created_at``.
+
+        ``base`` is the match version the umpire was looking at, without the
+        events still queued here. Without it, set scores are never held back.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        stamped = [{"created_at": now, **event, "key": str(uuid.uuid4())} for event in events]
+        with self._lock:
+            if session is not None:
+                self._writers.update(dict.fromkeys((event["key"] for event in stamped), session))
+            if base is not None:
+                # Queued events land first; a batch this outbox sent since the umpire's last look counts as seen too.
+                base = max(base, self._versions.get(match_id, 0)) + self._db.execute(
+                    "select count(*) from outbox where match_id = ? and error is null", (json.dumps(match_id),)
+                ).fetchone()[0]
+            self._db.executemany(
+                "insert into outbox (key, match_id, event, base) values (?, ?, ?, ?)",
+                [(event["key"], json.dumps(match_id), json.dumps(event), None if base is None else base + i)
+                 for i, event in enumerate(stamped)],
+            )
+        self._wake.set()
+        return stamped
+
+    def pending(self) -> int:
+        """Events still to be sent, including those waiting behind a failed batch."""
+        with self._lock:
+            return self._db.execute("select count(*) from outbox where error is null").fetchone()[0]
+
+    def pending_events(self, match_id) -> list[dict]:
+        """Queued events for one match, oldest first, to show on top of the saved score."""
+        with self._lock:
+            rows = self._db.execute(
+                "select event from outbox where match_id = ? and error is null order by id", (json.dumps(match_id),)
+            ).fetchall()
+        return [json.loads(event) for (event,) in rows]
+
+    def unsent_keys(self, match_id) -> set:
+        """Keys of one match's events that have not reached the database, queued or failed."""
+        with self._lock:
+            rows = self._db.execute("select key from outbox where match_id = ?", (json.dumps(match_id),)).fetchall()
+        return {key for (key,) in rows}
+
+    def _oldest(self) -> list[tuple]:
+        """The oldest queued events with their bases, leaving out every match that has a failed batch."""
+        with self._lock:
+            rows = self._db.execute(
+                "select key, match_id, event, base from outbox where error is null and match_id not in "
+                "(select match_id from outbox where error is not null) order by id limit ?", (self.batch_size,)
+            ).fetchall()
+        return [(key, json.loads(match_id), json.loads(event), base) for key, match_id, event, base in rows]
+
+    def _remove(self, keys: list[str], match_id, version: int) -> None:
+        """Drop delivered events; the match's new version is noted in the same step, for ``enqueue``."""
+        with self._lock:
+            self._versions[match_id] = version
+            self._db.executemany("delete from outbox where key = ?", [(key,) for key in keys])
+            for key in keys:
+                self._writers.pop(key, None)
+
+    def _fail(self, keys: list[str], error: Exception) -> None:
+        with self._lock:
+            self._db.executemany("update outbox set error = ? where key = ?", [(str(error), key) for key in keys])
+
+    # --- FAILED BATCHES ---
+    def failed(self) -> list[dict]:
+        """One row per match with a failed batch: ``match_id``, ``events`` (how many) and the ``error``."""
+        with self._lock:
+            rows = self._db.execute(
+                "select match_id, count(*), max(error) from outbox where error is not null "
+                "group by match_id order by min(id)"
+            ).fetchall()
+        return [{"match_id": json.loads(match_id), "events": count, "error": error} for match_id, count, error in rows]
+
+    def retry(self, match_id, session: AuthSession | None = None) -> None:
+        """Queue a match's failed batch again, ahead of its later events, sent as ``session``'s user if given.
+
+        The batch is sent onto the match as it is then, even if someone else's scores landed first.
+        """
+        with self._lock:
+            if session is not None:
+                rows = self._db.execute(
+                    "select key from outbox where match_id = ? and error is not null", (json.dumps(match_id),)
+                ).fetchall()
+                self._writers.update(dict.fromkeys((key for (key,) in rows), session))
+            self._db.execute("update outbox set error = null, base = null where match_id = ? and error is not null",
+                             (json.dumps(match_id),))
+        self._wake.set()
+
+    def discard(self, match_id) -> int:
+        """Drop a match's failed batch for good. Returns how many events were dropped."""
+        with self._lock:
+            rows = self._db.execute(
+                "select key from outbox where match_id = ? and error is not null", (json.dumps(match_id),)
+            ).fetchall()
+            self._db.execute("delete from outbox where match_id = ? and error is not null", (json.dumps(match_id),))
+            for (key,) in rows:
+                self._writers.pop(key, None)
+                self._discarded[key] = None
+            while len(self._discarded) > MAX_DISCARDED:
+                self._discarded.popitem(last=False)
+        self._wake.set()
+        return len(rows)
+
+    def discarded(self, keys) -> set:
+        """Which of ``keys`` were dropped by ``discard`` (among the last ``MAX_DISCARDED``), not delivered."""
+        with self._lock:
+            return {key for key in keys if key in self._discarded}
+
+    # --- DELIVERY ---
+    def flush(self, repository) -> int:
+        """Send what is queued, oldest first. Returns the number of events delivered.
+
+        Stops at the first transient failure and waits out the backoff before
+        trying again; a batch that fails for any other reason is marked failed.
+        """
+        if self._clock() < self._retry_at:
+            return 0
+        with self._flush_lock:
+            delivered = 0
+            while True:
+                rows = self._oldest()
+                if not rows:
+                    break
+                # One batch per run of a match's events queued by the same user, in queue order.
+                batches, last = [], {}
+                with self._lock:
+                    writers = [self._writers.get(key) for key, _, _, _ in rows]
+                for (key, match_id, event, base), session in zip(rows, writers):
+                    batch = last.get(match_id)
+                    if batch is None or batch[1] is not session:
+                        batch = last[match_id] = (match_id, session, [], base)
+                        batches.append(batch)
+                    batch[2].append(event)
+                try:
+                    states = {m["id"]: m for m in repository.list_match_states(list(last))}
+                    failed = set()
+                    for match_id, session, events, base in batches:
+                        if match_id in failed:
+                            continue  # later events wait behind the failed batch
+                        writer = repository if session is None else repository.for_session(session)
+                        try:
+                            states[match_id] = self._send(writer, states.get(match_id, {"id": match_id}), events, base)
+                        except Exception as e:
+                            if is_transient(e):
+                                raise
+                            self._fail([event["key"] for event in events], e)
+                            failed.add(match_id)
+                            continue
+                        self._remove([event["key"] for event in events], match_id, states[match_id].get("version") or 0)
+                        delivered += len(events)
+                        self.delivered[match_id] = self.delivered.get(match_id, 0) + len(events)
+                        self._notify(writer, states[match_id])
+                except Exception as e:
+                    self.failures += 1
+                    self.last_error = str(e)
+                    delay = self.base_delay * 2 ** min(self.failures - 1, 16)
+                    self._retry_at = self._clock() + min(delay, self.max_delay)
+                    break
+                self.failures, self.last_error = 0, None
+            self.sent += delivered
+            return delivered
+
+    def _notify(self, repository, match: dict) -> None:
+        for listener in self.listeners:
+            try:
+                listener(repository, match)
+            except Exception:
+                log.exception("score outbox listener failed for match %s", match.get("id"))
+
+    def _send(self, repository, match: dict, events: list[dict], base: int | None = None) -> dict:
+        """Append one batch to the match's log; returns the match state after it.
+
+        ``base`` is the version the batch's first event was entered on. If the
+        batch sets a score or completes the match and the log has moved past
+        it, raises ``StaleScores`` rather than append after someone else.
+        """
+        absolute = base is not None and any(event["kind"] in (SET, COMPLETE) for event in events)
+        for _ in range(MAX_REBASES):
+            if absolute and (match.get("version") or 0) != base:
+                # Part of the batch may have landed on an earlier attempt; only events beyond those are someone else's.
+                landed = repository.existing_score_event_keys([event["key"] for event in events])
+                events = [event for event in events if event["key"] not in landed]
+                if not events:
+                    return match
+                base += len(landed)
+                if (match.get("version") or 0) != base:
+                    raise StaleScores(match["id"])
+            try:
+                return {**match, **record(repository, match, events)}
+            except ScoreConflict as conflict:
+                # Drop whatever an earlier attempt already landed, then append the rest after the log's end.
+                landed = repository.existing_score_event_keys([event["key"] for event in events])
+                events = [event for event in events if event["key"] not in landed]
+                match = {**match, **conflict.match}
+                if base is not None:
+                    base += len(landed)
+                if not events:
+                    return match
+        raise StillChanging(f"Match {match['id']} kept changing while its queued scores were sent.")
+
+    # --- BACKGROUND ---
+    def start(self, repository, interval: float = 2.0) -> "ScoreOutbox":
+        """Flush from a daemon thread whenever something is queued, and every ``interval`` seconds."""
+        def run():
+            while True:
+                self._wake.wait(timeout=max(interval, self._retry_at - self._clock()))
+                self._wake.clear()
+                self.flush(repository)
+
+        threading.Thread(target=run, name="matchpoint-outbox", daemon=True).start()
+        return self
@@ -0,0 +1,50 @@
+"""Setup every page shares: page config, profiling hooks, the sign-in gate and the connection.
+
+A page starts with ``setup``, then ``require_login`` (or not, for the public
+pages), and only then imports pandas and the modules built on it and calls
+``connect``. Nothing this module imports pulls in pandas, pyarrow or the
+Supabase client, and ``matchpoint.connection`` builds the client on first use,
+so a visitor who is not signed in pays for none of them. Python keeps the
+imported modules for the life of the server process, so each is loaded once.
+"""
+
+import streamlit as st
+
+from matchpoint import profiling
+from matchpoint.auth import AuthSession
+from matchpoint.connection import current_session, get_repository, get_session_repository
+from matchpoint.perf_panel import start_page
+
+LOGIN_MESSAGE = "You must be logged in to access this page."
+
+
+def setup(name: str, page_title: str | None = None, icon: str | None = None, layout: str = "wide",
+          title: str | None = None) -> None:
+    """``st.set_page_config`` and the profiling hook for the page ``name``, then its ``title`` heading if given."""
+    st.set_page_config(page_title=page_title or name, page_icon=icon, layout=layout)
+    start_page(name)
+    if title:
+        st.title(title)
+
+
+def require_login(message: str = LOGIN_MESSAGE, admin: bool = False) -> AuthSession:
+    """The signed-in session; otherwise show ``message`` and stop the page."""
+    profiling.mark("sign-in")
+    session = current_session()
+    if session is None or (admin and not session.is_admin):
+        st.warning(message)
+        if session is None:
+            st.info("Please log in using the main 'app' page first.")
+        st.stop()
+    return session
+
+
+def connect(as_user: bool = True):
+    """The repository, querying as the signed-in user unless ``as_user`` is False; stops the page if it fails."""
+    profiling.mark("connect")
+    try:
+        return get_session_repository() if as_user else get_repository()
+    except Exception as e:
+        st.error("Error connecting to database. Please check secrets.")
+        st.caption(f"Details: {e}")
+        st.stop()
@@ -0,0 +1,58 @@
+"""Keyset pagination state for long lists.
+
+Pages are fetched with ``id > last id of the previous page`` rather than an
+offset, so page 40 costs the database as much as page 1. ``KeysetPager`` keeps
+the cursor of every page visited, so "Previous" needs no extra query, and
+starts over whenever the filters change.
+"""
+
+
+class KeysetPager:
+    def __init__(self, page_size: int):
+        self.page_size = page_size
+        self.cursors = [None]
+        self.filters = None
+        self.last_id = None
+        self.total = 0
+
+    def use_filters(self, filters: tuple) -> None:
+        """Go back to the first page if the filters differ from the ones the pages were fetched with."""
+        if filters != self.filters:
+            self.filters = filters
+            self.cursors = [None]
+
+    @property
+    def after(self):
+        """The cursor to fetch the current page with."""
+        return self.cursors[-1]
+
+    @property
+    def offset(self) -> int:
+        return (len(self.cursors) - 1) * self.page_size
+
+    def loaded(self, rows: list[dict], remaining: int) -> None:
+        """Record the page just fetched and the count of rows from it onwards."""
+        self.last_id = rows[-1]["id"] if rows else None
+        self.total = self.offset + remaining
+
+    @property
+    def has_previous(self) -> bool:
+        return len(self.cursors) > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.last_id is not None and self.offset + self.page_size < self.total
+
+    def next_page(self) -> None:
+        if self.has_next:
+            self.cursors.append(self.last_id)
+
+    def previous_page(self) -> None:
+        if self.has_previous:
+            self.cursors.pop()
+
+    def caption(self, noun: str) -> str:
+        if not self.total:
+            return f"No {noun} found."
+        last = min(self.offset + self.page_size, self.total)
+        return f"Showing {noun} {self.offset + 1}-{last} of {self.total}."
@@ -0,0 +1,65 @@
+"""The sidebar performance panel and the per-page profiling hooks.
+
+Every page calls ``start_page`` right after ``st.set_page_config`` (see
+``matchpoint.page.setup``) and ``end_page`` as its last line; ``matchpoint.profiling.mark`` in between names
+the page's sections. The panel is offered to admins. A rerun is only profiled
+while the panel is switched on for the session or ``MATCHPOINT_PROFILE_LOG`` is
+set, so with both off the hooks cost a session-state lookup and pandas is
+never imported for them.
+
+A rerun cut short by ``st.stop()`` is closed at the start of the next one; its
+numbers go to the log and histograms but not to the panel.
+"""
+
+import streamlit as st
+
+from matchpoint import profiling
+from matchpoint.connection import current_session
+
+PANEL_KEY = "perf_panel"
+
+
+def start_page(page: str) -> None:
+    stale = st.session_state.pop("_perf_profile", None)
+    if stale is not None:
+        profiling.finish(stale)
+    if st.session_state.get(PANEL_KEY) or profiling.logging_enabled():
+        st.session_state["_perf_profile"] = profiling.begin(page)
+
+
+def _keep_panel_setting():
+    # Widget state is dropped when the user changes page, so the setting lives under its own key.
+    st.session_state[PANEL_KEY] = st.session_state["_perf_panel_toggle"]
+
+
+def end_page() -> None:
+    profile = st.session_state.pop("_perf_profile", None)
+    summary = profiling.finish(profile) if profile is not None else None
+    session = current_session()
+    if session is None or not session.is_admin:
+        return
+    st.sidebar.toggle("Performance panel", value=st.session_state.get(PANEL_KEY, False), key="_perf_panel_toggle",
+                      on_change=_keep_panel_setting, help="Time this page's database calls and sections on every rerun.")
+    if summary is not None and st.session_state.get(PANEL_KEY):
+        render_panel(summary)
+
+
+def render_panel(summary: dict) -> None:
+    import pandas as pd  # only admins with the panel on need it; every page imports this module
+
+    with st.sidebar.expander("Performance", expanded=True):
+        st.metric("Last rerun", f"{summary['ms']:.0f} ms")
+        st.caption(
+            f"{summary['round_trips']} round trips in {summary['db_ms']:.0f} ms, "
+            f"{summary['rows']} rows, {summary['bytes'] / 1024:.1f} KiB"
+        )
+        if summary["sections"]:
+            sections = pd.DataFrame(summary["sections"])
+            sections["other_ms"] = sections["ms"] - sections["db_ms"]
+            st.dataframe(sections[["section", "ms", "db_ms", "other_ms", "round_trips"]].round(1), hide_index=True)
+        if summary["calls"]:
+            st.dataframe(pd.DataFrame(summary["calls"]).round(1), hide_index=True)
+        counts = profiling.histograms.snapshot().get(summary["page"])
+        if counts:
+            st.write("**Rerun times on this page (all sessions)**")
+            st.bar_chart(pd.DataFrame({"reruns": counts}, index=profiling.histograms.labels()))
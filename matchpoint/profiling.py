@@ -0,0 +1,151 @@
+"""Per-rerun timings: database round trips, page sections and a histogram per page.
+
+A page starts a ``RerunProfile`` at the top of a rerun and calls ``mark`` at
+each of its sections. ``Repository._execute`` hands every query to the profile
+of the rerun running in the current thread, which records the calling method,
+wall time, row count and JSON payload size. ``finish`` closes the profile,
+adds the rerun's time to the process-wide ``histograms`` and logs the summary
+as one JSON line on the ``matchpoint.perf`` logger.
+
+When no profile is running, each hook is a single context-variable lookup.
+Set ``MATCHPOINT_PROFILE_LOG`` to a file path (or ``-`` for stderr) to profile
+every rerun and write the JSON lines there.
+"""
+
+import bisect
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+log = logging.getLogger("matchpoint.perf")
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current = contextvars.ContextVar("matchpoint_rerun_profile", default=None)
+_log_lock = threading.Lock()
+_log_configured = False
+
+
+class RerunProfile:
+    def __init__(self, page: str):
+        self.page = page
+        self.started = time.perf_counter()
+        self.calls = []
+        self.sections = []
+        self.section = None
+        self._section_started = self.started
+        self.elapsed_ms = None
+
+    def mark(self, section: str) -> None:
+        """End the current section and start ``section``."""
+        now = time.perf_counter()
+        self._close_section(now)
+        self.section, self._section_started = section, now
+
+    def _close_section(self, now: float) -> None:
+        if self.section is not None:
+            self.sections.append({"section": self.section, "ms": (now - self._section_started) * 1000})
+
+    def execute(self, query, call: str):
+        start = time.perf_counter()
+        response = query.execute()
+        elapsed = (time.perf_counter() - start) * 1000
+        data = response.data
+        rows = len(data) if isinstance(data, list) else int(data is not None)
+        self.calls.append({"section": self.section, "call": call, "ms": elapsed, "rows": rows,
+                           "bytes": len(json.dumps(data, default=str))})
+        return response
+
+    def finish(self) -> None:
+        if self.elapsed_ms is None:
+            now = time.perf_counter()
+            self._close_section(now)
+            self.elapsed_ms = (now - self.started) * 1000
+
+    def summary(self) -> dict:
+        """Totals for the rerun, with database time split out per section."""
+        sections = []
+        for section in self.sections:
+            calls = [c for c in self.calls if c["section"] == section["section"]]
+            sections.append({**section, "round_trips": len(calls), "db_ms": sum(c["ms"] for c in calls)})
+        return {
+            "page": self.page,
+            "ms": self.elapsed_ms,
+            "round_trips": len(self.calls),
+            "db_ms": sum(c["ms"] for c in self.calls),
+            "rows": sum(c["rows"] for c in self.calls),
+            "bytes": sum(c["bytes"] for c in self.calls),
+            "sections": sections,
+            "calls": self.calls,
+        }
+
+
+class PageHistograms:
+    """Counts of rerun times per page in fixed buckets (``BUCKETS_MS``), shared by every session."""
+
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, page: str, ms: float) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(page, [0] * (len(self.bounds) + 1))
+            counts[bisect.bisect_left(self.bounds, ms)] += 1
+
+    def labels(self) -> list[str]:
+        return [f"<= {b} ms" for b in self.bounds] + [f"> {self.bounds[-1]} ms"]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {page: list(counts) for page, counts in self._counts.items()}
+
+
+histograms = PageHistograms()
+
+
+def logging_enabled() -> bool:
+    """Whether every rerun is profiled for the JSON log; sets up the log handler on first use."""
+    global _log_configured
+    target = os.environ.get("MATCHPOINT_PROFILE_LOG")
+    if not target:
+        return False
+    with _log_lock:
+        if not _log_configured:
+            handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log.addHandler(handler)
+            log.setLevel(logging.INFO)
+            _log_configured = True
+    return True
+
+
+def current() -> RerunProfile | None:
+    return _current.get()
+
+
+def begin(page: str) -> RerunProfile:
+    profile = RerunProfile(page)
+    _current.set(profile)
+    return profile
+
+
+def mark(section: str) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.mark(section)
+
+
+def finish(profile: RerunProfile) -> dict:
+    """Close ``profile``, record it in the histograms and the log, and return its summary."""
+    if _current.get() is profile:
+        _current.set(None)
+    profile.finish()
+    summary = profile.summary()
+    histograms.add(profile.page, summary["ms"])
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps(summary))
+    return summary
@@ -0,0 +1,214 @@
+"""Push updates for the ``matches`` table.
+
+One ``MatchBroker`` per process receives row changes, either from Supabase
+realtime (``SupabaseMatchFeed``, one websocket for the whole process) or from
+``MemoryClient`` writes, and fans them out to every open session. Each session
+keeps a ``ScheduleModel`` of the rows it is showing and patches only the rows
+that changed, so the schedule can be re-rendered without re-querying.
+
+A change is a dict shaped like Supabase's postgres_changes data:
+``{"type": "INSERT" | "UPDATE" | "DELETE", "record": {...}, "old_record": {...}}``.
+
+An inbox holds at most ``MAX_PENDING`` changes. A tab left open in the
+background stops draining its inbox while every court keeps scoring; rather
+than keep each change in memory for it, a full inbox is emptied and marked
+stale, and its next ``drain`` tells the subscriber to reload what it shows.
+The same happens to every inbox when the realtime connection drops, since the
+changes made while it is down are never delivered.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+
+log = logging.getLogger("matchpoint.realtime")
+
+MAX_PENDING = 1000
+
+
+class Subscription:
+    """A session's inbox of pending match changes."""
+
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._changes = []
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def put(self, change: dict) -> None:
+        with self._lock:
+            if self._stale:
+                return
+            if len(self._changes) >= self.max_pending:
+                self._changes, self._stale = [], True
+                return
+            self._changes.append(change)
+
+    def invalidate(self) -> None:
+        """Drop what is pending and make the next ``drain`` ask for a reload."""
+        with self._lock:
+            self._changes, self._stale = [], True
+
+    def drain(self) -> list[dict] | None:
+        """The changes since the last drain, oldest first; None if some were dropped and the subscriber must reload."""
+        with self._lock:
+            changes = None if self._stale else self._changes
+            self._changes, self._stale = [], False
+            return changes
+
+
+class MatchBroker:
+    """In-process pub/sub for match changes.
+
+    Subscriptions are held weakly: when a session's state is dropped its
+    inbox disappears with it.
+    """
+
+    def __init__(self):
+        self._subscriptions = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription()
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def publish(self, change: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(change)
+
+    def invalidate(self) -> None:
+        """Tell every subscriber to reload: some changes will never arrive."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.invalidate()
+
+    def publish_write(self, table: str, change_type: str, record: dict, old_record: dict | None = None) -> None:
+        """Listener for ``MemoryClient`` writes, the local stand-in for Supabase realtime."""
+        if table == "matches":
+            self.publish({"type": change_type, "record": record, "old_record": old_record or {}})
+
+
+class ScheduleModel:
+    """The match rows a session is showing, grouped by tournament and patched in place.
+
+    A ``windowed`` model holds one page of each tournament's matches at a time
+    (see ``set_window``) and only patches rows on that page: a new match or one
+    on another page shows up the next time a page is fetched.
+    """
+
+    def __init__(self, matches_by_tournament: dict, windowed: bool = False):
+        self.by_tournament = {tid: {m["id"]: m for m in rows} for tid, rows in matches_by_tournament.items()}
+        self.windowed = windowed
+        self.windows = {}
+        self.changed = set()
+
+    def set_window(self, tournament_id, rows: list[dict], key=None) -> None:
+        """Replace a tournament's rows with a freshly fetched page; ``key`` identifies the page (filters and cursor)."""
+        self.by_tournament[tournament_id] = {m["id"]: m for m in rows}
+        self.windows[tournament_id] = key
+
+    def window(self, tournament_id):
+        """The key of the page held for a tournament, or None if no page has been fetched yet."""
+        return self.windows.get(tournament_id)
+
+    def invalidate(self) -> None:
+        """Forget every page, so each tournament fetches its page again (after missed changes)."""
+        self.windows.clear()
+
+    def matches(self, tournament_id) -> list[dict]:
+        return sorted(self.by_tournament.get(tournament_id, {}).values(), key=lambda m: m["id"])
+
+    def apply(self, change: dict) -> bool:
+        """Patch one row. Returns False if the change is for a tournament not on screen."""
+        record = change.get("record") or change.get("old_record") or {}
+        tournament_id = record.get("tournament_id")
+        if tournament_id is None:
+            tournament_id = next((tid for tid, rows in self.by_tournament.items() if record.get("id") in rows), None)
+        rows = self.by_tournament.get(tournament_id)
+        if rows is None:
+            return False
+        if change["type"] == "DELETE":
+            rows.pop(record.get("id"), None)
+        elif self.windowed and record["id"] not in rows:
+            return False
+        else:
+            rows[record["id"]] = {**rows.get(record["id"], {}), **change["record"]}
+        self.changed.add(tournament_id)
+        return True
+
+    def apply_all(self, changes: list[dict]) -> int:
+        return sum(self.apply(change) for change in changes)
+
+
+class SupabaseMatchFeed:
+    """Forward Supabase realtime changes on ``matches`` into a broker from a background thread.
+
+    When the channel fails, closes or times out, the feed logs it, invalidates
+    every subscription and connects again, waiting ``base_delay`` seconds,
+    doubled after each failure up to ``max_delay``. Joining again invalidates
+    them once more, for the changes made in between.
+    """
+
+    def __init__(self, url: str, key: str, broker: MatchBroker, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.url = url
+        self.key = key
+        self.broker = broker
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.connections = 0
+        self._thread = threading.Thread(target=self._run, name="matchpoint-realtime", daemon=True)
+
+    def start(self) -> "SupabaseMatchFeed":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        asyncio.run(self._listen())
+
+    async def _listen(self) -> None:
+        from realtime import RealtimeSubscribeStates
+        from supabase import acreate_client
+
+        failures = 0
+        while True:
+            lost = asyncio.Event()
+
+            def on_status(status, error=None):
+                nonlocal failures
+                if status == RealtimeSubscribeStates.SUBSCRIBED:
+                    if self.connections:
+                        self.broker.invalidate()
+                    self.connections += 1
+                    failures = 0
+                else:
+                    log.warning("realtime channel for matches %s: %s", status.value, error)
+                    lost.set()
+
+            client = None
+            try:
+                client = await acreate_client(self.url, self.key)
+                channel = client.channel("matchpoint-matches")
+                channel.on_postgres_changes(
+                    "*", schema="public", table="matches",
+                    callback=lambda payload: self.broker.publish(dict(payload["data"])),
+                )
+                await channel.subscribe(on_status)
+                await lost.wait()
+            except Exception:
+                log.exception("realtime feed for matches failed")
+            if client is not None:
+                try:
+                    await client.remove_all_channels()
+                except Exception:
+                    log.debug("could not close the realtime channel", exc_info=True)
+            self.broker.invalidate()
+            failures += 1
+            delay = min(self.base_delay * 2 ** (failures - 1), self.max_delay)
+            log.info("reconnecting the realtime feed for matches in %.0f s", delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,334 @@
+"""Data access for MatchPoint.
+
+Every page talks to the database through a ``Repository`` instead of building
+its own Supabase client. The repository only needs an object that exposes the
+``table().select().eq().in_().insert().update().execute()`` chain, so the real
+Supabase client and ``matchpoint.memory.MemoryClient`` are interchangeable.
+
+Events, tournaments and teams are read through a ``TTLCache`` keyed by event
+or tournament id. The insert methods invalidate exactly the keys they touch.
+"""
+
+import sys
+
+from matchpoint import profiling
+from matchpoint.auth import PROFILE_COLUMNS, AuthSession, UserClient
+from matchpoint.cache import TTLCache
+from matchpoint.summary import SUMMARY_COLUMNS
+
+EVENT_COLUMNS = "id, event_name, event_date"
+TOURNAMENT_COLUMNS = "id, event_id, name, sport, match_type, num_brackets, status"
+TEAM_COLUMNS = (
+    "id, tournament_id, team_name, player1_name, player2_name, "
+    "reserve_man_1_name, reserve_man_2_name, reserve_woman_1_name"
+)
+MATCH_LIST_COLUMNS = "id, tournament_id, team_a_id, team_b_id, status, time_slot, court_number"
+SCORING_CONTEXT_COLUMNS = (
+    "id, tournament_id, team_a_id, team_b_id, bracket, round_number, status, start_time, end_time, version, "
+    "team_a_set1_score, team_b_set1_score, team_a_set2_score, team_b_set2_score, "
+    "team_a_set3_score, team_b_set3_score, tournaments(name, sport), "
+    "team_a:teams!matches_team_a_id_fkey(team_name), "
+    "team_b:teams!matches_team_b_id_fkey(team_name)"
+)
+SCORE_EVENT_COLUMNS = "match_id, seq, kind, team, set_number, value, created_at"
+MATCH_STATE_COLUMNS = (
+    "id, tournament_id, team_a_id, team_b_id, bracket, round_number, version, status, start_time, end_time, team_a_set1_score, team_b_set1_score, "
+    "team_a_set2_score, team_b_set2_score, team_a_set3_score, team_b_set3_score"
+)
+MATCH_DETAIL_COLUMNS = (
+    "*, tournaments(*), "
+    "team_a:teams!matches_team_a_id_fkey(*), "
+    "team_b:teams!matches_team_b_id_fkey(*)"
+)
+
+
+class Repository:
+    """Typed read/write methods over a Supabase-compatible client."""
+
+    def __init__(self, client, cache: TTLCache | None = None, auth=None):
+        self.client = client
+        self.cache = cache if cache is not None else TTLCache()
+        # Signing in through client.auth would put the user's token on the shared client.
+        self.auth = auth if auth is not None else client.auth
+
+    def for_session(self, session: AuthSession) -> "Repository":
+        """This repository, querying as the signed-in user of ``session``.
+
+        It shares the read cache: events, tournaments and teams are the same for everyone.
+        """
+        if not hasattr(self.client, "postgrest"):
+            return self  # MemoryClient has no row-level security to honour.
+        return Repository(UserClient(self.client, session), self.cache, self.auth)
+
+    def _execute(self, query):
+        """Run a built query. Every database round trip goes through here."""
+        profile = profiling.current()
+        if profile is None:
+            return query.execute()
+        return profile.execute(query, sys._getframe(1).f_code.co_name)
+
+    def iter_pages(self, table: str, columns: str, column: str, values: list, page_size: int = 1000):
+        """Rows of ``table`` whose ``column`` is in ``values``, yielded ``page_size`` at a time in id order.
+
+        Pages are keyset-paginated on ``id``, so every page costs the same however deep into the table it is.
+        """
+        if not values:
+            return
+        last_id = None
+        while True:
+            query = self.client.table(table).select(columns).in_(column, list(values)).order("id").limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = self._execute(query).data
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    # --- AUTH ---
+    def sign_in(self, email: str, password: str):
+        return self.auth.sign_in_with_password({"email": email, "password": password})
+
+    def sign_up(self, email: str, password: str):
+        return self.auth.sign_up({"email": email, "password": password})
+
+    def get_profile(self, user_id) -> dict | None:
+        rows = self._execute(self.client.table("profiles").select(PROFILE_COLUMNS).eq("id", user_id).limit(1)).data
+        return rows[0] if rows else None
+
+    def update_profile(self, user_id, values: dict) -> None:
+        self._execute(self.client.table("profiles").update(values).eq("id", user_id))
+
+    # --- EVENTS ---
+    def list_events(self) -> list[dict]:
+        events = self.cache.get(("events",), None)
+        if events is None:
+            events = self._execute(self.client.table("events").select(EVENT_COLUMNS)).data
+            self.cache.set(("events",), events)
+        return events
+
+    def create_event(self, event_name: str, event_date: str) -> dict:
+        response = self._execute(
+            self.client.table("events").insert({"event_name": event_name, "event_date": event_date})
+        )
+        self.cache.invalidate(("events",))
+        return response.data[0]
+
+    def delete_event(self, event_id, page_size: int = 1000) -> None:
+        """Delete an event with its tournaments, teams, matches and score events, children first."""
+        tournament_ids = [t["id"] for rows in self.iter_pages("tournaments", "id", "event_id", [event_id], page_size)
+                          for t in rows]
+        for matches in self.iter_pages("matches", "id", "tournament_id", tournament_ids, page_size):
+            self._execute(self.client.table("score_events").delete().in_("match_id", [m["id"] for m in matches]))
+        if tournament_ids:
+            for table in ("matches", "teams"):
+                self._execute(self.client.table(table).delete().in_("tournament_id", tournament_ids))
+            self._execute(self.client.table("tournaments").delete().eq("event_id", event_id))
+        self._execute(self.client.table("events").delete().eq("id", event_id))
+        self.cache.invalidate(("events",))
+        self.cache.invalidate(("tournaments", event_id))
+        for tournament_id in tournament_ids:
+            self.cache.invalidate(("teams", tournament_id))
+
+    # --- TOURNAMENTS ---
+    def list_tournaments(self, event_id) -> list[dict]:
+        tournaments = self.cache.get(("tournaments", event_id), None)
+        if tournaments is None:
+            query = self.client.table("tournaments").select(TOURNAMENT_COLUMNS).eq("event_id", event_id)
+            tournaments = self._execute(query).data
+            self.cache.set(("tournaments", event_id), tournaments)
+        return tournaments
+
+    def create_tournaments(self, rows: list[dict]) -> list[dict]:
+        created = self._execute(self.client.table("tournaments").insert(rows)).data
+        for event_id in {row["event_id"] for row in rows}:
+            self.cache.invalidate(("tournaments", event_id))
+        return created
+
+    def update_tournament(self, tournament_id, event_id, values: dict) -> None:
+        self._execute(self.client.table("tournaments").update(values).eq("id", tournament_id))
+        self.cache.invalidate(("tournaments", event_id))
+
+    def move_tournament_status(self, tournament_id, event_id, expected, status: str) -> bool:
+        """Set a tournament's status only if it is still ``expected``. Returns whether it did."""
+        query = self.client.table("tournaments").update({"status": status}).eq("id", tournament_id)
+        query = query.is_("status", "null") if expected is None else query.eq("status", expected)
+        moved = bool(self._execute(query).data)
+        self.cache.invalidate(("tournaments", event_id))
+        return moved
+
+    # --- TEAMS ---
+    def list_teams(self, tournament_ids: list) -> list[dict]:
+        """Teams of several tournaments. Uncached tournaments are fetched in one query."""
+        by_tournament = {tid: self.cache.get(("teams", tid), None) for tid in tournament_ids}
+        missing = [tid for tid, teams in by_tournament.items() if teams is None]
+        if missing:
+            query = self.client.table("teams").select(TEAM_COLUMNS).in_("tournament_id", missing)
+            fetched = {tid: [] for tid in missing}
+            for team in self._execute(query).data:
+                fetched[team["tournament_id"]].append(team)
+            for tid, teams in fetched.items():
+                self.cache.set(("teams", tid), teams)
+            by_tournament.update(fetched)
+        return [team for teams in by_tournament.values() for team in teams]
+
+    def create_teams(self, rows: list[dict]) -> list[dict]:
+        created = self._execute(self.client.table("teams").insert(rows)).data
+        for tournament_id in {row["tournament_id"] for row in rows}:
+            self.cache.invalidate(("teams", tournament_id))
+        return created
+
+    def page_teams(self, tournament_id, search: str = "", after=None, limit: int = 50) -> tuple[list[dict], int]:
+        """One page of a tournament's teams in id order, filtered by name on the server.
+
+        ``after`` is the last id of the previous page. Returns ``(rows, remaining)`` where
+        ``remaining`` counts the rows matching the filter from this page on.
+        """
+        query = self.client.table("teams").select(TEAM_COLUMNS, count="exact").eq("tournament_id", tournament_id)
+        if search:
+            query = query.ilike("team_name", f"%{search}%")
+        if after is not None:
+            query = query.gt("id", after)
+        response = self._execute(query.order("id").limit(limit))
+        return response.data, response.count or 0
+
+    # --- MATCHES ---
+    def list_matches(self, tournament_ids: list, columns: str = MATCH_LIST_COLUMNS) -> list[dict]:
+        """Matches of several tournaments in a single round trip, ordered by id."""
+        if not tournament_ids:
+            return []
+        query = (
+            self.client.table("matches").select(columns)
+            .in_("tournament_id", list(tournament_ids)).order("id")
+        )
+        return self._execute(query).data
+
+    def list_matches_by_status(self, tournament_ids: list, status: str, columns: str = MATCH_LIST_COLUMNS,
+                               limit: int | None = None, order: str = "id") -> list[dict]:
+        """Matches of several tournaments in one status, newest ``order`` first, then newest id.
+
+        Rows with no ``order`` value (a result entered without an end time) come last.
+        """
+        if not tournament_ids:
+            return []
+        query = (
+            self.client.table("matches").select(columns)
+            .in_("tournament_id", list(tournament_ids)).eq("status", status)
+        )
+        if order != "id":
+            query = query.order(order, desc=True, nullsfirst=False)
+        query = query.order("id", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
+        return self._execute(query).data
+
+    def page_matches(self, tournament_id, status: str | None = None, bracket: str | None = None,
+                     team_ids: list | None = None, after=None, limit: int = 25) -> tuple[list[dict], int]:
+        """One page of a tournament's matches in id order, filtered on the server; see ``page_teams``.
+
+        ``team_ids`` keeps matches where either side is one of those teams.
+        """
+        if team_ids is not None and not team_ids:
+            return [], 0
+        query = (
+            self.client.table("matches").select(MATCH_LIST_COLUMNS + ", bracket", count="exact")
+            .eq("tournament_id", tournament_id)
+        )
+        if status:
+            query = query.eq("status", status)
+        if bracket:
+            query = query.eq("bracket", bracket)
+        if team_ids is not None:
+            ids = ",".join(str(team_id) for team_id in team_ids)
+            query = query.or_(f"team_a_id.in.({ids}),team_b_id.in.({ids})")
+        if after is not None:
+            query = query.gt("id", after)
+        response = self._execute(query.order("id").limit(limit))
+        return response.data, response.count or 0
+
+    def list_bracket_matches(self, tournament_id, bracket: str, columns: str = MATCH_LIST_COLUMNS) -> list[dict]:
+        """One bracket of a tournament (e.g. the knockout stage), ordered by id."""
+        query = (
+            self.client.table("matches").select(columns)
+            .eq("tournament_id", tournament_id).eq("bracket", bracket).order("id")
+        )
+        return self._execute(query).data
+
+    def matches_by_tournament(self, tournament_ids: list) -> dict:
+        """Like ``list_matches`` but grouped in memory as ``{tournament_id: [match, ...]}``."""
+        grouped = {tid: [] for tid in tournament_ids}
+        for match in self.list_matches(tournament_ids):
+            grouped[match["tournament_id"]].append(match)
+        return grouped
+
+    def create_matches(self, rows: list[dict]) -> list[dict]:
+        """Insert a whole fixture list in a single bulk insert."""
+        if not rows:
+            return []
+        return self._execute(self.client.table("matches").insert(rows)).data
+
+    def save_match_slots(self, rows: list[dict]) -> list:
+        """Write ``time_slot`` and ``court_number`` of many matches in one round trip.
+
+        ``rows`` are ``{"id", "time_slot", "court_number"}``. Nothing else is written, and
+        matches that are no longer Pending are left alone. Returns the ids that were saved.
+        """
+        if not rows:
+            return []
+        return self._execute(self.client.rpc("save_match_slots", {"slots": rows})).data
+
+    def get_match(self, match_id) -> dict | None:
+        """Return one match with its tournament and both teams embedded, or None."""
+        query = self.client.table("matches").select(MATCH_DETAIL_COLUMNS).eq("id", match_id).limit(1)
+        rows = self._execute(query).data
+        return rows[0] if rows else None
+
+    def get_match_context(self, match_id) -> dict | None:
+        """What the Scoring page shows: the match state plus tournament and team names only."""
+        query = self.client.table("matches").select(SCORING_CONTEXT_COLUMNS).eq("id", match_id).limit(1)
+        rows = self._execute(query).data
+        return rows[0] if rows else None
+
+    def compare_and_set_match(self, match_id, expected_version: int, values: dict) -> bool:
+        """Update a match only if its ``version`` is still ``expected_version``. Returns whether it did."""
+        query = (
+            self.client.table("matches").update(values)
+            .eq("id", match_id).eq("version", expected_version)
+        )
+        return bool(self._execute(query).data)
+
+    def advance_match(self, match_id, values: dict) -> bool:
+        """Update a match only if that moves its ``version`` forward to ``values["version"]``."""
+        query = (
+            self.client.table("matches").update(values)
+            .eq("id", match_id).lt("version", values["version"])
+        )
+        return bool(self._execute(query).data)
+
+    def list_match_states(self, match_ids: list) -> list[dict]:
+        """The columns the scoring log derives, with the match's tournament, teams and bracket, for several matches."""
+        if not match_ids:
+            return []
+        query = self.client.table("matches").select(MATCH_STATE_COLUMNS).in_("id", list(match_ids))
+        return self._execute(query).data
+
+    # --- SCORE EVENTS ---
+    def list_score_events(self, match_id) -> list[dict]:
+        query = self.client.table("score_events").select(SCORE_EVENT_COLUMNS).eq("match_id", match_id).order("seq")
+        return self._execute(query).data
+
+    def append_score_events(self, rows: list[dict]) -> None:
+        """Insert events in one statement; a taken ``(match_id, seq)`` rejects all of them."""
+        self._execute(self.client.table("score_events").insert(rows))
+
+    def existing_score_event_keys(self, keys: list[str]) -> set:
+        """Which of these idempotency keys are already in the log."""
+        query = self.client.table("score_events").select("key").in_("key", list(keys))
+        return {row["key"] for row in self._execute(query).data}
+
+    # --- SUMMARIES ---
+    def event_summary(self, event_id) -> list[dict]:
+        """The event's ``tournament_summaries`` rows, one per tournament, kept current by triggers."""
+        query = self.client.table("tournament_summaries").select(SUMMARY_COLUMNS).eq("event_id", event_id)
+        return self._execute(query).data
@@ -0,0 +1,139 @@
+"""Round-robin fixture generation for a single tournament.
+
+``num_brackets`` follows the tournaments table: 0 is a full round robin,
+otherwise teams are snake-seeded into that many brackets and each bracket
+plays its own round robin (circle method).
+
+Fixtures are kept in parallel ``array`` columns rather than one dict per
+match; dicts are only built by ``Fixtures.rows()`` when they are inserted.
+"""
+
+from array import array
+
+FULL_ROUND_ROBIN = 0
+
+
+def bracket_label(index: int) -> str:
+    return chr(ord("A") + index)
+
+
+def assign_brackets(team_ids: list, num_brackets: int) -> list[list]:
+    """Snake-seed teams (in the given order) into ``num_brackets`` brackets."""
+    if num_brackets <= FULL_ROUND_ROBIN:
+        return [list(team_ids)]
+    brackets = [[] for _ in range(num_brackets)]
+    for position, team_id in enumerate(team_ids):
+        lap, offset = divmod(position, num_brackets)
+        brackets[offset if lap % 2 == 0 else num_brackets - 1 - offset].append(team_id)
+    return brackets
+
+
+def circle_rounds(num_teams: int):
+    """Yield each round as a list of ``(i, j)`` index pairs using the circle method.
+
+    With an odd number of teams one team sits out each round.
+    """
+    size = num_teams + (num_teams % 2)
+    positions = list(range(size))
+    half = size // 2
+    for _ in range(size - 1):
+        yield [
+            (positions[i], positions[size - 1 - i])
+            for i in range(half)
+            if positions[i] < num_teams and positions[size - 1 - i] < num_teams
+        ]
+        positions = [positions[0], positions[-1]] + positions[1:-1]
+
+
+class Fixtures:
+    """A tournament's fixture list stored column-wise.
+
+    Matches are grouped into waves: wave ``r`` holds round ``r`` of every
+    bracket, so no team appears twice in a wave. Each wave is spread across
+    the courts, which guarantees no team is booked into two matches in the
+    same time slot.
+    """
+
+    def __init__(self, team_ids: list, brackets: list[list]):
+        self.team_ids = list(team_ids)
+        self.team_a = array("l")
+        self.team_b = array("l")
+        self.bracket = array("b")
+        self.round = array("h")
+        self.court = array("h")
+        self.slot = array("l")
+        self.labels = [bracket_label(i) for i in range(len(brackets))] if len(brackets) > 1 else [None]
+
+    def __len__(self) -> int:
+        return len(self.team_a)
+
+    def rows(self, tournament_id):
+        """Yield one insert payload per match for the ``matches`` table."""
+        team_ids, labels = self.team_ids, self.labels
+        for k in range(len(self.team_a)):
+            yield {
+                "tournament_id": tournament_id,
+                "team_a_id": team_ids[self.team_a[k]],
+                "team_b_id": team_ids[self.team_b[k]],
+                "bracket": labels[self.bracket[k]],
+                "round_number": self.round[k] + 1,
+                "court_number": self.court[k] + 1,
+                "time_slot": self.slot[k] + 1,
+                "status": "Pending",
+            }
+
+
+def generate_fixtures(team_ids: list, num_brackets: int = FULL_ROUND_ROBIN, num_courts: int = 1) -> Fixtures:
+    """Build brackets, round-robin pairings and court/slot assignments for one tournament."""
+    if num_courts < 1:
+        raise ValueError("At least one court is required.")
+    brackets = assign_brackets(team_ids, num_brackets)
+    fixtures = Fixtures(team_ids, brackets)
+    index_of = {team_id: i for i, team_id in enumerate(fixtures.team_ids)}
+
+    # waves[r] holds (team_a, team_b, bracket) index arrays for round r of every bracket.
+    waves = {}
+    for b, members in enumerate(brackets):
+        indices = [index_of[team_id] for team_id in members]
+        for r, pairs in enumerate(circle_rounds(len(indices))):
+            wave = waves.setdefault(r, (array("l"), array("l"), array("b")))
+            wave[0].extend(indices[i] for i, _ in pairs)
+            wave[1].extend(indices[j] for _, j in pairs)
+            wave[2].extend([b] * len(pairs))
+
+    next_slot = 0
+    for r in sorted(waves):
+        team_a, team_b, bracket = waves[r]
+        count = len(team_a)
+        fixtures.team_a.extend(team_a)
+        fixtures.team_b.extend(team_b)
+        fixtures.bracket.extend(bracket)
+        fixtures.round.extend([r] * count)
+        fixtures.court.extend(j % num_courts for j in range(count))
+        fixtures.slot.extend(next_slot + j // num_courts for j in range(count))
+        next_slot += -(-count // num_courts)
+    return fixtures
+
+
+def schedule_tournament(repository, tournament: dict, num_courts: int) -> int:
+    """Mark a tournament In Progress and bulk-insert its generated matches.
+
+    The status moves first, and only from the status the caller read, so a
+    second click or another session generating the same tournament gets a
+    ``ValueError`` instead of a duplicate schedule. If the insert fails the
+    status is put back. Returns the number of matches created.
+    """
+    teams = repository.list_teams([tournament["id"]])
+    if len(teams) < 2:
+        raise ValueError("At least two teams are needed to generate matches.")
+    team_ids = sorted(team["id"] for team in teams)
+    fixtures = generate_fixtures(team_ids, tournament.get("num_brackets") or FULL_ROUND_ROBIN, num_courts)
+    tournament_id, event_id, status = tournament["id"], tournament["event_id"], tournament.get("status")
+    if not repository.move_tournament_status(tournament_id, event_id, status, "In Progress"):
+        raise ValueError("Matches for this tournament have already been generated.")
+    try:
+        repository.create_matches(list(fixtures.rows(tournament_id)))
+    except Exception:
+        repository.move_tournament_status(tournament_id, event_id, "In Progress", status)
+        raise
+    return len(fixtures)
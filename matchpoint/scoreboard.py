@@ -0,0 +1,136 @@
+"""Shared, read-only scoreboard snapshots for spectators.
+
+``ScoreboardCache`` keeps one snapshot per event and rebuilds it at most once
+every ``refresh_seconds``, no matter how many viewers ask for it. While one
+thread rebuilds an expired snapshot, other viewers keep getting the previous
+one instead of queueing up behind the database.
+
+Only events that exist get a snapshot (``UnknownEvent`` otherwise), and at most
+``max_events`` are kept, least recently viewed dropped first, so the public
+JSON endpoint cannot be made to hold one per id anyone cares to ask for.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from matchpoint.standings import SETS
+
+SCOREBOARD_COLUMNS = (
+    "id, tournament_id, team_a_id, team_b_id, status, court_number, time_slot, "
+    "team_a_set1_score, team_b_set1_score, team_a_set2_score, team_b_set2_score, "
+    "team_a_set3_score, team_b_set3_score"
+)
+RECENT_LIMIT = 20
+MAX_EVENTS = 64
+
+
+class UnknownEvent(LookupError):
+    """No event has this id."""
+
+
+def _score_line(match: dict) -> str:
+    sets = []
+    for n in SETS:
+        a, b = match.get(f"team_a_set{n}_score"), match.get(f"team_b_set{n}_score")
+        if a or b:
+            sets.append(f"{a or 0}-{b or 0}")
+    return ", ".join(sets)
+
+
+def build_snapshot(repository, event_id) -> dict:
+    """Live and recently completed matches of one event, ready to serialise as JSON."""
+    tournaments = {t["id"]: t for t in repository.list_tournaments(event_id)}
+    tournament_ids = list(tournaments)
+    team_names = {team["id"]: team["team_name"] for team in repository.list_teams(tournament_ids)}
+
+    def entry(match):
+        tournament = tournaments[match["tournament_id"]]
+        return {
+            "match_id": match["id"],
+            "tournament": tournament["name"],
+            "sport": tournament["sport"],
+            "court": match.get("court_number"),
+            "team_a": team_names.get(match["team_a_id"], "Unknown"),
+            "team_b": team_names.get(match["team_b_id"], "Unknown"),
+            "score": _score_line(match),
+            "status": match["status"],
+        }
+
+    live = repository.list_matches_by_status(tournament_ids, "In Progress", columns=SCOREBOARD_COLUMNS)
+    recent = repository.list_matches_by_status(tournament_ids, "Completed", columns=SCOREBOARD_COLUMNS,
+                                               limit=RECENT_LIMIT, order="end_time")
+    return {
+        "event_id": event_id,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "live": [entry(m) for m in sorted(live, key=lambda m: (m.get("court_number") or 0, m["id"]))],
+        "recent": [entry(m) for m in recent],
+    }
+
+
+class ScoreboardCache:
+    def __init__(self, repository, refresh_seconds: float = 3.0, max_events: int = MAX_EVENTS,
+                 clock=time.monotonic):
+        self.repository = repository
+        self.refresh_seconds = refresh_seconds
+        self.max_events = max_events
+        self._clock = clock
+        self._snapshots = OrderedDict()
+        self._locks = {}
+        self._guard = threading.Lock()
+        self._events_read = float("-inf")
+        self.builds = 0
+
+    def _lock_for(self, event_id) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(event_id, threading.Lock())
+
+    def _cached(self, event_id) -> tuple | None:
+        with self._guard:
+            cached = self._snapshots.get(event_id)
+            if cached is not None:
+                self._snapshots.move_to_end(event_id)
+            return cached
+
+    def _store(self, event_id, cached: tuple) -> None:
+        with self._guard:
+            self._snapshots[event_id] = cached
+            self._snapshots.move_to_end(event_id)
+            while len(self._snapshots) > self.max_events:
+                evicted, _ = self._snapshots.popitem(last=False)
+                self._locks.pop(evicted, None)
+
+    def _exists(self, event_id) -> bool:
+        """Whether the event exists. The cached event list is read again at most once per ``refresh_seconds``."""
+        if any(event["id"] == event_id for event in self.repository.list_events()):
+            return True
+        with self._guard:
+            if self._clock() - self._events_read < self.refresh_seconds:
+                return False
+            self._events_read = self._clock()
+        self.repository.cache.invalidate(("events",))
+        return any(event["id"] == event_id for event in self.repository.list_events())
+
+    def get(self, event_id) -> dict:
+        """The event's snapshot, at most ``refresh_seconds`` old. Raises ``UnknownEvent`` for an id with no event."""
+        cached = self._cached(event_id)
+        if cached is not None and self._clock() - cached[0] < self.refresh_seconds:
+            return cached[1]
+        lock = self._lock_for(event_id)
+        # Someone else is already rebuilding: serve the stale snapshot if there is one.
+        if not lock.acquire(blocking=cached is None):
+            return cached[1]
+        try:
+            cached = self._cached(event_id)
+            if cached is None and not self._exists(event_id):
+                with self._guard:
+                    self._locks.pop(event_id, None)
+                raise UnknownEvent(event_id)
+            if cached is None or self._clock() - cached[0] >= self.refresh_seconds:
+                cached = (self._clock(), build_snapshot(self.repository, event_id))
+                self._store(event_id, cached)
+                self.builds += 1
+            return cached[1]
+        finally:
+            lock.release()
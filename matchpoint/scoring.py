@@ -0,0 +1,129 @@
+"""Score writes as an append-only event log.
+
+Umpires never rewrite a match row directly. Each action (the match starting,
+a point, a set score typed in, the match being completed) is a small row in
+``score_events`` numbered by ``seq`` per match, and the score columns on
+``matches`` are derived from that log. ``matches.version`` is the ``seq`` of
+the last event folded into the row.
+
+Concurrency is compare-and-set on the log position: events are inserted with
+``seq = version + 1, ...`` and the unique ``(match_id, seq)`` key lets only one
+writer claim a position. The loser gets ``ScoreConflict`` and re-reads the
+match. The row is then advanced with a version check, so a stale row can never
+overwrite a newer one, and ``rebuild`` replays the whole log into the row if it
+ever falls behind.
+"""
+
+from datetime import datetime, timezone
+
+from matchpoint.standings import SETS
+
+START, POINT, SET, COMPLETE = "start", "point", "set", "complete"
+SCORE_COLUMNS = [f"team_{team}_set{n}_score" for n in SETS for team in "ab"]
+BLANK = {**dict.fromkeys(SCORE_COLUMNS), "start_time": None, "end_time": None, "status": "Pending", "version": 0}
+
+
+class ScoreConflict(Exception):
+    """Another umpire wrote to the match first. ``match`` holds the values derived since."""
+
+    def __init__(self, match: dict):
+        super().__init__("This match was updated by someone else. Reload it and try again.")
+        self.match = match
+
+
+# --- EVENTS ---
+def start() -> dict:
+    return {"kind": START}
+
+
+def point(team: str, set_number: int, value: int = 1) -> dict:
+    """One rally won by ``team`` ("a" or "b"). ``value=-1`` takes a point back."""
+    return {"kind": POINT, "team": team, "set_number": set_number, "value": value}
+
+
+def set_score(team: str, set_number: int, score: int) -> dict:
+    """A set score entered directly, replacing whatever the log had for it."""
+    return {"kind": SET, "team": team, "set_number": set_number, "value": score}
+
+
+def complete() -> dict:
+    return {"kind": COMPLETE}
+
+
+def apply_event(state: dict, event: dict) -> dict:
+    """Fold one event into the derived match values, in place."""
+    kind = event["kind"]
+    if kind == START:
+        if state["start_time"] is None:
+            state["start_time"] = event["created_at"]
+        if state["status"] != "Completed":
+            state["status"] = "In Progress"
+    elif kind in (POINT, SET):
+        column = f"team_{event['team']}_set{event['set_number']}_score"
+        state[column] = event["value"] if kind == SET else max((state[column] or 0) + event["value"], 0)
+    elif kind == COMPLETE:
+        state["status"] = "Completed"
+        if state["end_time"] is None:
+            state["end_time"] = event["created_at"]
+    state["version"] = event["seq"]
+    return state
+
+
+def derive(events: list[dict]) -> dict:
+    """The match values a log describes, replayed from an unscored match."""
+    state = dict(BLANK)
+    for event in sorted(events, key=lambda e: e["seq"]):
+        apply_event(state, event)
+    return state
+
+
+def changes(match: dict, events: list[dict]) -> dict:
+    """Only the columns ``events`` change on ``match``, plus the new version."""
+    state = {column: match.get(column, default) for column, default in BLANK.items()}
+    before = dict(state)
+    for event in events:
+        apply_event(state, event)
+    return {column: value for column, value in state.items() if value != before[column] or column == "version"}
+
+
+def positioned(match: dict, events: list[dict]) -> list[dict]:
+    """Full ``score_events`` rows for ``events`` placed right after ``match["version"]``."""
+    version = match.get("version") or 0
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {"team": None, "set_number": None, "value": None, "created_at": now, **event,
+         "match_id": match["id"], "seq": version + i}
+        for i, event in enumerate(events, start=1)
+    ]
+
+
+# --- WRITES ---
+def record(repository, match: dict, events: list[dict]) -> dict:
+    """Append ``events`` after ``match["version"]`` and advance the match row.
+
+    Returns the columns that changed (including ``version``); merge them into
+    ``match`` to get the new state. Raises ``ScoreConflict`` if the match has
+    moved on since it was read.
+    """
+    version = match.get("version") or 0
+    rows = positioned(match, events)
+    try:
+        repository.append_score_events(rows)
+    except Exception as e:
+        if getattr(e, "code", None) != "23505":
+            raise
+        raise ScoreConflict(rebuild(repository, match["id"]))
+    values = changes(match, rows)
+    if not repository.compare_and_set_match(match["id"], version, values):
+        # The row lagged behind the log; bring it up to date from the log instead.
+        rebuild(repository, match["id"])
+    return values
+
+
+def rebuild(repository, match_id) -> dict:
+    """Replay a match's log into its row (never moving the row backwards) and return the values."""
+    events = repository.list_score_events(match_id)
+    values = derive(events)
+    if events:
+        repository.advance_match(match_id, values)
+    return values
@@ -0,0 +1,212 @@
+"""Export a whole event to one file, and load it back as a new event.
+
+A snapshot is a zip archive (stored, not compressed) holding one Parquet file
+per table: ``events``, ``tournaments``, ``teams``, ``matches`` and
+``score_events``. Each file has a fixed Arrow schema, and team and player names
+are dictionary-encoded, so a name repeated across thousands of rows is stored
+once. Rows are paged out of the database ``page_size`` at a time and written as
+Parquet row groups, and read back the same way, so memory stays flat however
+many matches the event has. The only thing held for the whole run is the
+old-to-new id map.
+
+Importing always creates a new event. Every id is remapped, and every score
+event gets a new ``key`` (keys are unique across the whole log), so the same
+snapshot can be loaded again, for example to clone last year's setup or to
+seed a ``MemoryClient`` for benchmarks. An import is written table by table,
+not in one transaction. If it fails part way, the new event and everything
+already created under it are deleted again before the error is raised.
+"""
+
+import io
+import json
+import uuid
+import zipfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORMAT_VERSION = 1
+PAGE_SIZE = 1000
+
+_name = pa.dictionary(pa.int32(), pa.string())
+_score = pa.int32()
+SCHEMAS = {
+    "events": pa.schema([("id", pa.int64()), ("event_name", pa.string()), ("event_date", pa.string())]),
+    "tournaments": pa.schema([
+        ("id", pa.int64()), ("event_id", pa.int64()), ("name", pa.string()), ("sport", _name),
+        ("match_type", _name), ("num_brackets", pa.int32()), ("status", _name),
+    ]),
+    "teams": pa.schema([
+        ("id", pa.int64()), ("tournament_id", pa.int64()), ("team_name", _name),
+        ("player1_name", _name), ("player2_name", _name), ("reserve_man_1_name", _name),
+        ("reserve_man_2_name", _name), ("reserve_woman_1_name", _name),
+    ]),
+    "matches": pa.schema([
+        ("id", pa.int64()), ("tournament_id", pa.int64()), ("team_a_id", pa.int64()), ("team_b_id", pa.int64()),
+        ("status", _name), ("bracket", _name), ("round_number", pa.int32()), ("court_number", pa.int32()),
+        ("time_slot", pa.int32()), ("start_time", pa.string()), ("end_time", pa.string()),
+        ("version", pa.int32()),
+        ("team_a_set1_score", _score), ("team_b_set1_score", _score), ("team_a_set2_score", _score),
+        ("team_b_set2_score", _score), ("team_a_set3_score", _score), ("team_b_set3_score", _score),
+    ]),
+    "score_events": pa.schema([
+        ("id", pa.int64()), ("match_id", pa.int64()), ("seq", pa.int32()), ("kind", _name), ("team", _name),
+        ("set_number", pa.int32()), ("value", pa.int32()), ("created_at", pa.string()), ("key", pa.string()),
+    ]),
+}
+# Columns added since format 1 came out; snapshots written before them are still read.
+LATER_COLUMNS = {"score_events": {"key"}}
+
+
+def _columns(table: str) -> str:
+    return ", ".join(SCHEMAS[table].names)
+
+
+def _write_table(bundle: zipfile.ZipFile, table: str, pages) -> int:
+    """Write an iterable of row-dict pages as one Parquet file inside the bundle."""
+    written = 0
+    with bundle.open(f"{table}.parquet", "w") as entry:
+        with pq.ParquetWriter(pa.PythonFile(entry, mode="w"), SCHEMAS[table]) as writer:
+            for rows in pages:
+                if rows:
+                    writer.write_table(pa.Table.from_pylist(rows, schema=SCHEMAS[table]))
+                    written += len(rows)
+    return written
+
+
+def export_event(repository, event_id, file, page_size: int = PAGE_SIZE) -> dict:
+    """Write event ``event_id`` to ``file`` (a path or binary file object). Returns the row count per table."""
+    def pages(table, column, values):
+        return repository.iter_pages(table, _columns(table), column, values, page_size)
+
+    def score_event_pages():
+        # Score events are fetched a page of matches at a time, so no filter list grows with the event.
+        for matches in repository.iter_pages("matches", "id", "tournament_id", tournament_ids, page_size):
+            match_ids = [m["id"] for m in matches]
+            yield from repository.iter_pages("score_events", _columns("score_events"), "match_id", match_ids, page_size)
+
+    counts = {}
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED) as bundle:
+        counts["events"] = _write_table(bundle, "events", pages("events", "id", [event_id]))
+        if not counts["events"]:
+            raise ValueError(f"Event {event_id} does not exist.")
+        tournament_ids = [t["id"] for t in repository.list_tournaments(event_id)]
+        counts["tournaments"] = _write_table(bundle, "tournaments", pages("tournaments", "event_id", [event_id]))
+        counts["teams"] = _write_table(bundle, "teams", pages("teams", "tournament_id", tournament_ids))
+        counts["matches"] = _write_table(bundle, "matches", pages("matches", "tournament_id", tournament_ids))
+        counts["score_events"] = _write_table(bundle, "score_events", score_event_pages())
+        bundle.writestr("manifest.json", json.dumps({"format": FORMAT_VERSION, "event_id": event_id, "rows": counts}))
+    return counts
+
+
+def read_manifest(bundle: zipfile.ZipFile) -> dict:
+    """The bundle's manifest, once the bundle is checked to be complete; raises ValueError if it is not.
+
+    Checks the format, that every table is there with its schema's columns,
+    and that each file holds as many rows as the manifest says, all from the
+    Parquet footers, before anything is written.
+    """
+    try:
+        manifest = json.loads(bundle.read("manifest.json"))
+    except KeyError:
+        raise ValueError("Not a snapshot: manifest.json is missing.") from None
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')}.")
+    names = set(bundle.namelist())
+    for table, schema in SCHEMAS.items():
+        if f"{table}.parquet" not in names:
+            raise ValueError(f"The snapshot has no {table} table.")
+        with bundle.open(f"{table}.parquet") as entry:
+            metadata = pq.ParquetFile(entry).metadata
+            missing = set(schema.names) - set(metadata.schema.names) - LATER_COLUMNS.get(table, set())
+            rows = metadata.num_rows
+        if missing:
+            raise ValueError(f"The snapshot's {table} table lacks {', '.join(sorted(missing))}.")
+        expected = manifest.get("rows", {}).get(table)
+        if rows != expected:
+            raise ValueError(f"The snapshot's {table} table holds {rows} rows, not {expected}.")
+    if not manifest["rows"]["events"]:
+        raise ValueError("The snapshot holds no event.")
+    return manifest
+
+
+def _batches(bundle: zipfile.ZipFile, table: str, page_size: int):
+    """Row-dict pages of one table, read a row group batch at a time."""
+    with bundle.open(f"{table}.parquet") as entry:
+        for batch in pq.ParquetFile(entry).iter_batches(batch_size=page_size):
+            yield batch.to_pylist()
+
+
+def _remap(rows: list[dict], columns: dict) -> list[dict]:
+    """Drop ``id`` and swap each foreign key through its map."""
+    remapped = []
+    for row in rows:
+        row = {k: v for k, v in row.items() if k != "id"}
+        for column, id_map in columns.items():
+            if row.get(column) is not None:
+                row[column] = id_map[row[column]]
+        remapped.append(row)
+    return remapped
+
+
+def import_event(repository, file, event_name: str | None = None, event_date: str | None = None,
+                 with_matches: bool = True, page_size: int = PAGE_SIZE) -> dict:
+    """Load a snapshot as a new event and return it.
+
+    ``with_matches=False`` copies only the setup (tournaments and teams, with
+    tournament status left to the database default), for reusing last year's
+    categories and entries. If a write fails, the partly imported event is
+    deleted and the error raised.
+    """
+    with zipfile.ZipFile(file) as bundle:
+        read_manifest(bundle)  # a broken bundle fails here, before a half-imported event exists
+        event = next(_batches(bundle, "events", page_size))[0]
+        new_event = repository.create_event(event_name or event["event_name"], event_date or event["event_date"])
+        try:
+            counts = _import_rows(repository, bundle, new_event["id"], with_matches, page_size)
+        except Exception as error:
+            try:
+                repository.delete_event(new_event["id"], page_size)
+            except Exception as cleanup_error:
+                error.add_note(f"The partly imported event {new_event['id']} could not be deleted: {cleanup_error}")
+            raise
+    return {**new_event, **counts}
+
+
+def _import_rows(repository, bundle: zipfile.ZipFile, event_id, with_matches: bool, page_size: int) -> dict:
+    """Tournaments, teams and (``with_matches``) matches and score events of the bundle, under ``event_id``."""
+    tournament_ids = {}
+    for rows in _batches(bundle, "tournaments", page_size):
+        payloads = _remap(rows, {})
+        for payload in payloads:
+            payload["event_id"] = event_id
+            if not with_matches:
+                payload.pop("status")
+        created = repository.create_tournaments(payloads)
+        tournament_ids.update(zip((r["id"] for r in rows), (c["id"] for c in created)))
+
+    team_ids = {}
+    for rows in _batches(bundle, "teams", page_size):
+        created = repository.create_teams(_remap(rows, {"tournament_id": tournament_ids}))
+        team_ids.update(zip((r["id"] for r in rows), (c["id"] for c in created)))
+
+    match_ids = {}
+    if with_matches:
+        for rows in _batches(bundle, "matches", page_size):
+            payloads = _remap(rows, {"tournament_id": tournament_ids, "team_a_id": team_ids, "team_b_id": team_ids})
+            created = repository.create_matches(payloads)
+            match_ids.update(zip((r["id"] for r in rows), (c["id"] for c in created)))
+        for rows in _batches(bundle, "score_events", page_size):
+            payloads = _remap(rows, {"match_id": match_ids})
+            for payload in payloads:
+                payload["key"] = str(uuid.uuid4())
+            repository.append_score_events(payloads)
+
+    return {"tournaments": len(tournament_ids), "teams": len(team_ids), "matches": len(match_ids)}
+
+
+def export_bytes(repository, event_id, page_size: int = PAGE_SIZE) -> bytes:
+    """``export_event`` into memory, for a download button."""
+    buffer = io.BytesIO()
+    export_event(repository, event_id, buffer, page_size)
+    return buffer.getvalue()
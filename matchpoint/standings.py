@@ -0,0 +1,344 @@
+"""Bracket standings, kept up to date one saved match at a time.
+
+``Standings`` holds one table per bracket of a tournament. ``apply`` folds a
+single saved match into the tables in O(1): it first takes back whatever that
+match contributed before (so a corrected score is not counted twice) and then
+adds the new result. ``Standings.rebuild`` computes the same tables from
+scratch and is used on first access and to cross-check the incremental path.
+
+Once every group is played the first knockout round is drawn, and from then on
+each completed knockout match whose neighbour is also decided creates the match
+between their winners in the next round, up to the final.
+
+Scores come from the ``team_a_setN_score``/``team_b_setN_score`` columns. A set
+counts as played when either side scored in it; Captain Ball stores its final
+score as set 1.
+"""
+
+import threading
+
+SETS = (1, 2, 3)
+KNOCKOUT = "Knockout"
+OVERALL = "Overall"
+STANDINGS_COLUMNS = (
+    "id, tournament_id, team_a_id, team_b_id, status, bracket, round_number, "
+    "team_a_set1_score, team_b_set1_score, team_a_set2_score, team_b_set2_score, "
+    "team_a_set3_score, team_b_set3_score"
+)
+
+
+class Row:
+    __slots__ = ("team_id", "played", "wins", "draws", "losses",
+                 "sets_for", "sets_against", "points_for", "points_against")
+
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.played = self.wins = self.draws = self.losses = 0
+        self.sets_for = self.sets_against = self.points_for = self.points_against = 0
+
+    @property
+    def set_diff(self) -> int:
+        return self.sets_for - self.sets_against
+
+    @property
+    def point_diff(self) -> int:
+        return self.points_for - self.points_against
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__} | {
+            "set_diff": self.set_diff, "point_diff": self.point_diff,
+        }
+
+
+def match_result(match: dict) -> tuple | None:
+    """``(sets_a, sets_b, points_a, points_b)`` for a completed match, otherwise None."""
+    if match.get("status") != "Completed":
+        return None
+    sets_a = sets_b = points_a = points_b = 0
+    for n in SETS:
+        a = match.get(f"team_a_set{n}_score") or 0
+        b = match.get(f"team_b_set{n}_score") or 0
+        points_a += a
+        points_b += b
+        if a > b:
+            sets_a += 1
+        elif b > a:
+            sets_b += 1
+    return sets_a, sets_b, points_a, points_b
+
+
+def winner(match: dict) -> int | None:
+    """The winning team's id, or None while the match is unfinished or level."""
+    result = match_result(match)
+    if result is None:
+        return None
+    sets_a, sets_b, points_a, points_b = result
+    if (sets_a, points_a) == (sets_b, points_b):
+        return None
+    return match["team_a_id"] if (sets_a, points_a) > (sets_b, points_b) else match["team_b_id"]
+
+
+def next_round(tournament_id, knockout: list[dict]) -> list[dict]:
+    """Insert rows for the knockout matches that are due but not created yet.
+
+    The first round sits in id order. Match ``i`` of a round feeds match
+    ``i // 2`` of the next, so the winners of matches ``2k`` and ``2k + 1``
+    meet once both are decided. A later match sits above the match one of its
+    teams won, as in ``BracketLayout``.
+    """
+    by_round = {}
+    for match in knockout:
+        by_round.setdefault(match.get("round_number") or 1, []).append(match)
+    placed = dict(enumerate(sorted(by_round.get(1, []), key=lambda m: m["id"])))
+    size, round_number, rows = len(placed), 1, []
+    while size > 1:
+        winners = {i: winner(match) for i, match in placed.items()}
+        above = {}
+        for match in sorted(by_round.get(round_number + 1, []), key=lambda m: m["id"]):
+            teams = (match.get("team_a_id"), match.get("team_b_id"))
+            feeder = next((i for i, team in winners.items() if team is not None and team in teams
+                           and i // 2 not in above), None)
+            if feeder is not None:
+                above[feeder // 2] = match
+        for k in range(size // 2):
+            a, b = winners.get(2 * k), winners.get(2 * k + 1)
+            if k not in above and a is not None and b is not None:
+                rows.append({"tournament_id": tournament_id, "team_a_id": a, "team_b_id": b,
+                             "bracket": KNOCKOUT, "round_number": round_number + 1, "status": "Pending"})
+        placed, size, round_number = above, size // 2, round_number + 1
+    return rows
+
+
+class Standings:
+    """Group-stage tables for one tournament."""
+
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+        self.tables = {}
+        self._bracket_of = {}
+        self._fixtures = {}
+        self._completed = {}
+        self._applied = {}
+        self._head_to_head = {}
+        self.knockout_seeded = False
+        self._advanced = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def rebuild(cls, tournament_id, matches: list[dict]) -> "Standings":
+        standings = cls(tournament_id)
+        for match in matches:
+            standings.register(match)
+        for match in matches:
+            standings.apply(match)
+        return standings
+
+    def register(self, match: dict) -> None:
+        """Make a fixture known, so the bracket is only complete once it has been played."""
+        bracket = match.get("bracket") or OVERALL
+        if bracket == KNOCKOUT:
+            self.knockout_seeded = True
+            return
+        if match["id"] in self._bracket_of:
+            return
+        self._bracket_of[match["id"]] = bracket
+        self._fixtures[bracket] = self._fixtures.get(bracket, 0) + 1
+        self._completed.setdefault(bracket, 0)
+        table = self.tables.setdefault(bracket, {})
+        for team_id in (match["team_a_id"], match["team_b_id"]):
+            table.setdefault(team_id, Row(team_id))
+
+    def apply(self, match: dict) -> None:
+        """Fold one saved match into its bracket table."""
+        if (match.get("bracket") or OVERALL) == KNOCKOUT:
+            self.knockout_seeded = True
+            return
+        with self._lock:
+            self.register(match)
+            bracket = self._bracket_of[match["id"]]
+            previous = self._applied.pop(match["id"], None)
+            if previous is not None:
+                self._add(bracket, *previous, sign=-1)
+                self._completed[bracket] -= 1
+            result = match_result(match)
+            if result is not None:
+                entry = (match["team_a_id"], match["team_b_id"], *result)
+                self._add(bracket, *entry, sign=1)
+                self._applied[match["id"]] = entry
+                self._completed[bracket] += 1
+
+    def _add(self, bracket, team_a, team_b, sets_a, sets_b, points_a, points_b, sign):
+        table = self.tables[bracket]
+        row_a, row_b = table[team_a], table[team_b]
+        for row, sf, sa, pf, pa in ((row_a, sets_a, sets_b, points_a, points_b),
+                                    (row_b, sets_b, sets_a, points_b, points_a)):
+            row.played += sign
+            row.sets_for += sign * sf
+            row.sets_against += sign * sa
+            row.points_for += sign * pf
+            row.points_against += sign * pa
+        pair = (min(team_a, team_b), max(team_a, team_b))
+        if sets_a == sets_b:
+            row_a.draws += sign
+            row_b.draws += sign
+            winner = None
+        else:
+            winner, loser = (row_a, row_b) if sets_a > sets_b else (row_b, row_a)
+            winner.wins += sign
+            loser.losses += sign
+            winner = winner.team_id
+        if sign > 0:
+            self._head_to_head[pair] = winner
+        else:
+            self._head_to_head.pop(pair, None)
+
+    # --- READING ---
+    def ranking(self, bracket) -> list[Row]:
+        """Bracket table in finishing order.
+
+        Teams are ordered by wins. When exactly two teams are level on wins
+        their head-to-head result decides; larger ties fall back to set
+        difference, then point difference, then points scored.
+        """
+        rows = list(self.tables.get(bracket, {}).values())
+        rows.sort(key=lambda r: (-r.wins, -r.set_diff, -r.point_diff, -r.points_for, r.team_id))
+        ordered, i = [], 0
+        while i < len(rows):
+            group = [r for r in rows[i:] if r.wins == rows[i].wins]
+            if len(group) == 2:
+                winner = self._head_to_head.get((min(group[0].team_id, group[1].team_id),
+                                                 max(group[0].team_id, group[1].team_id)))
+                if winner == group[1].team_id:
+                    group.reverse()
+            ordered.extend(group)
+            i += len(group)
+        return ordered
+
+    def is_complete(self, bracket) -> bool:
+        return self._fixtures.get(bracket, 0) > 0 and self._completed[bracket] == self._fixtures[bracket]
+
+    def group_stage_complete(self) -> bool:
+        return bool(self._fixtures) and all(self.is_complete(bracket) for bracket in self._fixtures)
+
+    def snapshot(self) -> dict:
+        """Plain-dict view of every table, in finishing order."""
+        return {bracket: [row.as_dict() for row in self.ranking(bracket)] for bracket in sorted(self.tables)}
+
+    # --- KNOCKOUT ---
+    def knockout_pairings(self) -> list[tuple]:
+        """First knockout round as ``(team_a_id, team_b_id)`` pairs.
+
+        Bracket winners are seeded first, then runners-up, each group ordered by
+        record. The field is the largest power of two that fits (top four when
+        there is a single round-robin table), seeds meet 1 v N, 2 v N-1, ...,
+        and an opponent from the same bracket is swapped with the next pair.
+        The pairs come in draw order (1 v 8, 4 v 5, 2 v 7, 3 v 6 for eight), so
+        the top two seeds can only meet in the final.
+        """
+        brackets = sorted(self._fixtures)
+        rankings = {bracket: self.ranking(bracket) for bracket in brackets}
+        per_bracket = 4 if len(brackets) == 1 else 2
+        qualifiers = []
+        for place in range(per_bracket):
+            tier = [(rankings[b][place], b) for b in brackets if len(rankings[b]) > place]
+            tier.sort(key=lambda item: (-item[0].wins, -item[0].set_diff, -item[0].point_diff, item[0].team_id))
+            qualifiers.extend(tier)
+        size = 1
+        while size * 2 <= len(qualifiers):
+            size *= 2
+        if size < 2:
+            return []
+        qualifiers = qualifiers[:size]
+        top, bottom = qualifiers[:size // 2], list(reversed(qualifiers[size // 2:]))
+        for i in range(len(top)):
+            if top[i][1] == bottom[i][1] and len(brackets) > 1:
+                j = (i + 1) % len(top)
+                bottom[i], bottom[j] = bottom[j], bottom[i]
+        pairs = [(a[0].team_id, b[0].team_id) for a, b in zip(top, bottom)]
+        order = [1]
+        while len(order) < size:
+            order = [seed for top_seed in order for seed in (top_seed, 2 * len(order) + 1 - top_seed)]
+        return [pairs[seed - 1] for seed in order[::2]]
+
+    def seed_knockout(self, repository) -> int:
+        """Create the first knockout round once every bracket is complete. Returns matches created."""
+        with self._lock:
+            if self.knockout_seeded or not self.group_stage_complete():
+                return 0
+            self.knockout_seeded = True
+        rows = [
+            {"tournament_id": self.tournament_id, "team_a_id": a, "team_b_id": b,
+             "bracket": KNOCKOUT, "round_number": 1, "status": "Pending"}
+            for a, b in self.knockout_pairings()
+        ]
+        try:
+            repository.create_matches(rows)
+        except Exception:
+            # Claimed above so two saves cannot both seed; give the claim back so the next save retries.
+            with self._lock:
+                self.knockout_seeded = False
+            raise
+        return len(rows)
+
+    def advance_knockout(self, repository) -> int:
+        """Create every knockout match whose two feeders are decided. Returns matches created."""
+        knockout = repository.list_bracket_matches(self.tournament_id, KNOCKOUT, columns=STANDINGS_COLUMNS)
+        with self._lock:
+            rows = [row for row in next_round(self.tournament_id, knockout)
+                    if (row["round_number"], row["team_a_id"], row["team_b_id"]) not in self._advanced]
+            claimed = {(row["round_number"], row["team_a_id"], row["team_b_id"]) for row in rows}
+            self._advanced |= claimed
+        try:
+            repository.create_matches(rows)
+        except Exception:
+            with self._lock:
+                self._advanced -= claimed
+            raise
+        return len(rows)
+
+
+class StandingsBook:
+    """Process-wide standings per tournament, built lazily and then updated incrementally.
+
+    A tournament's standings are read from the database the first time they
+    are needed. After that ``saved`` keeps them current: it is a
+    ``ScoreOutbox`` listener, so only scores the database has accepted count.
+    """
+
+    def __init__(self):
+        self._standings = {}
+        self._lock = threading.Lock()
+
+    def get(self, repository, tournament_id) -> Standings:
+        standings = self._standings.get(tournament_id)
+        if standings is None:
+            matches = repository.list_matches([tournament_id], columns=STANDINGS_COLUMNS)
+            standings = Standings.rebuild(tournament_id, matches)
+            with self._lock:
+                standings = self._standings.setdefault(tournament_id, standings)
+        return standings
+
+    def record(self, repository, match: dict) -> int:
+        """Apply a just-saved match and create the knockout matches it makes due.
+
+        A group match that finishes the group stage seeds the first knockout
+        round; a completed knockout match may create the next round's match.
+        Returns the number of knockout matches created.
+        """
+        standings = self.get(repository, match["tournament_id"])
+        standings.apply(match)
+        if (match.get("bracket") or OVERALL) == KNOCKOUT:
+            return standings.advance_knockout(repository) if match.get("status") == "Completed" else 0
+        return standings.seed_knockout(repository)
+
+    def saved(self, repository, match: dict) -> int:
+        """Outbox listener for a match whose scores were just saved; see ``record``."""
+        if match.get("tournament_id") is None:
+            return 0
+        if match.get("status") != "Completed" and match["tournament_id"] not in self._standings:
+            return 0  # nothing to take back, and loading now would only read the same rows later
+        return self.record(repository, match)
+
+    def forget(self, tournament_id) -> None:
+        with self._lock:
+            self._standings.pop(tournament_id, None)
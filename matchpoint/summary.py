@@ -0,0 +1,99 @@
+"""Per-tournament counts behind the event overview.
+
+``tournament_summaries`` holds one row per tournament: teams, matches per
+status, and the summed duration of timed completed matches. In Postgres the
+triggers in ``sql/006_tournament_summaries.sql`` keep it current. Every change
+takes back the old row's share and adds the new one's. ``SummaryTrigger`` does
+the same for ``MemoryClient``, so both backends answer the same query.
+
+``event_totals`` folds an event's rows into the numbers the dashboards show.
+"""
+
+from datetime import datetime
+
+SUMMARY_COLUMNS = "tournament_id, event_id, teams, pending, in_progress, completed, timed, duration_seconds"
+STATUS_COLUMNS = {"Pending": "pending", "In Progress": "in_progress", "Completed": "completed"}
+COUNTERS = ("teams", "pending", "in_progress", "completed", "timed", "duration_seconds")
+
+
+def duration_seconds(match: dict) -> float | None:
+    """Seconds from ``start_time`` to ``end_time``, or None if either is missing."""
+    if not (match.get("start_time") and match.get("end_time")):
+        return None
+    start, end = (datetime.fromisoformat(str(match[c]).replace("Z", "+00:00")) for c in ("start_time", "end_time"))
+    return (end - start).total_seconds()
+
+
+def match_share(match: dict) -> dict:
+    """What one match adds to its tournament's counters."""
+    share = {}
+    column = STATUS_COLUMNS.get(match.get("status"))
+    if column:
+        share[column] = 1
+    if match.get("status") == "Completed":
+        seconds = duration_seconds(match)
+        if seconds is not None:
+            share["timed"] = 1
+            share["duration_seconds"] = seconds
+    return share
+
+
+class SummaryTrigger:
+    """A ``MemoryClient`` write listener standing in for the summary triggers."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def _row(self, tournament_id) -> dict | None:
+        rows = self.client.tables.setdefault("tournament_summaries", [])
+        for row in rows:
+            if row["tournament_id"] == tournament_id:
+                return row
+        tournament = next((t for t in self.client.tables.get("tournaments", []) if t.get("id") == tournament_id), None)
+        if tournament is None:
+            return None
+        row = {"tournament_id": tournament_id, "event_id": tournament.get("event_id"), **dict.fromkeys(COUNTERS, 0)}
+        rows.append(row)
+        return row
+
+    def _add(self, tournament_id, share: dict, sign: int) -> None:
+        row = self._row(tournament_id)
+        if row is not None:
+            for column, value in share.items():
+                row[column] += sign * value
+
+    def __call__(self, table: str, change_type: str, record: dict, old_record: dict | None = None) -> None:
+        if table == "matches":
+            if change_type in ("UPDATE", "DELETE") and old_record:
+                self._add(old_record.get("tournament_id"), match_share(old_record), -1)
+            if change_type in ("INSERT", "UPDATE"):
+                self._add(record.get("tournament_id"), match_share(record), 1)
+        elif table == "teams":
+            team = record if change_type == "INSERT" else old_record or {}
+            self._add(team.get("tournament_id"), {"teams": 1}, 1 if change_type == "INSERT" else -1)
+        elif table == "tournaments" and change_type == "INSERT":
+            self._row(record["id"])
+        elif table == "tournaments" and change_type == "DELETE":
+            self.client.tables["tournament_summaries"] = [
+                row for row in self.client.tables.get("tournament_summaries", [])
+                if row["tournament_id"] != (old_record or {}).get("id")
+            ]
+
+    def backfill(self) -> None:
+        """Build every row from the tables as they are, like the migration's backfill."""
+        self.client.tables["tournament_summaries"] = []
+        for tournament in self.client.tables.get("tournaments", []):
+            self._row(tournament["id"])
+        for team in self.client.tables.get("teams", []):
+            self._add(team.get("tournament_id"), {"teams": 1}, 1)
+        for match in self.client.tables.get("matches", []):
+            self._add(match.get("tournament_id"), match_share(match), 1)
+
+
+def event_totals(rows: list[dict]) -> dict:
+    """Sum an event's summary rows; ``average_minutes`` is None until a completed match has been timed."""
+    totals = {column: sum(row.get(column) or 0 for row in rows) for column in COUNTERS}
+    totals["tournaments"] = len(rows)
+    totals["matches"] = totals["pending"] + totals["in_progress"] + totals["completed"]
+    totals["average_minutes"] = totals["duration_seconds"] / totals["timed"] / 60 if totals["timed"] else None
+    return totals
@@ -0,0 +1,116 @@
+"""Bulk team registration from CSV or Excel files.
+
+Uploaded files use the same column headings as the registration table, plus
+an optional ``Tournament`` column naming the tournament each row belongs to
+(rows without one go to the tournament selected on the page). Validation is
+done column-wise on the whole frame; each failing row gets its own error
+message and is left out, and the remaining rows are inserted in chunks.
+"""
+
+import numpy as np
+import pandas as pd
+
+from matchpoint.transform import PLAYER_COLUMNS, REQUIRED_PLAYERS, TEAMS_ONLY_SPORTS
+
+TOURNAMENT = "Tournament"
+TEAM_NAME = "Team Name"
+CHUNK_SIZE = 500
+
+
+def read_upload(file, filename: str) -> pd.DataFrame:
+    """Read an uploaded CSV/XLSX file as text, with headings matched case-insensitively."""
+    if filename.lower().endswith((".xlsx", ".xls")):
+        try:
+            df = pd.read_excel(file, dtype=str)
+        except ImportError:
+            raise ValueError("Reading Excel files needs the 'openpyxl' package. Upload a CSV file instead.")
+    else:
+        df = pd.read_csv(file, dtype=str, keep_default_na=False)
+    known = {name.lower(): name for name in [TOURNAMENT, TEAM_NAME, *PLAYER_COLUMNS]}
+    df = df.rename(columns=lambda c: known.get(str(c).strip().lower(), str(c).strip()))
+    for column in known.values():
+        if column not in df.columns:
+            df[column] = ""
+    df = df[list(known.values())].fillna("")
+    return df.apply(lambda column: column.str.strip())
+
+
+def validate(df: pd.DataFrame, tournaments: list[dict], default_tournament_id, existing_teams: list[dict]):
+    """Split an upload into insertable rows and per-row errors.
+
+    Returns ``(valid, errors)``: ``valid`` is ``df`` restricted to good rows
+    with ``tournament_id`` and ``sport`` columns added, ``errors`` has one
+    ``Row``/``Error`` line per rejected row (rows numbered as in the file).
+    """
+    by_name = {t["name"].strip().lower(): t for t in tournaments}
+    # Look names up positionally so ids stay Python objects (a dict .map() would turn them into floats).
+    position = pd.Index(list(by_name)).get_indexer(df[TOURNAMENT].str.lower())
+    ids = np.array([t["id"] for t in by_name.values()] + [None], dtype=object)
+    sports = np.array([t["sport"] for t in by_name.values()] + [None], dtype=object)
+    default = next((t for t in tournaments if t["id"] == default_tournament_id), None)
+
+    df = df.copy()
+    named = (df[TOURNAMENT] != "").to_numpy()
+    df["tournament_id"] = np.where(named, ids[position], default_tournament_id)
+    df["sport"] = np.where(named, sports[position], default and default["sport"])
+    team_key = df[TEAM_NAME].str.lower()
+
+    problems = pd.Series("", index=df.index)
+
+    def flag(mask, message):
+        nonlocal problems
+        problems = problems.where(~mask | (problems != ""), message)
+
+    flag(df[TEAM_NAME] == "", "Team name is missing.")
+    flag(df["tournament_id"].isna(), "Unknown tournament: " + df[TOURNAMENT] + ".")
+    needs_players = ~df["sport"].isin(TEAMS_ONLY_SPORTS)
+    for column in REQUIRED_PLAYERS:
+        flag(needs_players & (df[column] == ""), f"{column} is required for this sport.")
+    registered = [(team["tournament_id"], team["team_name"].strip().lower()) for team in existing_teams]
+    flag(pd.Series(pd.MultiIndex.from_arrays([df["tournament_id"], team_key]).isin(registered), index=df.index),
+         "A team with this name is already registered in this tournament.")
+    flag(pd.DataFrame({"t": df["tournament_id"], "n": team_key}).duplicated(keep="first"),
+         "Duplicate team name in this file for the same tournament.")
+
+    bad = problems != ""
+    errors = pd.DataFrame({"Row": df.index[bad] + 2, "Error": problems[bad]})
+    return df[~bad], errors.reset_index(drop=True)
+
+
+def build_payloads(valid: pd.DataFrame) -> list[dict]:
+    """Insert dicts for the ``teams`` table, keeping the file row number under ``_row``."""
+    payload = pd.DataFrame({
+        "_row": valid.index + 2,
+        "tournament_id": valid["tournament_id"],
+        "team_name": valid[TEAM_NAME],
+    }).astype({"_row": object})
+    for heading, column in PLAYER_COLUMNS.items():
+        payload[column] = valid[heading]
+    with_players = ~valid["sport"].isin(TEAMS_ONLY_SPORTS)
+    return (payload[with_players].to_dict("records")
+            + payload.loc[~with_players, ["_row", "tournament_id", "team_name"]].to_dict("records"))
+
+
+def insert_in_chunks(repository, payloads: list[dict], chunk_size: int = CHUNK_SIZE, progress=None):
+    """Insert payloads ``chunk_size`` at a time; a failing chunk is retried row by row.
+
+    ``progress(done, total)`` is called after each chunk. Returns
+    ``(inserted, errors)`` with ``errors`` as a list of ``{"Row", "Error"}``.
+    """
+    inserted, errors = 0, []
+    for start in range(0, len(payloads), chunk_size):
+        chunk = payloads[start:start + chunk_size]
+        rows = [{k: v for k, v in payload.items() if k != "_row"} for payload in chunk]
+        try:
+            repository.create_teams(rows)
+            inserted += len(rows)
+        except Exception:
+            for payload, row in zip(chunk, rows):
+                try:
+                    repository.create_teams([row])
+                    inserted += 1
+                except Exception as e:
+                    errors.append({"Row": payload["_row"], "Error": str(e)})
+        if progress is not None:
+            progress(min(start + chunk_size, len(payloads)), len(payloads))
+    return inserted, errors
@@ -0,0 +1,62 @@
+"""Turn edited DataFrames into insert payloads with column operations.
+
+Used by the Admin Dashboard (tournaments) and Team Registration (teams)
+instead of building one dict per row with ``iterrows``.
+"""
+
+import pandas as pd
+
+FULL_ROUND_ROBIN = "Full Round Robin"
+TEAMS_ONLY_SPORTS = {"Captain Ball"}
+PLAYER_COLUMNS = {
+    "Player 1 Name": "player1_name",
+    "Player 2 Name": "player2_name",
+    "Reserve Man 1": "reserve_man_1_name",
+    "Reserve Man 2": "reserve_man_2_name",
+    "Reserve Woman 1": "reserve_woman_1_name",
+}
+REQUIRED_PLAYERS = ["Player 1 Name", "Player 2 Name"]
+
+
+def filled(column: pd.Series) -> pd.Series:
+    """True where a cell holds a value, the column-wise version of ``if row[column]:``."""
+    return column.fillna("").astype(bool)
+
+
+def format_to_brackets(formats: pd.Series) -> pd.Series:
+    """"Full Round Robin" -> 0, "N Brackets" -> N."""
+    return formats.str.split(" ").str[0].where(formats != FULL_ROUND_ROBIN, "0").astype(int)
+
+
+def tournament_payloads(edited: pd.DataFrame, event_id, sport: str | None = None) -> list[dict]:
+    """Rows for the ``tournaments`` table.
+
+    ``sport`` applies to every row of a standalone event; festival tables carry
+    their own ``Sport`` column instead.
+    """
+    rows = edited[filled(edited["Tournament Name"])]
+    payload = pd.DataFrame({
+        "event_id": event_id,
+        "name": rows["Tournament Name"],
+        "sport": sport if sport is not None else rows["Sport"],
+        "match_type": rows["Match Type"],
+        "num_brackets": format_to_brackets(rows["Format"]),
+    }, index=rows.index)
+    return payload.to_dict("records")
+
+
+def team_payloads(edited: pd.DataFrame, tournament_id, sport: str) -> list[dict]:
+    """Rows for the ``teams`` table. Teams of doubles sports need both player names."""
+    keep = filled(edited["Team Name"])
+    with_players = sport not in TEAMS_ONLY_SPORTS
+    if with_players:
+        if not all(column in edited.columns for column in REQUIRED_PLAYERS):
+            return []
+        for column in REQUIRED_PLAYERS:
+            keep &= filled(edited[column])
+    rows = edited[keep]
+    payload = pd.DataFrame({"tournament_id": tournament_id, "team_name": rows["Team Name"]}, index=rows.index)
+    if with_players:
+        for heading, column in PLAYER_COLUMNS.items():
+            payload[column] = rows[heading] if heading in rows.columns else None
+    return payload.to_dict("records")
@@ -1,18 +1,13 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
+from matchpoint.auth import AuthSession
+from matchpoint import profiling
+from matchpoint.page import setup, connect
+from matchpoint.perf_panel import end_page
 
-# --- DATABASE CONNECTION ---
-try:
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(supabase_url, supabase_key)
-except Exception as e:
-    st.error("Error: Could not connect to the database. Please check your Supabase credentials in the app's secrets.")
-    st.error(f"Details: {e}")
-    st.stop()
+setup("Register", icon="🏆", layout="centered")
 
 # --- PAGE UI ---
+profiling.mark("register")
 st.title("Welcome to MatchPoint! 🏆")
 st.header("Create a New Account")
 
@@ -25,17 +20,18 @@ with st.form("register_form"):
     
     if register_button:
         if password and email and full_name and phone_number:
+            # Connected only on submit: just opening the form does not load the database client.
+            db = connect(as_user=False)
             try:
-                user_session = supabase.auth.sign_up({
-                    "email": email,
-                    "password": password
-                })
+                user_session = db.sign_up(email, password)
                 if user_session.user:
                     user_id = user_session.user.id
-                    supabase.table("profiles").update({
+                    # Write the profile as the new user when sign-up returned a session (row-level security).
+                    new_session = AuthSession.from_response(user_session)
+                    (db.for_session(new_session) if new_session else db).update_profile(user_id, {
                         "full_name": full_name,
                         "phone_number": phone_number
-                    }).eq("id", user_id).execute()
+                    })
                     st.success("Registration successful! Please check your email to verify your account.")
                 else:
                     st.error("Registration failed after sign-up. Please try again.")
@@ -43,3 +39,5 @@ with st.form("register_form"):
                 st.error(f"An error occurred during registration: {e}")
         else:
             st.warning("Please fill out all fields.")
+
+end_page()
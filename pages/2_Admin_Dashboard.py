@@ -1,22 +1,21 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-import pandas as pd
+from matchpoint import profiling
+from matchpoint.page import setup, require_login, connect
+from matchpoint.perf_panel import end_page
 
 # --- PAGE CONFIG ---
-# The page config is now set in the main app.py, but we can set a title here.
-st.set_page_config(page_title="Admin Dashboard", page_icon="🛠️", layout="wide")
+setup("Admin Dashboard", icon="🛠️")
+
+# The role comes from the profile cached at login, so this check costs no query.
+require_login("Only organisers can use the Admin Dashboard. Please log in with an admin account.", admin=True)
 
+# --- IMPORTS AND DATABASE CONNECTION (signed-in organisers only) ---
+import pandas as pd
+from matchpoint.transform import tournament_payloads
+from matchpoint.snapshot import export_bytes, import_event
+from matchpoint.summary import event_totals
 
-# --- DATABASE CONNECTION ---
-try:
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(supabase_url, supabase_key)
-except Exception as e:
-    st.error("Error: Could not connect to the database. Please check your Supabase credentials in the app's secrets.")
-    st.error(f"Details: {e}")
-    st.stop()
+db = connect()
 
 # --- Initialize Session State for this page ---
 if 'event_type_choice' not in st.session_state:
@@ -28,9 +27,40 @@ def reset_view():
     st.session_state.event_type_choice = None
 
 
+# --- Shared by the Standalone and Festival forms ---
+SPORTS = ["Badminton", "Pickleball", "Captain Ball"]
+
+
+def tournament_column_config(with_sport):
+    config = {"Tournament Name": st.column_config.TextColumn(required=True)}
+    if with_sport:
+        config["Sport"] = st.column_config.SelectboxColumn("Sport", options=SPORTS, required=True)
+    config["Match Type"] = st.column_config.SelectboxColumn("Match Type", options=["Mens Doubles", "Womens Doubles", "Mix Doubles", "Standard"], required=True)
+    config["Format"] = st.column_config.SelectboxColumn("Format", options=["Full Round Robin", "2 Brackets", "3 Brackets", "4 Brackets"], required=True)
+    return config
+
+
+def create_event_with_tournaments(event_name, event_date, edited_tournaments, sport=None):
+    """Insert the event, then all its tournaments in one batch. ``sport`` is set for standalone events."""
+    if not (event_name and event_date):
+        st.warning("Please provide an event name and a date.")
+        return
+    try:
+        new_event_id = db.create_event(event_name, str(event_date))['id']
+        tournaments_to_insert = tournament_payloads(edited_tournaments, new_event_id, sport)
+
+        if tournaments_to_insert:
+            db.create_tournaments(tournaments_to_insert)
+            st.success(f"Event '{event_name}' and its {len(tournaments_to_insert)} tournaments were created successfully!")
+            st.balloons()
+    except Exception as e:
+        st.error(f"An error occurred: {e}")
+
+
 # --- PAGE LOGIC ---
 # This page should only be visible if the user is logged in, which is handled by Streamlit's multi-page structure
 # based on the main app.py logic.
+profiling.mark("page logic")
 st.title("Admin Dashboard 🛠️")
 
 if st.session_state.event_type_choice:
@@ -49,6 +79,59 @@ if not st.session_state.event_type_choice:
         st.session_state.event_type_choice = "Festival"
         st.rerun()
 
+    events = db.list_events()
+    if events:
+        st.divider()
+        st.header("Event Overview")
+        overview_event = st.selectbox("Event", events, format_func=lambda e: f"{e['event_name']} ({e['event_date']})", key="overview_event")
+        summary_rows = db.event_summary(overview_event['id'])
+        totals = event_totals(summary_rows)
+        o_cols = st.columns(6)
+        o_cols[0].metric("Tournaments", totals['tournaments'])
+        o_cols[1].metric("Teams", totals['teams'])
+        o_cols[2].metric("Pending", totals['pending'])
+        o_cols[3].metric("In Progress", totals['in_progress'])
+        o_cols[4].metric("Completed", totals['completed'])
+        o_cols[5].metric("Avg. Match", f"{totals['average_minutes']:.0f} min" if totals['average_minutes'] is not None else "–")
+        if summary_rows:
+            names = {t['id']: t['name'] for t in db.list_tournaments(overview_event['id'])}
+            per_tournament = pd.DataFrame(summary_rows)
+            per_tournament.insert(0, "Tournament", per_tournament["tournament_id"].map(names))
+            per_tournament["Avg. Match (min)"] = (per_tournament["duration_seconds"] / per_tournament["timed"].where(per_tournament["timed"] > 0) / 60).round(1)
+            st.dataframe(per_tournament[["Tournament", "teams", "pending", "in_progress", "completed", "Avg. Match (min)"]], hide_index=True)
+
+    with st.expander("Archive or clone an event"):
+        st.caption("A snapshot holds an event with its tournaments, teams, matches and scores in one file.")
+        if events:
+            archive_event = st.selectbox("Event to export", events, format_func=lambda e: f"{e['event_name']} ({e['event_date']})")
+            if st.button("Prepare Snapshot"):
+                try:
+                    st.session_state.snapshot = (archive_event['event_name'], export_bytes(db, archive_event['id']))
+                except Exception as e:
+                    st.error(f"Could not export the event: {e}")
+            if 'snapshot' in st.session_state:
+                snapshot_name, snapshot_data = st.session_state.snapshot
+                st.download_button("Download Snapshot", snapshot_data, file_name=f"{snapshot_name}.matchpoint.zip", mime="application/zip")
+
+        st.divider()
+        uploaded_snapshot = st.file_uploader("Snapshot to import", type=["zip"])
+        if uploaded_snapshot is not None:
+            new_event_name = st.text_input("Name for the new event (leave empty to keep the original)")
+            new_event_date = st.date_input("Date for the new event", value=None)
+            include_matches = st.checkbox("Include matches and scores", value=False, help="Leave unticked to copy only the tournaments and teams, e.g. to reuse last year's setup.")
+            if st.button("Import Snapshot"):
+                try:
+                    imported = import_event(db, uploaded_snapshot, event_name=new_event_name or None,
+                                            event_date=str(new_event_date) if new_event_date else None,
+                                            with_matches=include_matches)
+                    st.success(f"Event '{imported['event_name']}' was created with {imported['tournaments']} tournaments, {imported['teams']} teams and {imported['matches']} matches.")
+                except Exception as e:
+                    st.error(f"Could not import the snapshot: {e}")
+
+    with st.expander("Read cache statistics"):
+        st.caption("Events, tournaments and teams are served from a shared cache. Hits are reads that skipped the database.")
+        st.json(db.cache.stats())
+
 elif st.session_state.event_type_choice == "Standalone":
     st.header("Standalone Event Setup")
 
@@ -56,7 +139,7 @@ elif st.session_state.event_type_choice == "Standalone":
         st.subheader("Step 1: Name Your Event and Choose Sport")
         event_name = st.text_input("Event Name (e.g., 'Annual Pickleball Open')")
         event_date = st.date_input("Event Date")
-        sport = st.selectbox("Select the Sport for this Event", ["Badminton", "Pickleball", "Captain Ball"])
+        sport = st.selectbox("Select the Sport for this Event", SPORTS)
 
         st.divider()
 
@@ -69,41 +152,13 @@ elif st.session_state.event_type_choice == "Standalone":
         ])
 
         edited_tournaments = st.data_editor(
-            initial_tournaments, num_rows="dynamic",
-            column_config={
-                "Tournament Name": st.column_config.TextColumn(required=True),
-                "Match Type": st.column_config.SelectboxColumn("Match Type", options=["Mens Doubles", "Womens Doubles", "Mix Doubles", "Standard"], required=True),
-                "Format": st.column_config.SelectboxColumn("Format", options=["Full Round Robin", "2 Brackets", "3 Brackets", "4 Brackets"], required=True),
-            }
+            initial_tournaments, num_rows="dynamic", column_config=tournament_column_config(with_sport=False)
         )
 
         submit_standalone_button = st.form_submit_button("Create Event and Add Tournaments")
 
         if submit_standalone_button:
-            if event_name and event_date:
-                try:
-                    event_response = supabase.table("events").insert({ "event_name": event_name, "event_date": str(event_date) }).execute()
-                    new_event_id = event_response.data[0]['id']
-
-                    tournaments_to_insert = []
-                    for index, row in edited_tournaments.iterrows():
-                        if not row["Tournament Name"]: continue
-                        if row["Format"] == "Full Round Robin": num_brackets = 0
-                        else: num_brackets = int(row["Format"].split(" ")[0])
-
-                        tournaments_to_insert.append({
-                            "event_id": new_event_id, "name": row["Tournament Name"], "sport": sport, 
-                            "match_type": row["Match Type"], "num_brackets": num_brackets
-                        })
-
-                    if tournaments_to_insert:
-                        supabase.table("tournaments").insert(tournaments_to_insert).execute()
-                        st.success(f"Event '{event_name}' and its {len(tournaments_to_insert)} tournaments were created successfully!")
-                        st.balloons()
-                except Exception as e:
-                    st.error(f"An error occurred: {e}")
-            else:
-                st.warning("Please provide an event name and a date.")
+            create_event_with_tournaments(event_name, event_date, edited_tournaments, sport=sport)
 
 elif st.session_state.event_type_choice == "Festival":
     st.header("Festival Event Setup")
@@ -123,39 +178,12 @@ elif st.session_state.event_type_choice == "Festival":
         ])
 
         edited_tournaments = st.data_editor(
-            initial_tournaments, num_rows="dynamic",
-            column_config={
-                "Tournament Name": st.column_config.TextColumn(required=True),
-                "Sport": st.column_config.SelectboxColumn("Sport", options=["Badminton", "Pickleball", "Captain Ball"], required=True),
-                "Match Type": st.column_config.SelectboxColumn("Match Type", options=["Mens Doubles", "Womens Doubles", "Mix Doubles", "Standard"], required=True),
-                "Format": st.column_config.SelectboxColumn("Format", options=["Full Round Robin", "2 Brackets", "3 Brackets", "4 Brackets"], required=True),
-            }
+            initial_tournaments, num_rows="dynamic", column_config=tournament_column_config(with_sport=True)
         )
 
         submit_festival_button = st.form_submit_button("Create Event and Add Tournaments")
 
         if submit_festival_button:
-            if event_name and event_date:
-                try:
-                    event_response = supabase.table("events").insert({ "event_name": event_name, "event_date": str(event_date) }).execute()
-                    new_event_id = event_response.data[0]['id']
-
-                    tournaments_to_insert = []
-                    for index, row in edited_tournaments.iterrows():
-                        if not row["Tournament Name"]: continue
-                        if row["Format"] == "Full Round Robin": num_brackets = 0
-                        else: num_brackets = int(row["Format"].split(" ")[0])
-
-                        tournaments_to_insert.append({
-                            "event_id": new_event_id, "name": row["Tournament Name"], "sport": row["Sport"],
-                            "match_type": row["Match Type"], "num_brackets": num_brackets
-                        })
-
-                    if tournaments_to_insert:
-                        supabase.table("tournaments").insert(tournaments_to_insert).execute()
-                        st.success(f"Event '{event_name}' and its {len(tournaments_to_insert)} tournaments were created successfully!")
-                        st.balloons()
-                except Exception as e:
-                    st.error(f"An error occurred: {e}")
-            else:
-                st.warning("Please provide an event name and a date.")
+            create_event_with_tournaments(event_name, event_date, edited_tournaments)
+
+end_page()
@@ -1,32 +1,27 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-import pandas as pd
-import numpy as np
+from matchpoint import profiling
+from matchpoint.page import setup, require_login, connect
+from matchpoint.perf_panel import end_page
+
+TEAMS_PER_PAGE = 50
 
 # --- PAGE CONFIG ---
-st.set_page_config(page_title="Team Registration", page_icon="👥", layout="wide")
-st.title("Team Registration 👥")
+setup("Team Registration", icon="👥", title="Team Registration 👥")
+require_login()
 
-# --- DATABASE CONNECTION AND USER AUTHENTICATION ---
-try:
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(supabase_url, supabase_key)
-except Exception as e:
-    st.error("Error connecting to database. Please check secrets.")
-    st.stop()
+# --- IMPORTS AND DATABASE CONNECTION (signed-in users only) ---
+import pandas as pd
+from matchpoint.team_import import read_upload, validate, build_payloads, insert_in_chunks
+from matchpoint.transform import team_payloads
+from matchpoint.paging import KeysetPager
 
-# Check if the user is logged in. If not, show a message and stop.
-if not st.session_state.get("logged_in", False):
-    st.warning("You must be logged in to access this page.")
-    st.info("Please log in using the main 'app' page first.")
-    st.stop()
+db = connect()
 
 # --- PAGE LOGIC ---
 try:
+    profiling.mark("select tournament")
     # Step 1: Select an Event
-    events = supabase.table("events").select("id, event_name").execute().data
+    events = db.list_events()
     if not events:
         st.warning("No events created yet. Please create an event in the Admin Dashboard first.")
         st.stop()
@@ -38,7 +33,7 @@ try:
         selected_event_id = event_names[selected_event_name]
 
         # Step 2: Select a Tournament from the chosen event
-        tournaments = supabase.table("tournaments").select("id, name, sport").eq("event_id", selected_event_id).execute().data
+        tournaments = db.list_tournaments(selected_event_id)
         if not tournaments:
             st.info("This event has no tournaments. Please add tournaments in the Admin Dashboard.")
             st.stop()
@@ -54,64 +49,89 @@ try:
             st.divider()
 
             # Step 3: Register new teams using a conditional form based on the sport
+            profiling.mark("register teams")
             st.header(f"Register New Teams for '{selected_tournament_display_name}'")
-            st.write("Use the table below to add multiple teams at once. Add new rows using the `+` button at the bottom.")
+            entry_mode = st.radio("How would you like to add teams?", ["Type into a table", "Upload a CSV/Excel file"], horizontal=True)
+
+            if entry_mode == "Type into a table":
+                st.write("Use the table below to add multiple teams at once. Add new rows using the `+` button at the bottom.")
             
-            editor_key = f"team_editor_{selected_tournament_id}"
+                editor_key = f"team_editor_{selected_tournament_id}"
+
+                if selected_tournament_sport == "Captain Ball":
+                    if editor_key not in st.session_state:
+                        st.session_state[editor_key] = pd.DataFrame([ {"Team Name": ""} ])
+                    edited_teams = st.data_editor(
+                        st.session_state[editor_key], num_rows="dynamic", hide_index=True, key=f"editor_cb_{selected_tournament_id}"
+                    )
+                else:
+                    if editor_key not in st.session_state:
+                        st.session_state[editor_key] = pd.DataFrame([
+                            {"Team Name": "", "Player 1 Name": "", "Player 2 Name": "", "Reserve Man 1": "", "Reserve Man 2": "", "Reserve Woman 1": ""},
+                        ])
+                    edited_teams = st.data_editor(
+                        st.session_state[editor_key], num_rows="dynamic", hide_index=True, key=f"editor_full_{selected_tournament_id}"
+                    )
+
+                if st.button("Register All Teams from Table"):
+                    st.session_state[editor_key] = edited_teams
+                    teams_to_insert = team_payloads(st.session_state[editor_key], selected_tournament_id, selected_tournament_sport)
+
+                    if teams_to_insert:
+                        try:
+                            db.create_teams(teams_to_insert)
+                            st.success(f"Successfully registered {len(teams_to_insert)} new team(s) for '{selected_tournament_display_name}'!")
+                            st.balloons()
+                            del st.session_state[editor_key]
+                            st.rerun() 
+                        except Exception as e:
+                            st.error(f"Error registering teams: {e}")
+                    else:
+                        st.warning("No complete teams were entered in the table. Please make sure all required fields are filled.")
 
-            if selected_tournament_sport == "Captain Ball":
-                if editor_key not in st.session_state:
-                    st.session_state[editor_key] = pd.DataFrame([ {"Team Name": ""} ])
-                edited_teams = st.data_editor(
-                    st.session_state[editor_key], num_rows="dynamic", hide_index=True, key=f"editor_cb_{selected_tournament_id}"
-                )
             else:
-                if editor_key not in st.session_state:
-                    st.session_state[editor_key] = pd.DataFrame([
-                        {"Team Name": "", "Player 1 Name": "", "Player 2 Name": "", "Reserve Man 1": "", "Reserve Man 2": "", "Reserve Woman 1": ""},
-                    ])
-                edited_teams = st.data_editor(
-                    st.session_state[editor_key], num_rows="dynamic", hide_index=True, key=f"editor_full_{selected_tournament_id}"
+                st.write(
+                    "Upload a file with the columns **Team Name**, **Player 1 Name**, **Player 2 Name**, **Reserve Man 1**, "
+                    "**Reserve Man 2** and **Reserve Woman 1**. Add a **Tournament** column to register teams for several "
+                    "tournaments of this event at once; rows without one go to the tournament selected above."
                 )
-
-            if st.button("Register All Teams from Table"):
-                st.session_state[editor_key] = edited_teams
-                teams_to_insert = []
-
-                for index, row in st.session_state[editor_key].iterrows():
-                    if row["Team Name"]:
-                        team_data = {
-                            "tournament_id": selected_tournament_id,
-                            "team_name": row["Team Name"]
-                        }
-                        if selected_tournament_sport != "Captain Ball":
-                            if "Player 1 Name" in row and "Player 2 Name" in row and row["Player 1 Name"] and row["Player 2 Name"]:
-                                team_data.update({
-                                    "player1_name": row["Player 1 Name"], "player2_name": row["Player 2 Name"],
-                                    "reserve_man_1_name": row["Reserve Man 1"], "reserve_man_2_name": row["Reserve Man 2"],
-                                    "reserve_woman_1_name": row["Reserve Woman 1"]
-                                })
-                                teams_to_insert.append(team_data)
-                        else:
-                            teams_to_insert.append(team_data)
-                
-                if teams_to_insert:
+                uploaded_file = st.file_uploader("Team list", type=["csv", "xlsx"])
+                if uploaded_file is not None:
                     try:
-                        supabase.table("teams").insert(teams_to_insert).execute()
-                        st.success(f"Successfully registered {len(teams_to_insert)} new team(s) for '{selected_tournament_display_name}'!")
-                        st.balloons()
-                        del st.session_state[editor_key]
-                        st.rerun() 
-                    except Exception as e:
-                        st.error(f"Error registering teams: {e}")
-                else:
-                    st.warning("No complete teams were entered in the table. Please make sure all required fields are filled.")
+                        upload_df = read_upload(uploaded_file, uploaded_file.name)
+                        existing_teams = db.list_teams([t['id'] for t in tournaments])
+                        valid_teams, upload_errors = validate(upload_df, tournaments, selected_tournament_id, existing_teams)
+                    except ValueError as e:
+                        st.error(str(e))
+                        st.stop()
+
+                    st.write(f"**{len(valid_teams)}** of {len(upload_df)} rows are ready to import.")
+                    if not upload_errors.empty:
+                        st.warning(f"{len(upload_errors)} row(s) will be skipped:")
+                        st.dataframe(upload_errors, hide_index=True)
+
+                    if len(valid_teams) and st.button(f"Import {len(valid_teams)} Teams"):
+                        progress_bar = st.progress(0.0, text="Importing teams...")
+                        inserted, insert_errors = insert_in_chunks(
+                            db, build_payloads(valid_teams),
+                            progress=lambda done, total: progress_bar.progress(done / total, text=f"Imported {done} of {total} rows"),
+                        )
+                        st.success(f"Successfully registered {inserted} new team(s)!")
+                        if insert_errors:
+                            st.error(f"{len(insert_errors)} row(s) could not be saved:")
+                            st.dataframe(insert_errors, hide_index=True)
             
             st.divider()
 
             # Step 4: Display already registered teams
+            # Only one page is fetched, filtered by name on the server, so large tournaments stay quick.
+            profiling.mark("registered teams")
             st.header("Registered Teams for this Tournament")
-            teams_data = supabase.table("teams").select("*").eq("tournament_id", selected_tournament_id).execute().data
+            pager = st.session_state.setdefault(f"team_pager_{selected_tournament_id}", KeysetPager(TEAMS_PER_PAGE))
+            team_search = st.text_input("Search teams by name", key=f"team_search_{selected_tournament_id}").strip()
+            pager.use_filters((team_search,))
+            teams_data, remaining = db.page_teams(selected_tournament_id, team_search, after=pager.after, limit=pager.page_size)
+            pager.loaded(teams_data, remaining)
             if teams_data:
                 display_df = pd.DataFrame(teams_data)
                 
@@ -122,11 +142,19 @@ try:
                 existing_columns_to_show = [col for col in columns_to_show if col in display_df.columns]
 
                 display_df_filtered = display_df[existing_columns_to_show]
-                display_df_filtered.insert(0, 'No.', range(1, len(display_df_filtered) + 1))
+                display_df_filtered.insert(0, 'No.', range(pager.offset + 1, pager.offset + len(display_df_filtered) + 1))
                 
                 st.dataframe(display_df_filtered, hide_index=True)
+                p_col1, p_col2, p_col3 = st.columns([1, 2, 1])
+                p_col1.button("Previous", key="team_prev", on_click=pager.previous_page, disabled=not pager.has_previous, use_container_width=True)
+                p_col2.caption(pager.caption("teams"))
+                p_col3.button("Next", key="team_next", on_click=pager.next_page, disabled=not pager.has_next, use_container_width=True)
+            elif team_search:
+                st.write(f"No teams match '{team_search}'.")
             else:
                 st.write("No teams registered for this tournament yet.")
 
 except Exception as e:
     st.error(f"An error occurred: {e}")
+
+end_page()
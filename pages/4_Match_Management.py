@@ -1,12 +1,24 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-import pandas as pd
+from matchpoint.connection import get_standings_book, get_match_broker, get_forecast_book, get_bracket_layouts
+from matchpoint.scheduling import schedule_tournament, bracket_label
+from matchpoint.festival import schedule_event
+from matchpoint.standings import OVERALL, KNOCKOUT
+from matchpoint.bracket import BRACKET_COLUMNS
+from matchpoint.realtime import ScheduleModel
+from matchpoint.paging import KeysetPager
+from matchpoint.summary import event_totals
+from matchpoint.analytics import slot_clock
+from matchpoint import profiling
+from matchpoint.page import setup, require_login, connect
+from matchpoint.perf_panel import end_page
 import itertools
+from datetime import date, datetime, time
+
+MATCHES_PER_PAGE = 25
+MATCH_STATUSES = ["Pending", "In Progress", "Completed"]
 
 # --- PAGE CONFIG ---
-st.set_page_config(page_title="Match Management", page_icon="⚔️", layout="wide")
-st.title("Match & Score Management ⚔️")
+setup("Match Management", icon="⚔️", title="Match & Score Management ⚔️")
 
 # --- Initialize Session State for scoring ---
 if 'selected_match_id' not in st.session_state:
@@ -14,67 +26,213 @@ if 'selected_match_id' not in st.session_state:
 
 # --- A function to set the match ID for scoring ---
 def select_match(match_id):
+    # Callbacks only set state: the fragment below reruns every second and shows the selection from it.
     st.session_state.selected_match_id = match_id
-    # We don't need to switch pages manually, we'll just tell the user to navigate.
-    st.info(f"Match {match_id} selected. Please navigate to the 'Scoring' page from the sidebar.")
 
 
-# --- DATABASE CONNECTION AND USER AUTHENTICATION ---
-try:
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(supabase_url, supabase_key)
-except Exception as e:
-    st.error("Error connecting to database. Please check secrets.")
-    st.stop()
+# --- One page of a tournament's match list, rendered from the session's schedule model ---
+# The filters run on the server and only the page on screen is fetched, so a rerun costs the
+# same for a 20-match tournament as for a 2000-match one. Live updates patch the rows on the page.
+def render_match_schedule(tournament, team_map):
+    tournament_id = tournament['id']
+    model = st.session_state.schedule_model
+    if 'match_subscription' in st.session_state:
+        changes = st.session_state.match_subscription.drain()
+        if changes is None:
+            model.invalidate()  # the tab fell too far behind; fetch the pages again instead of replaying
+        else:
+            model.apply_all(changes)
+
+    pager = st.session_state.setdefault(f"match_pager_{tournament_id}", KeysetPager(MATCHES_PER_PAGE))
+    brackets = [bracket_label(i) for i in range(tournament['num_brackets'] or 0)] if (tournament['num_brackets'] or 0) > 1 else []
+    f_col1, f_col2, f_col3 = st.columns(3)
+    status = f_col1.selectbox("Status", ["All", *MATCH_STATUSES], key=f"match_status_{tournament_id}")
+    bracket = f_col2.selectbox("Bracket", ["All", *brackets], key=f"match_bracket_{tournament_id}",
+                            format_func=lambda b: b if b == "All" else f"Bracket {b}", disabled=not brackets)
+    search = f_col3.text_input("Team name contains", key=f"match_search_{tournament_id}").strip().lower()
+    pager.use_filters((status, bracket, search))
 
-if not st.session_state.get("logged_in", False):
-    st.warning("You must be logged in to access this page.")
-    st.stop()
+    window = (pager.filters, pager.after)
+    if model.window(tournament_id) != window:
+        # Team names are already cached for the event, so the search is resolved to ids here
+        # and the server filters on team_a_id/team_b_id.
+        team_ids = [team_id for team_id, name in team_map.items() if search in name.lower()] if search else None
+        rows, remaining = db.page_matches(
+            tournament_id,
+            status=None if status == "All" else status,
+            bracket=None if bracket == "All" else bracket,
+            team_ids=team_ids, after=pager.after, limit=pager.page_size,
+        )
+        pager.loaded(rows, remaining)
+        model.set_window(tournament_id, rows, window)
+
+    for match in model.matches(tournament_id):
+        team_a_name = team_map.get(match['team_a_id'], "Unknown")
+        team_b_name = team_map.get(match['team_b_id'], "Unknown")
+
+        m_col1, m_col2 = st.columns([3, 1])
+        with m_col1:
+            placement = f" | Slot {match['time_slot']}, Court {match['court_number']}" if match.get('time_slot') else ""
+            st.write(f"**Match {match['id']}:** {team_a_name} **VS** {team_b_name} | Status: {match['status']}{placement}")
+        with m_col2:
+            st.button("Score this Match", key=f"score_{match['id']}", on_click=select_match, args=(match['id'],), disabled=(match['status']=='Completed'))
+        if match['id'] == st.session_state.selected_match_id:
+            # We don't need to switch pages manually, we'll just tell the user to navigate.
+            st.info(f"Match {match['id']} selected. Please navigate to the 'Scoring' page from the sidebar.")
+
+    p_col1, p_col2, p_col3 = st.columns([1, 2, 1])
+    p_col1.button("Previous", key=f"match_prev_{tournament_id}", on_click=pager.previous_page, disabled=not pager.has_previous, use_container_width=True)
+    p_col2.caption(pager.caption("matches"))
+    p_col3.button("Next", key=f"match_next_{tournament_id}", on_click=pager.next_page, disabled=not pager.has_next, use_container_width=True)
+
+
+# --- USER AUTHENTICATION, THEN IMPORTS AND DATABASE CONNECTION ---
+require_login()
+import pandas as pd
+
+db = connect()
 
 # --- PAGE LOGIC ---
 try:
-    events = supabase.table("events").select("id, event_name").execute().data
+    profiling.mark("load event")
+    events = db.list_events()
     if not events:
         st.warning("No events created yet. Please create an event in the Admin Dashboard first.")
         st.stop()
 
     event_names = {e['event_name']: e['id'] for e in events}
     selected_event_name = st.selectbox("Select an Event:", event_names.keys())
+    live_updates = st.toggle("Live updates", value=True, help="Show match status changes from other devices as they happen, without reloading the page.")
+    if live_updates and 'match_subscription' not in st.session_state:
+        st.session_state.match_subscription = get_match_broker().subscribe()
+        st.session_state.pop('schedule_model', None)  # it missed the changes made while live updates were off
+    elif not live_updates:
+        # Nothing keeps the rows current without the subscription, so each full rerun fetches them again.
+        st.session_state.pop('match_subscription', None)
+        st.session_state.pop('schedule_model', None)
+    match_schedule = st.fragment(render_match_schedule, run_every=1.0 if live_updates else None)
     
     if selected_event_name:
         selected_event_id = event_names[selected_event_name]
         st.divider()
         st.header(f"Tournaments for '{selected_event_name}'")
-        tournaments = supabase.table("tournaments").select("*").eq("event_id", selected_event_id).execute().data
+        tournaments = db.list_tournaments(selected_event_id)
+
+        # Counts come from the trigger-maintained summary: one small read, not a scan of the matches.
+        totals = event_totals(db.event_summary(selected_event_id))
+        o_cols = st.columns(5)
+        o_cols[0].metric("Teams", totals['teams'])
+        o_cols[1].metric("Pending", totals['pending'])
+        o_cols[2].metric("In Progress", totals['in_progress'])
+        o_cols[3].metric("Completed", totals['completed'])
+        o_cols[4].metric("Avg. Match", f"{totals['average_minutes']:.0f} min" if totals['average_minutes'] is not None else "–")
 
         if not tournaments:
             st.info("This event has no tournaments yet.")
         else:
             all_tournament_ids = [t['id'] for t in tournaments]
-            if all_tournament_ids:
-                all_team_data = supabase.table("teams").select("id, team_name").in_("tournament_id", all_tournament_ids).execute().data
-                team_map = {team['id']: team['team_name'] for team in all_team_data}
-            else:
-                team_map = {}
+            all_team_data = db.list_teams(all_tournament_ids)
+            team_map = {team['id']: team['team_name'] for team in all_team_data}
+
+            scheduled_ids = [t['id'] for t in tournaments if t['status'] in ['In Progress', 'Completed']]
+
+            if scheduled_ids:
+                with st.expander("Event Timetable (all tournaments)"):
+                    st.write("Place every pending match of this event on a court and time slot so no team or player is booked twice at once.")
+                    sports = sorted({t['sport'] for t in tournaments})
+                    court_cols = st.columns(len(sports) + 1)
+                    courts_per_sport = {
+                        sport: int(court_cols[i].number_input(f"{sport} courts", min_value=1, value=2, step=1, key=f"event_courts_{sport}"))
+                        for i, sport in enumerate(sports)
+                    }
+                    slot_minutes = court_cols[-1].number_input("Slot length (min)", min_value=5, value=30, step=5)
+                    if st.button("Build Event Timetable"):
+                        scheduled = [t for t in tournaments if t['id'] in scheduled_ids]
+                        timetable = schedule_event(db, scheduled, courts_per_sport)
+                        total_minutes = timetable.num_slots * slot_minutes
+                        st.success(
+                            f"Scheduled {len(timetable.slots)} matches into {timetable.num_slots} slots "
+                            f"(about {total_minutes // 60}h {total_minutes % 60}min, best possible {timetable.lower_bound} slots)."
+                        )
+
+                if st.toggle("Show call times", key="call_times", help="When each pending match should really start, given how long matches on its court have been taking."):
+                    profiling.mark("call times")
+                    forecasts = get_forecast_book()
+                    event_date = next((e.get('event_date') for e in events if e['id'] == selected_event_id), None)
+                    event_day = date.fromisoformat(str(event_date)) if event_date else date.today()
+                    f_cols = st.columns(2)
+                    first_slot = f_cols[0].time_input("First slot starts", value=time(9, 0), key="first_slot_time")
+                    show_next = f_cols[1].number_input("Matches to show", min_value=5, value=20, step=5, key="call_times_count")
+                    forecast = forecasts.get(db, selected_event_id).forecast(
+                        datetime.now().astimezone(), slot_clock(event_day, first_slot, slot_minutes), slot_minutes
+                    )
+                    upcoming = [row for row in forecast if row['status'] == 'Pending'][:int(show_next)]
+                    if upcoming:
+                        tournament_names = {t['id']: t['name'] for t in tournaments}
+                        calls = pd.DataFrame(upcoming)
+                        st.dataframe(pd.DataFrame({
+                            "Match": calls["id"],
+                            "Tournament": calls["tournament_id"].map(tournament_names),
+                            "Teams": calls["team_a_id"].map(team_map) + " vs " + calls["team_b_id"].map(team_map),
+                            "Court": calls["sport"] + " " + calls["court_number"].astype(str),
+                            "Slot": calls["time_slot"],
+                            "Planned": calls["planned_start"].map(lambda t: t.strftime("%H:%M")),
+                            "Expected": calls["expected_start"].map(lambda t: t.strftime("%H:%M")),
+                            "Delay (min)": calls["delay_minutes"].round().astype(int),
+                        }), hide_index=True)
+                    else:
+                        st.info("No pending matches have a court and time slot yet.")
+                    durations = forecasts.stats.summary()
+                    if durations:
+                        st.write("**Match durations so far**")
+                        st.dataframe(pd.DataFrame(durations).round(1), hide_index=True)
+
+            # Each tournament's match list fetches its own page on first render (see render_match_schedule).
+            # The model lives across reruns of the same event, so a page is fetched again only when its
+            # filters or cursor change; live updates patch it in between.
+            profiling.mark("tournaments")
+            if st.session_state.get('schedule_model_event') != selected_event_id:
+                st.session_state.pop('schedule_model', None)
+            st.session_state.schedule_model_event = selected_event_id
+            st.session_state.setdefault('schedule_model', ScheduleModel({}, windowed=True))
 
             for t in tournaments:
                 with st.container(border=True):
-                    # ... Lock/Unlock and Generate Matches buttons are the same ...
-                    
+                    st.subheader(f"{t['name']} ({t['sport']})")
+                    # ... Lock/Unlock buttons are the same ...
+
+                    if t['status'] not in ['In Progress', 'Completed']:
+                        g_col1, g_col2 = st.columns([1, 3])
+                        num_courts = g_col1.number_input("Courts", min_value=1, value=2, step=1, key=f"courts_{t['id']}")
+                        if g_col2.button("Generate Matches", key=f"generate_{t['id']}"):
+                            try:
+                                created = schedule_tournament(db, t, int(num_courts))
+                                st.toast(f"Generated {created} matches for '{t['name']}'.")
+                                st.rerun()
+                            except ValueError as e:
+                                st.warning(str(e))
+
                     if t['status'] in ['In Progress', 'Completed']:
+                        if st.toggle("Show standings", key=f"standings_{t['id']}"):
+                            standings = get_standings_book().get(db, t['id'])
+                            for bracket, rows in standings.snapshot().items():
+                                st.write(f"**{bracket if bracket == OVERALL else f'Bracket {bracket}'}**")
+                                table = pd.DataFrame(rows)
+                                table.insert(0, "Team", table["team_id"].map(team_map))
+                                st.dataframe(table[["Team", "played", "wins", "draws", "losses", "set_diff", "point_diff"]], hide_index=True)
+                        if st.toggle("Show knockout bracket", key=f"knockout_{t['id']}"):
+                            # Laid out once per bracket version for every session; a new result redraws only its path to the final.
+                            knockout = db.list_bracket_matches(t['id'], KNOCKOUT, columns=BRACKET_COLUMNS)
+                            layout = get_bracket_layouts().get(t['id'], knockout, team_map)
+                            if layout is None:
+                                st.info("The knockout stage starts once every bracket has been played.")
+                            else:
+                                st.html(f'<div style="overflow-x: auto">{layout.svg()}</div>')
                         st.markdown("---")
                         st.write("**Match Schedule:**")
-                        match_data = supabase.table("matches").select("*").eq("tournament_id", t['id']).execute().data
-                        for match in match_data:
-                            team_a_name = team_map.get(match['team_a_id'], "Unknown")
-                            team_b_name = team_map.get(match['team_b_id'], "Unknown")
-                            
-                            m_col1, m_col2 = st.columns([3, 1])
-                            with m_col1:
-                                st.write(f"**Match {match['id']}:** {team_a_name} **VS** {team_b_name} | Status: {match['status']}")
-                            with m_col2:
-                                st.button("Score this Match", key=f"score_{match['id']}", on_click=select_match, args=(match['id'],), disabled=(match['status']=='Completed'))
+                        match_schedule(t, team_map)
 
 except Exception as e:
     st.error(f"An error occurred: {e}")
+
+end_page()
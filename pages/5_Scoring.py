@@ -1,44 +1,87 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-from datetime import datetime, timezone
+from matchpoint.connection import get_standings_book, get_score_outbox, get_match_broker
+from matchpoint.match_context import MatchContext
+from matchpoint.scoring import changes, positioned, rebuild, start, point, set_score, complete
+from matchpoint.standings import SETS
+from matchpoint import profiling
+from matchpoint.page import setup, require_login, connect
+from matchpoint.perf_panel import end_page
 
 # --- PAGE CONFIG ---
-st.set_page_config(page_title="Score Match", page_icon="📝", layout="centered")
-st.title("Score Match 📝")
+setup("Scoring", page_title="Score Match", icon="📝", layout="centered", title="Score Match 📝")
 
-# --- DATABASE CONNECTION AND USER AUTHENTICATION ---
+# --- USER AUTHENTICATION AND DATABASE CONNECTION ---
+session = require_login()
+db = connect()
 try:
-    supabase_url = st.secrets["SUPABASE_URL"]
-    supabase_key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(supabase_url, supabase_key)
+    outbox = get_score_outbox()
 except Exception as e:
     st.error("Error connecting to database. Please check secrets.")
     st.stop()
 
-if not st.session_state.get("logged_in", False):
-    st.warning("You must be logged in to access this page.")
-    st.info("Please log in using the main 'app' page first.")
-    st.stop()
-
 # --- PAGE LOGIC ---
 if st.session_state.get("selected_match_id") is None:
     st.warning("Please select a match to score from the 'Match Management' page first.")
     st.stop()
 
 selected_match_id = st.session_state.selected_match_id
+# Where the match was when this session last showed it; writes are checked against that.
+seen_version_key = f"seen_version_{selected_match_id}"
+
+
+@st.fragment(run_every=2.0)
+def sync_status():
+    pending = outbox.pending()
+    if pending:
+        st.caption(f"⏳ {pending} score update(s) waiting to sync."
+                   + (f" Last attempt failed: {outbox.last_error}" if outbox.last_error else ""))
+    else:
+        st.caption("✅ All scores synced.")
+    # A batch the database rejected is held (with the match's later scores) until it is retried or discarded.
+    for batch in outbox.failed():
+        match_id = batch["match_id"]
+        st.error(f"Match {match_id}: {batch['events']} score update(s) could not be saved. {batch['error']}")
+        retry, discard = st.columns(2)
+        if retry.button("Retry", key=f"retry_failed_{match_id}", use_container_width=True):
+            outbox.retry(match_id, session)
+            st.rerun()
+        if discard.button("Discard", key=f"discard_failed_{match_id}", use_container_width=True):
+            outbox.discard(match_id)
+            st.rerun()
+
 
 try:
-    match_response = supabase.table("matches").select("*, tournaments(*), team_a:teams!matches_team_a_id_fkey(*), team_b:teams!matches_team_b_id_fkey(*)").eq("id", selected_match_id).single().execute()
-    match_data = match_response.data
-    
-    if not match_data:
-        st.error("Could not find the selected match.")
-        st.stop()
+    # The match is loaded once per selection and then only refreshed by realtime changes or a landed save.
+    profiling.mark("load match")
+    context = st.session_state.get("scoring_context")
+    if context is None or context.match_id != selected_match_id:
+        st.session_state.scoring_subscription = get_match_broker().subscribe()
+        context = MatchContext.load(db, selected_match_id)
+        if context is None:
+            st.error("Could not find the selected match.")
+            st.stop()
+        st.session_state.scoring_context = context
+    else:
+        try:
+            context.refresh(db, outbox, st.session_state.scoring_subscription.drain())
+        except Exception as e:
+            # Keep scoring on the copy we have; new scores are queued until the database is back.
+            st.warning(f"Could not reach the database, showing the match as last loaded. ({e})")
+
+    # Show the score including updates still waiting in the queue.
+    match_data = context.current(outbox)
+
+    def write_events(events):
+        """Queue score events; if the match moved on since this umpire last saw it, show it instead."""
+        if context.written_by_others(st.session_state.get(seen_version_key, context.position())):
+            st.session_state.score_conflict = True
+            st.rerun()
+        queued = context.enqueue(outbox, events, session)
+        match_data.update(changes(match_data, positioned(match_data, queued)))
 
     if match_data.get('start_time') is None and match_data['status'] != 'Completed':
         try:
-            supabase.table("matches").update({"start_time": datetime.now(timezone.utc).isoformat()}).eq("id", selected_match_id).execute()
+            write_events([start()])
             st.toast("Match started!")
         except Exception as e:
             st.warning(f"Could not set start time: {e}")
@@ -50,31 +93,84 @@ try:
     st.header(f"Scoring: {team_a_name} VS {team_b_name}")
     st.subheader(f"Tournament: {match_data['tournaments']['name']} ({tournament_sport})")
     st.caption(f"Match ID: {selected_match_id}")
+    sync_status()
+    if st.session_state.pop("score_conflict", False):
+        st.warning("This match was updated by another umpire. The latest score is shown below.")
     st.divider()
 
+    # --- POINT BY POINT ---
+    profiling.mark("point by point")
+    if tournament_sport in ["Badminton", "Pickleball"] and match_data['status'] != 'Completed':
+        st.subheader("Live Scoring")
+        current_set = st.radio("Current set", SETS, horizontal=True, format_func=lambda n: f"Set {n}")
+        c1, c2 = st.columns(2)
+        for column, team, name in [(c1, "a", team_a_name), (c2, "b", team_b_name)]:
+            with column:
+                st.metric(name, match_data.get(f"team_{team}_set{current_set}_score") or 0)
+                plus, minus = st.columns(2)
+                if plus.button("+1", key=f"point_{team}", use_container_width=True):
+                    write_events([point(team, current_set)])
+                    st.rerun()
+                if minus.button("−1", key=f"undo_{team}", use_container_width=True):
+                    write_events([point(team, current_set, -1)])
+                    st.rerun()
+        st.divider()
+
+    profiling.mark("score form")
     with st.form("scoring_form"):
+        version = match_data.get('version') or 0
         scores = {}
         if tournament_sport in ["Badminton", "Pickleball"]:
             st.subheader("Set Scores")
             c1, c2 = st.columns(2)
             with c1:
                 st.write(f"**{team_a_name}**")
-                scores['a1'] = st.number_input("Set 1", min_value=0, step=1, key="a1", value=match_data.get('team_a_set1_score') or 0)
-                scores['a2'] = st.number_input("Set 2", min_value=0, step=1, key="a2", value=match_data.get('team_a_set2_score') or 0)
-                scores['a3'] = st.number_input("Set 3", min_value=0, step=1, key="a3", value=match_data.get('team_a_set3_score') or 0)
+                scores['a1'] = st.number_input("Set 1", min_value=0, step=1, key=f"a1_{version}", value=match_data.get('team_a_set1_score') or 0)
+                scores['a2'] = st.number_input("Set 2", min_value=0, step=1, key=f"a2_{version}", value=match_data.get('team_a_set2_score') or 0)
+                scores['a3'] = st.number_input("Set 3", min_value=0, step=1, key=f"a3_{version}", value=match_data.get('team_a_set3_score') or 0)
             with c2:
                 st.write(f"**{team_b_name}**")
-                scores['b1'] = st.number_input("Set 1", min_value=0, step=1, key="b1", value=match_data.get('team_b_set1_score') or 0, label_visibility="hidden")
-                scores['b2'] = st.number_input("Set 2", min_value=0, step=1, key="b2", value=match_data.get('team_b_set2_score') or 0, label_visibility="hidden")
-                scores['b3'] = st.number_input("Set 3", min_value=0, step=1, key="b3", value=match_data.get('team_b_set3_score') or 0, label_visibility="hidden")
+                scores['b1'] = st.number_input("Set 1", min_value=0, step=1, key=f"b1_{version}", value=match_data.get('team_b_set1_score') or 0, label_visibility="hidden")
+                scores['b2'] = st.number_input("Set 2", min_value=0, step=1, key=f"b2_{version}", value=match_data.get('team_b_set2_score') or 0, label_visibility="hidden")
+                scores['b3'] = st.number_input("Set 3", min_value=0, step=1, key=f"b3_{version}", value=match_data.get('team_b_set3_score') or 0, label_visibility="hidden")
         
         elif tournament_sport == "Captain Ball":
-            # ... (Captain Ball UI is the same) ...
+            st.subheader("Final Score")
+            c1, c2 = st.columns(2)
+            with c1:
+                scores['a1'] = st.number_input(team_a_name, min_value=0, step=1, key=f"a1_{version}", value=match_data.get('team_a_set1_score') or 0)
+            with c2:
+                scores['b1'] = st.number_input(team_b_name, min_value=0, step=1, key=f"b1_{version}", value=match_data.get('team_b_set1_score') or 0)
 
         save_button = st.form_submit_button("Save Final Score")
 
         if save_button:
-            # ... (Save logic is the same) ...
+            events = [set_score(key[0], int(key[1]), value) for key, value in scores.items()]
+            try:
+                write_events(events + [complete()])
+                st.success("Final score saved!")
+            except Exception as e:
+                st.error(f"Could not save the score: {e}")
+
+    st.session_state[seen_version_key] = context.position()
+
+    # --- HISTORY ---
+    profiling.mark("history")
+    if st.toggle("Show scoring history"):
+        history = db.list_score_events(selected_match_id)
+        if history:
+            st.dataframe(history, hide_index=True)
+            if st.button("Rebuild score from history", help="Replays every event into the match row."):
+                rebuild(db, selected_match_id)
+                # The replay bypasses the outbox, so the standings read this tournament again.
+                get_standings_book().forget(match_data['tournament_id'])
+                st.session_state.pop(seen_version_key, None)
+                st.session_state.pop("scoring_context", None)
+                st.rerun()
+        else:
+            st.info("No score events recorded for this match yet.")
 
 except Exception as e:
     st.error(f"An error occurred while fetching match data: {e}")
+
+end_page()
@@ -0,0 +1,61 @@
+import streamlit as st
+from matchpoint.connection import get_scoreboard_cache
+from matchpoint import profiling
+from matchpoint.page import setup, connect
+from matchpoint.perf_panel import end_page
+
+# --- PAGE CONFIG ---
+setup("Scoreboard", page_title="Live Scoreboard", icon="📺", title="Live Scoreboard 📺")
+
+# --- DATABASE CONNECTION ---
+# This page is public: no login check. Every viewer reads the same cached snapshot,
+# so hundreds of spectators cost the database no more than one.
+db = connect(as_user=False)
+try:
+    scoreboard = get_scoreboard_cache()
+except Exception as e:
+    st.error("Error connecting to database. Please check secrets.")
+    st.stop()
+
+DISPLAY_COLUMNS = {"court": "Court", "tournament": "Tournament", "team_a": "Team A", "team_b": "Team B", "score": "Score"}
+
+
+def show_matches(matches):
+    st.dataframe([{label: m[key] for key, label in DISPLAY_COLUMNS.items()} for m in matches], hide_index=True)
+
+
+@st.fragment(run_every=scoreboard.refresh_seconds)
+def live_scoreboard(event_id):
+    snapshot = scoreboard.get(event_id)
+
+    st.header("Now Playing")
+    if snapshot["live"]:
+        show_matches(snapshot["live"])
+    else:
+        st.write("No matches are being played right now.")
+
+    st.header("Latest Results")
+    if snapshot["recent"]:
+        show_matches(snapshot["recent"])
+    else:
+        st.write("No results yet.")
+    st.caption(f"Last updated {snapshot['generated_at'][11:19]} UTC. This board refreshes automatically.")
+
+
+# --- PAGE LOGIC ---
+try:
+    profiling.mark("scoreboard")
+    events = db.list_events()
+    if not events:
+        st.info("There are no events yet.")
+        st.stop()
+
+    event_names = {e['event_name']: e['id'] for e in events}
+    selected_event_name = st.selectbox("Select an Event:", event_names.keys())
+    if selected_event_name:
+        live_scoreboard(event_names[selected_event_name])
+
+except Exception as e:
+    st.error(f"An error occurred: {e}")
+
+end_page()
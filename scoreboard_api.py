@@ -0,0 +1,83 @@
+"""Read-only JSON scoreboard endpoint, served next to the Streamlit app.
+
+    python scoreboard_api.py --port 8502
+    curl http://localhost:8502/events/1/scoreboard.json
+
+Reads SUPABASE_URL and SUPABASE_KEY from the environment, falling back to
+.streamlit/secrets.toml. Responses come from this process's own
+ScoreboardCache (the same class the Scoreboard page uses, but a separate
+instance), so request volume does not reach the database. Nothing is shared
+with the Streamlit server: each process refreshes its snapshots on its own
+schedule.
+"""
+
+import argparse
+import json
+import os
+import re
+import tomllib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.scoreboard import ScoreboardCache, UnknownEvent
+
+ROUTE = re.compile(r"^/events/(\d+)/scoreboard\.json$")
+
+
+def build_repository() -> Repository:
+    if os.environ.get("MATCHPOINT_BACKEND") == "memory":
+        return Repository(MemoryClient())
+    from supabase import create_client
+
+    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY")
+    if not (url and key):
+        with open(os.path.join(".streamlit", "secrets.toml"), "rb") as f:
+            secrets = tomllib.load(f)
+        url, key = secrets["SUPABASE_URL"], secrets["SUPABASE_KEY"]
+    return Repository(create_client(url, key))
+
+
+def make_handler(scoreboard: ScoreboardCache):
+    class ScoreboardHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = ROUTE.match(self.path.split("?")[0])
+            if not match:
+                self.send_error(404, "Use /events/<event_id>/scoreboard.json")
+                return
+            try:
+                body = json.dumps(scoreboard.get(int(match.group(1)))).encode()
+            except UnknownEvent:
+                self.send_error(404, f"No event {match.group(1)}")
+                return
+            except Exception as e:
+                self.send_error(500, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", f"public, max-age={int(scoreboard.refresh_seconds)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScoreboardHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the live scoreboard as JSON.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--refresh", type=float, default=3.0, help="seconds between snapshot rebuilds")
+    args = parser.parse_args()
+
+    scoreboard = ScoreboardCache(build_repository(), refresh_seconds=args.refresh)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(scoreboard))
+    print(f"Scoreboard API listening on http://{args.host}:{args.port}/events/<event_id>/scoreboard.json")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+-- Columns written by the match generator (matchpoint/scheduling.py).
+alter table matches add column if not exists bracket text;
+alter table matches add column if not exists round_number integer;
+alter table matches add column if not exists court_number integer;
+alter table matches add column if not exists time_slot integer;
@@ -0,0 +1,2 @@
+-- Broadcast row changes on matches to the live schedule (matchpoint/realtime.py).
+alter publication supabase_realtime add table matches;
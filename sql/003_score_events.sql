@@ -0,0 +1,16 @@
+-- Append-only scoring log (matchpoint/scoring.py). matches.version is the seq
+-- of the last event folded into the row; the unique key lets one writer claim
+-- each position, which is how concurrent umpires are detected.
+alter table matches add column if not exists version integer not null default 0;
+
+create table if not exists score_events (
+    id bigint generated always as identity primary key,
+    match_id bigint not null references matches(id) on delete cascade,
+    seq integer not null,
+    kind text not null check (kind in ('start', 'point', 'set', 'complete')),
+    team char(1) check (team in ('a', 'b')),
+    set_number smallint,
+    value smallint,
+    created_at timestamptz not null default now(),
+    unique (match_id, seq)
+);
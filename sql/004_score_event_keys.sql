@@ -0,0 +1,2 @@
+-- Idempotency keys for score events sent from the offline queue (matchpoint/outbox.py).
+alter table score_events add column if not exists key uuid unique;
@@ -0,0 +1,8 @@
+-- Roles for page gating (matchpoint/auth.py). Before this migration every signed-in
+-- user could open the Admin Dashboard, so the column is added with 'admin' and every
+-- existing profile keeps that access; profiles created afterwards start as members.
+-- Demote an existing account with: update profiles set role = 'member' where id = '<user id>';
+-- promote a new organiser with: update profiles set role = 'admin' where id = '<user id>';
+alter table profiles add column if not exists role text not null default 'admin'
+    check (role in ('member', 'admin'));
+alter table profiles alter column role set default 'member';
@@ -0,0 +1,94 @@
+-- Per-tournament counts for the dashboards (matchpoint/summary.py). Triggers keep
+-- one row per tournament current as teams and matches change, so an event's
+-- overview is one read of a few rows instead of a scan of its matches.
+-- matches.end_time is stamped by the 'complete' score event (matchpoint/scoring.py).
+alter table matches add column if not exists end_time timestamptz;
+
+create table if not exists tournament_summaries (
+    tournament_id bigint primary key references tournaments(id) on delete cascade,
+    event_id bigint not null references events(id) on delete cascade,
+    teams integer not null default 0,
+    pending integer not null default 0,
+    in_progress integer not null default 0,
+    completed integer not null default 0,
+    timed integer not null default 0,                -- completed with a start and end time
+    duration_seconds double precision not null default 0
+);
+create index if not exists tournament_summaries_event_id on tournament_summaries (event_id);
+
+-- Add (sign = 1) or take back (sign = -1) one match's share of its tournament's row.
+create or replace function add_match_to_summary(m matches, sign integer) returns void
+language sql security definer as $$
+    insert into tournament_summaries as s (tournament_id, event_id, pending, in_progress, completed, timed, duration_seconds)
+    select m.tournament_id, t.event_id,
+           sign * (m.status = 'Pending')::int,
+           sign * (m.status = 'In Progress')::int,
+           sign * (m.status = 'Completed')::int,
+           sign * (m.status = 'Completed' and m.start_time is not null and m.end_time is not null)::int,
+           sign * coalesce(case when m.status = 'Completed' then extract(epoch from m.end_time - m.start_time) end, 0)
+    from tournaments t where t.id = m.tournament_id
+    on conflict (tournament_id) do update set
+        pending = s.pending + excluded.pending,
+        in_progress = s.in_progress + excluded.in_progress,
+        completed = s.completed + excluded.completed,
+        timed = s.timed + excluded.timed,
+        duration_seconds = s.duration_seconds + excluded.duration_seconds;
+$$;
+
+create or replace function matches_summary_trigger() returns trigger
+language plpgsql security definer as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        perform add_match_to_summary(old, -1);
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') then
+        perform add_match_to_summary(new, 1);
+    end if;
+    return null;
+end $$;
+
+-- Score updates leave these columns alone, so a point does not touch the summary.
+drop trigger if exists matches_summary on matches;
+create trigger matches_summary after insert or delete or update of status, start_time, end_time, tournament_id
+    on matches for each row execute function matches_summary_trigger();
+
+create or replace function teams_summary_trigger() returns trigger
+language plpgsql security definer as $$
+declare
+    team teams := coalesce(new, old);
+begin
+    insert into tournament_summaries as s (tournament_id, event_id, teams)
+    select team.tournament_id, t.event_id, case when tg_op = 'INSERT' then 1 else -1 end
+    from tournaments t where t.id = team.tournament_id
+    on conflict (tournament_id) do update set teams = s.teams + excluded.teams;
+    return null;
+end $$;
+
+drop trigger if exists teams_summary on teams;
+create trigger teams_summary after insert or delete on teams for each row execute function teams_summary_trigger();
+
+create or replace function tournaments_summary_trigger() returns trigger
+language plpgsql security definer as $$
+begin
+    insert into tournament_summaries (tournament_id, event_id) values (new.id, new.event_id)
+    on conflict (tournament_id) do nothing;
+    return null;
+end $$;
+
+drop trigger if exists tournaments_summary on tournaments;
+create trigger tournaments_summary after insert on tournaments for each row execute function tournaments_summary_trigger();
+
+-- Backfill from the rows already there.
+insert into tournament_summaries as s (tournament_id, event_id, teams, pending, in_progress, completed, timed, duration_seconds)
+select t.id, t.event_id,
+       (select count(*) from teams where teams.tournament_id = t.id),
+       count(m.id) filter (where m.status = 'Pending'),
+       count(m.id) filter (where m.status = 'In Progress'),
+       count(m.id) filter (where m.status = 'Completed'),
+       count(m.id) filter (where m.status = 'Completed' and m.start_time is not null and m.end_time is not null),
+       coalesce(sum(extract(epoch from m.end_time - m.start_time)) filter (where m.status = 'Completed'), 0)
+from tournaments t left join matches m on m.tournament_id = t.id
+group by t.id, t.event_id
+on conflict (tournament_id) do update set
+    teams = excluded.teams, pending = excluded.pending, in_progress = excluded.in_progress,
+    completed = excluded.completed, timed = excluded.timed, duration_seconds = excluded.duration_seconds;
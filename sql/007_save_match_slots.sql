@@ -0,0 +1,11 @@
+-- Event timetable writes (matchpoint/festival.py). Only the slot and court of each
+-- match are written, and only while the match is still Pending, so a match that
+-- starts or finishes while the timetable is being built keeps its row as it is.
+create or replace function save_match_slots(slots jsonb) returns setof bigint
+language sql as $$
+    update matches m
+       set time_slot = s.time_slot, court_number = s.court_number
+      from jsonb_to_recordset(slots) as s(id bigint, time_slot integer, court_number integer)
+     where m.id = s.id and m.status = 'Pending'
+ returning m.id;
+$$;
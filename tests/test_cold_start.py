@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_cold_start import PAGES, PUBLIC, ROOT
+
+HEAVY = ("supabase", "postgrest", "pandas", "numpy", "pyarrow")
+
+RUNNER = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file({path!r}, default_timeout=60)
+at.run()
+print(json.dumps({{"heavy": sorted(name for name in {heavy!r} if name in sys.modules),
+                  "exceptions": [str(e.value) for e in at.exception]}}))
+"""
+
+
+@pytest.mark.parametrize("page", [page for page in PAGES if page not in PUBLIC])
+def test_a_visitor_who_is_not_signed_in_loads_no_heavy_modules(page):
+    code = RUNNER.format(path=str(ROOT / page), heavy=HEAVY)
+    env = {**os.environ, "MATCHPOINT_BACKEND": "memory", "PYTHONPATH": str(ROOT)}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"heavy": [], "exceptions": []}
@@ -0,0 +1,88 @@
+from matchpoint import outbox as outbox_module
+from matchpoint.match_context import MatchContext
+from matchpoint.memory import MemoryClient
+from matchpoint.outbox import ScoreOutbox
+from matchpoint.repository import Repository
+from matchpoint.scoring import complete, point, record, set_score
+
+
+def one_match():
+    repository = Repository(MemoryClient({"matches": [{"id": 1, "tournament_id": 1, "team_a_id": 1, "team_b_id": 2,
+                                                        "status": "In Progress", "version": 0}]}))
+    return repository, MatchContext.load(repository, 1)
+
+
+def score(repository):
+    return repository.list_match_states([1])[0]
+
+
+def test_a_set_score_typed_over_someone_elses_points_is_held_back():
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    context.enqueue(outbox, [set_score("a", 1, 21), set_score("b", 1, 15), complete()])
+    record(repository, score(repository), [point("b", 1)])  # another umpire, straight to the database
+
+    assert outbox.flush(repository) == 0
+    [failed] = outbox.failed()
+    assert failed["match_id"] == 1 and "another umpire" in failed["error"]
+    assert score(repository)["team_b_set1_score"] == 1
+
+    outbox.retry(1)
+    assert outbox.flush(repository) == 3
+    assert (score(repository)["team_a_set1_score"], score(repository)["status"]) == (21, "Completed")
+
+
+def test_points_are_still_added_after_someone_elses():
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    context.enqueue(outbox, [point("a", 1), point("a", 1)])
+    record(repository, score(repository), [point("a", 1)])
+
+    assert outbox.flush(repository) == 2
+    assert score(repository)["team_a_set1_score"] == 3
+
+
+def test_the_umpires_own_queued_and_sent_events_are_not_a_conflict():
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    context.enqueue(outbox, [point("a", 1)])
+    context.enqueue(outbox, [set_score("a", 1, 5)])
+    assert outbox.flush(repository) == 2
+    # The context has not seen its own events land yet.
+    context.enqueue(outbox, [set_score("b", 1, 7)])
+    assert outbox.flush(repository) == 1
+    assert not outbox.failed()
+    assert (score(repository)["team_a_set1_score"], score(repository)["team_b_set1_score"]) == (5, 7)
+
+
+def test_a_batch_that_landed_before_its_reply_was_lost_is_not_a_conflict():
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    queued = context.enqueue(outbox, [set_score("a", 1, 21), complete()])
+    record(repository, score(repository), queued[:1])
+
+    assert outbox.flush(repository) == 2
+    assert not outbox.failed()
+    assert [e["kind"] for e in repository.list_score_events(1)] == ["set", "complete"]
+
+
+def test_discarded_events_are_not_counted_as_delivered():
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    keys = [event["key"] for event in context.enqueue(outbox, [point("a", 1)] * 2)]
+    outbox._fail(keys, RuntimeError("rejected"))
+    outbox.discard(1)
+
+    context.refresh(repository, outbox, [])
+    assert (context.queued, context.delivered) == (set(), 0)
+
+
+def test_only_the_latest_discarded_keys_are_kept(monkeypatch):
+    monkeypatch.setattr(outbox_module, "MAX_DISCARDED", 3)
+    repository, context = one_match()
+    outbox = ScoreOutbox()
+    keys = [event["key"] for event in context.enqueue(outbox, [point("a", 1)] * 5)]
+    outbox._fail(keys, RuntimeError("rejected"))
+
+    assert outbox.discard(1) == 5
+    assert outbox.discarded(keys) == set(keys[2:])
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from matchpoint.realtime import MatchBroker, Subscription, SupabaseMatchFeed
+
+CHANGE = {"type": "UPDATE", "record": {"id": 1, "tournament_id": 1, "status": "Completed"}, "old_record": {}}
+
+
+def test_a_full_inbox_asks_for_a_reload():
+    subscription = Subscription(max_pending=2)
+    for _ in range(3):
+        subscription.put(CHANGE)
+    assert subscription.drain() is None
+    subscription.put(CHANGE)
+    assert subscription.drain() == [CHANGE]
+
+
+def test_the_feed_reconnects_and_every_subscriber_reloads(monkeypatch):
+    realtime = pytest.importorskip("realtime")
+    pytest.importorskip("supabase")
+    states = realtime.RealtimeSubscribeStates
+    broker = MatchBroker()
+    subscription = broker.subscribe()
+    seen, attempts, done = [], [], asyncio.Event()
+
+    class Channel:
+        def on_postgres_changes(self, event, schema, table, callback):
+            self.callback = callback
+
+        async def subscribe(self, on_status):
+            if len(attempts) == 2:
+                on_status(states.SUBSCRIBED)
+                seen.append(subscription.drain())  # the failed first attempt already asked for a reload
+                self.callback({"data": CHANGE})
+                seen.append(subscription.drain())
+                on_status(states.CHANNEL_ERROR, RuntimeError("socket closed"))
+            else:
+                on_status(states.SUBSCRIBED)
+                seen.append(subscription.drain())  # changes made while it was down are lost
+                done.set()
+
+    class Client:
+        def channel(self, name):
+            return Channel()
+
+        async def remove_all_channels(self):
+            pass
+
+    async def create_client(url, key):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise OSError("no route to host")
+        return Client()
+
+    monkeypatch.setattr("supabase.acreate_client", create_client)
+    feed = SupabaseMatchFeed("http://realtime.invalid", "key", broker, base_delay=0)
+
+    async def run():
+        task = asyncio.create_task(feed._listen())
+        await asyncio.wait_for(done.wait(), timeout=5)
+        task.cancel()
+
+    asyncio.run(run())
+    assert len(attempts) == 3
+    assert seen == [None, [CHANGE], None]
+    assert feed.connections == 2
@@ -0,0 +1,34 @@
+from benchmarks.bench_schedule_load import load_per_tournament
+from benchmarks.synthetic import build_event
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import MATCH_LIST_COLUMNS, Repository
+
+
+def project(row: dict, columns: str) -> dict:
+    return {column: row.get(column) for column in columns.split(", ")}
+
+
+def test_the_schedule_loads_in_one_query_with_the_same_matches():
+    client = MemoryClient(build_event(6, 6, num_brackets=2, completed=0.4, sports=["Badminton", "Captain Ball"]))
+    tournament_ids = [t["id"] for t in client.tables["tournaments"]] + [99]
+    expected = load_per_tournament(client, tournament_ids)
+
+    client.round_trips = 0
+    grouped = Repository(client).matches_by_tournament(tournament_ids)
+    assert client.round_trips == 1
+    assert grouped == {tid: [project(m, MATCH_LIST_COLUMNS) for m in rows] for tid, rows in expected.items()}
+
+
+def test_the_scoring_context_embeds_tournament_and_team_names():
+    client = MemoryClient(build_event(2, 4))
+    match = client.tables["matches"][-1]
+    tournament = next(t for t in client.tables["tournaments"] if t["id"] == match["tournament_id"])
+    names = {t["id"]: t["team_name"] for t in client.tables["teams"]}
+
+    client.round_trips = 0
+    context = Repository(client).get_match_context(match["id"])
+    assert client.round_trips == 1
+    assert context["tournaments"] == {"name": tournament["name"], "sport": tournament["sport"]}
+    assert context["team_a"] == {"team_name": names[match["team_a_id"]]}
+    assert context["team_b"] == {"team_name": names[match["team_b_id"]]}
+    assert Repository(client).get_match_context(-1) is None
@@ -0,0 +1,74 @@
+import itertools
+from collections import Counter
+
+import pytest
+
+from matchpoint.scheduling import assign_brackets, circle_rounds, generate_fixtures
+
+
+@pytest.mark.parametrize("num_teams", [2, 3, 4, 5, 8, 9, 16, 17])
+def test_every_pair_meets_once(num_teams):
+    pairs = Counter(frozenset(pair) for pairs in circle_rounds(num_teams) for pair in pairs)
+    assert pairs == Counter(frozenset(pair) for pair in itertools.combinations(range(num_teams), 2))
+
+
+@pytest.mark.parametrize("num_teams", [2, 3, 4, 5, 8, 9, 16, 17])
+def test_no_team_plays_twice_in_a_round(num_teams):
+    for pairs in circle_rounds(num_teams):
+        teams = [team for pair in pairs for team in pair]
+        assert len(teams) == len(set(teams))
+
+
+@pytest.mark.parametrize("num_teams", [3, 5, 9, 17])
+def test_odd_team_counts_get_one_bye_each(num_teams):
+    rounds = list(circle_rounds(num_teams))
+    assert len(rounds) == num_teams
+    byes = Counter()
+    for pairs in rounds:
+        playing = {team for pair in pairs for team in pair}
+        sitting_out = set(range(num_teams)) - playing
+        assert len(sitting_out) == 1
+        byes.update(sitting_out)
+    assert byes == Counter(range(num_teams))
+
+
+@pytest.mark.parametrize("num_teams", [4, 6])
+def test_even_team_counts_have_no_byes(num_teams):
+    for pairs in circle_rounds(num_teams):
+        assert len(pairs) == num_teams // 2
+
+
+def test_snake_seeding_balances_brackets():
+    assert assign_brackets(list(range(1, 9)), 3) == [[1, 6, 7], [2, 5, 8], [3, 4]]
+
+
+@pytest.mark.parametrize("num_teams, num_brackets, num_courts", [(7, 0, 3), (16, 4, 2), (13, 3, 4)])
+def test_fixtures_keep_teams_and_courts_apart(num_teams, num_brackets, num_courts):
+    team_ids = list(range(100, 100 + num_teams))
+    fixtures = generate_fixtures(team_ids, num_brackets, num_courts)
+    index_of = {team_id: i for i, team_id in enumerate(team_ids)}
+    expected = Counter(
+        frozenset((index_of[a], index_of[b]))
+        for members in assign_brackets(team_ids, num_brackets)
+        for a, b in itertools.combinations(members, 2)
+    )
+    assert Counter(frozenset(pair) for pair in zip(fixtures.team_a, fixtures.team_b)) == expected
+
+    busy = Counter()
+    for slot, a, b in zip(fixtures.slot, fixtures.team_a, fixtures.team_b):
+        busy.update([(slot, a), (slot, b)])
+    assert max(busy.values()) == 1
+    assert max(Counter(zip(fixtures.slot, fixtures.court)).values()) == 1
+    assert set(fixtures.court) <= set(range(num_courts))
+
+
+def test_rows_are_insert_payloads():
+    rows = list(generate_fixtures([10, 20, 30, 40], 2, num_courts=1).rows(tournament_id=7))
+    assert {row["bracket"] for row in rows} == {"A", "B"}
+    assert all(row["tournament_id"] == 7 and row["status"] == "Pending" for row in rows)
+    assert {(row["team_a_id"], row["team_b_id"]) for row in rows} in ({(10, 40), (20, 30)}, {(40, 10), (30, 20)})
+
+
+def test_generate_needs_a_court():
+    with pytest.raises(ValueError):
+        generate_fixtures([1, 2], num_courts=0)
@@ -0,0 +1,95 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.scoreboard import ScoreboardCache, UnknownEvent
+from scoreboard_api import make_handler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def event_tables(num_events: int = 1) -> dict:
+    return {
+        "events": [{"id": i, "event_name": f"Event {i}", "event_date": "2026-01-01"} for i in range(1, num_events + 1)],
+        "tournaments": [{"id": i, "event_id": i, "name": f"Open {i}", "sport": "Badminton"}
+                        for i in range(1, num_events + 1)],
+        "teams": [{"id": i, "tournament_id": 1, "team_name": f"Team {i}"} for i in range(1, 5)],
+        "matches": [],
+    }
+
+
+def test_an_unknown_event_is_refused_and_not_cached():
+    client = MemoryClient(event_tables())
+    clock = Clock()
+    scoreboard = ScoreboardCache(Repository(client), refresh_seconds=3.0, clock=clock)
+    scoreboard.get(1)
+
+    client.round_trips = 0
+    for event_id in range(2, 50):
+        with pytest.raises(UnknownEvent):
+            scoreboard.get(event_id)
+    assert client.round_trips <= 1
+    assert list(scoreboard._snapshots) == [1] and scoreboard.builds == 1
+
+
+def test_a_new_event_shows_up_after_one_refresh():
+    client = MemoryClient(event_tables())
+    clock = Clock()
+    scoreboard = ScoreboardCache(Repository(client), refresh_seconds=3.0, clock=clock)
+    with pytest.raises(UnknownEvent):
+        scoreboard.get(2)
+    client.tables["events"].append({"id": 2, "event_name": "Late", "event_date": "2026-01-02"})
+    with pytest.raises(UnknownEvent):
+        scoreboard.get(2)
+    clock.now += 3.0
+    assert scoreboard.get(2)["event_id"] == 2
+
+
+def test_only_the_most_recently_viewed_events_are_kept():
+    scoreboard = ScoreboardCache(Repository(MemoryClient(event_tables(3))), max_events=2, clock=Clock())
+    for event_id in (1, 2, 1, 3):
+        scoreboard.get(event_id)
+    assert list(scoreboard._snapshots) == [1, 3]
+
+
+def test_recent_results_are_ordered_by_when_they_finished():
+    tables = event_tables()
+    tables["matches"] = [
+        {"id": 1, "tournament_id": 1, "team_a_id": 1, "team_b_id": 2, "status": "Completed",
+         "end_time": "2026-01-01T11:00:00+00:00"},
+        {"id": 2, "tournament_id": 1, "team_a_id": 3, "team_b_id": 4, "status": "Completed",
+         "end_time": "2026-01-01T09:00:00+00:00"},
+        {"id": 3, "tournament_id": 1, "team_a_id": 1, "team_b_id": 3, "status": "Completed", "end_time": None},
+        {"id": 4, "tournament_id": 1, "team_a_id": 2, "team_b_id": 4, "status": "Completed",
+         "end_time": "2026-01-01T10:00:00+00:00"},
+    ]
+    snapshot = ScoreboardCache(Repository(MemoryClient(tables)), clock=Clock()).get(1)
+    assert [m["match_id"] for m in snapshot["recent"]] == [1, 4, 2, 3]
+
+
+def test_the_api_answers_404_for_an_unknown_event():
+    scoreboard = ScoreboardCache(Repository(MemoryClient(event_tables())))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(scoreboard))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/events/1/scoreboard.json") as response:
+            assert json.load(response)["event_id"] == 1
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/events/987654321/scoreboard.json")
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,74 @@
+import io
+import uuid
+
+import pytest
+
+from benchmarks.synthetic import build_event
+from matchpoint import snapshot
+from matchpoint.memory import MemoryClient
+from matchpoint.repository import Repository
+from matchpoint.scoring import point, record
+from matchpoint.snapshot import export_event, import_event
+
+
+def scored_event():
+    repository = Repository(MemoryClient(build_event(2, 4)))
+    for match in repository.list_match_states([1, 2]):
+        record(repository, match, [{**point(team, 1), "key": str(uuid.uuid4())} for team in "ab"])
+    return repository
+
+
+def exported(repository) -> io.BytesIO:
+    buffer = io.BytesIO()
+    export_event(repository, 1, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def rows_under(repository, event_id) -> dict:
+    tournament_ids = [t["id"] for t in repository.client.tables["tournaments"] if t["event_id"] == event_id]
+    match_ids = [m["id"] for m in repository.client.tables["matches"] if m["tournament_id"] in tournament_ids]
+    return {
+        "tournaments": len(tournament_ids),
+        "teams": sum(t["tournament_id"] in tournament_ids for t in repository.client.tables["teams"]),
+        "matches": len(match_ids),
+        "score_events": sum(e["match_id"] in match_ids for e in repository.client.tables["score_events"]),
+    }
+
+
+def test_an_event_can_be_imported_twice_with_new_event_keys():
+    repository = scored_event()
+    bundle = exported(repository)
+    first = import_event(repository, bundle)
+    bundle.seek(0)
+    second = import_event(repository, bundle)
+
+    assert rows_under(repository, first["id"]) == rows_under(repository, second["id"]) == rows_under(repository, 1)
+    keys = [e["key"] for e in repository.client.tables["score_events"]]
+    assert len(keys) == len(set(keys)) == 3 * rows_under(repository, 1)["score_events"]
+
+
+def test_a_failed_import_removes_the_partial_event(monkeypatch):
+    repository = scored_event()
+    before = {table: len(rows) for table, rows in repository.client.tables.items()}
+
+    def create_matches(payloads):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(repository, "create_matches", create_matches)
+    with pytest.raises(RuntimeError, match="connection reset"):
+        import_event(repository, exported(repository))
+    assert {table: len(rows) for table, rows in repository.client.tables.items()} == before
+    assert [e["id"] for e in repository.list_events()] == [1]
+
+
+def test_a_bundle_from_before_event_keys_still_imports(monkeypatch):
+    repository = scored_event()
+    schema = snapshot.SCHEMAS["score_events"]
+    monkeypatch.setitem(snapshot.SCHEMAS, "score_events", schema.remove(schema.get_field_index("key")))
+    bundle = exported(repository)
+    monkeypatch.undo()
+
+    imported = import_event(repository, bundle)
+    assert rows_under(repository, imported["id"]) == rows_under(repository, 1)
+    assert all(e["key"] for e in repository.client.tables["score_events"])
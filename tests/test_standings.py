@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from matchpoint.memory import MemoryClient
+from matchpoint.outbox import ScoreOutbox
+from matchpoint.repository import Repository
+from matchpoint.scheduling import generate_fixtures
+from matchpoint.scoring import complete, set_score
+from matchpoint.standings import KNOCKOUT, STANDINGS_COLUMNS, Standings, StandingsBook, next_round, winner
+
+
+def played(match_id, team_a, team_b, score_a, score_b, bracket="A"):
+    return {"id": match_id, "tournament_id": 1, "team_a_id": team_a, "team_b_id": team_b, "bracket": bracket,
+            "status": "Completed", "team_a_set1_score": score_a, "team_b_set1_score": score_b}
+
+
+def random_result(rng, match):
+    sets, wins_a, wins_b = {}, 0, 0
+    for n in (1, 2, 3):
+        if max(wins_a, wins_b) == 2:
+            break
+        loser = rng.randint(0, 19)
+        a, b = (21, loser) if rng.random() < 0.5 else (loser, 21)
+        wins_a, wins_b = wins_a + (a > b), wins_b + (b > a)
+        sets[f"team_a_set{n}_score"], sets[f"team_b_set{n}_score"] = a, b
+    blank = {f"team_{side}_set{n}_score": None for side in "ab" for n in (1, 2, 3)}
+    return {**match, **blank, **sets, "status": "Completed"}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_standings_match_a_full_recompute(seed):
+    rng = random.Random(seed)
+    fixtures = generate_fixtures(list(range(1, 17)), 4)
+    matches = [{**row, "id": i} for i, row in enumerate(fixtures.rows(tournament_id=1), start=1)]
+    saves = [random_result(rng, match) for match in rng.sample(matches, len(matches))]
+    saves += [random_result(rng, rng.choice(matches)) for _ in range(40)]
+    saves += [{**rng.choice(matches), "status": "In Progress"} for _ in range(5)]
+
+    incremental = Standings.rebuild(1, matches)
+    latest = {match["id"]: match for match in matches}
+    for saved in saves:
+        latest[saved["id"]] = saved
+        incremental.apply(saved)
+        assert incremental.snapshot() == Standings.rebuild(1, list(latest.values())).snapshot()
+
+
+def test_a_two_way_tie_goes_to_head_to_head():
+    standings = Standings.rebuild(1, [
+        played(1, 1, 2, 21, 20), played(2, 2, 3, 21, 0), played(3, 2, 4, 21, 0),
+        played(4, 3, 1, 21, 0), played(5, 1, 4, 21, 19), played(6, 4, 3, 21, 20),
+    ])
+    # 1 and 2 have two wins each, 3 and 4 one each; the head-to-head winner goes first despite worse differences.
+    assert [row.team_id for row in standings.ranking("A")] == [1, 2, 4, 3]
+
+
+def test_a_three_way_tie_falls_back_to_set_and_point_difference():
+    standings = Standings.rebuild(1, [played(1, 1, 2, 21, 19), played(2, 2, 3, 21, 5), played(3, 3, 1, 21, 10)])
+    assert [row.team_id for row in standings.ranking("A")] == [2, 3, 1]
+
+
+def test_a_single_table_sends_its_top_four_through():
+    standings = Standings.rebuild(1, [
+        played(i, a, b, 21, 10) for i, (a, b) in enumerate([(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)], 1)
+    ])
+    assert standings.knockout_pairings() == [(1, 4), (2, 3)]
+
+
+def test_knockout_seeding_keeps_brackets_and_top_seeds_apart():
+    # Bracket winners are seeded by point difference: 1, 11, 21, 31; runners-up 32, 22, 12, 2.
+    standings = Standings.rebuild(1, [
+        played(i, 10 * i + 1, 10 * i + 2, 21, 5 * i, bracket=bracket) for i, bracket in enumerate("ABCD")
+    ])
+    assert standings.knockout_pairings() == [(1, 12), (31, 22), (11, 2), (21, 32)]
+
+
+def knockout_match(match_id, round_number, team_a, team_b, won_by=None):
+    match = {"id": match_id, "tournament_id": 1, "team_a_id": team_a, "team_b_id": team_b,
+             "bracket": KNOCKOUT, "round_number": round_number, "status": "Pending"}
+    if won_by is not None:
+        match.update(status="Completed", team_a_set1_score=21 if won_by == team_a else 10,
+                     team_b_set1_score=21 if won_by == team_b else 10)
+    return match
+
+
+def test_next_round_waits_for_both_feeders():
+    first = [knockout_match(1, 1, 1, 8, won_by=8), knockout_match(2, 1, 4, 5),
+             knockout_match(3, 1, 2, 7, won_by=2), knockout_match(4, 1, 3, 6, won_by=3)]
+    assert [(row["round_number"], row["team_a_id"], row["team_b_id"]) for row in next_round(1, first)] == [(2, 2, 3)]
+
+
+def test_next_round_does_not_create_a_match_twice():
+    matches = [knockout_match(1, 1, 1, 4, won_by=1), knockout_match(2, 1, 2, 3, won_by=3),
+               knockout_match(3, 2, 1, 3)]
+    assert next_round(1, matches) == []
+    matches[2] = knockout_match(3, 2, 1, 3, won_by=3)
+    assert next_round(1, matches) == []
+
+
+def test_saved_scores_play_a_tournament_through_to_the_final():
+    repository = Repository(MemoryClient())
+    repository.create_matches(list(generate_fixtures(list(range(1, 17)), 4).rows(tournament_id=1)))
+    book = StandingsBook()
+    outbox = ScoreOutbox()
+    outbox.listeners.append(book.saved)
+    rng = random.Random(7)
+
+    def play(match):
+        a_wins = rng.random() < 0.5
+        outbox.enqueue(match["id"], [set_score("a", 1, 21 if a_wins else 15), set_score("b", 1, 15 if a_wins else 21),
+                                     complete()])
+        outbox.flush(repository)
+
+    for match in repository.list_matches([1], columns=STANDINGS_COLUMNS):
+        assert not repository.list_bracket_matches(1, KNOCKOUT)
+        play(match)
+    assert len(repository.list_bracket_matches(1, KNOCKOUT)) == 4
+
+    while pending := [m for m in repository.list_bracket_matches(1, KNOCKOUT, columns=STANDINGS_COLUMNS)
+                      if m["status"] == "Pending"]:
+        play(rng.choice(pending))
+    knockout = repository.list_bracket_matches(1, KNOCKOUT, columns=STANDINGS_COLUMNS)
+    assert [m["round_number"] for m in knockout] == [1, 1, 1, 1, 2, 2, 3]
+    semi_finalists = {team for m in knockout if m["round_number"] == 2 for team in (m["team_a_id"], m["team_b_id"])}
+    assert semi_finalists == {winner(m) for m in knockout if m["round_number"] == 1}
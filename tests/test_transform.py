@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from benchmarks.bench_transform import legacy_teams, legacy_tournaments, make_frames
+from matchpoint.transform import format_to_brackets, team_payloads, tournament_payloads
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return make_frames(500, seed=10)
+
+
+@pytest.mark.parametrize("sport", ["Badminton", None])
+def test_tournament_payloads_match_the_iterrows_loop(frames, sport):
+    tournaments, _ = frames
+    args = (tournaments, 7) if sport is None else (tournaments, 7, sport)
+    assert tournament_payloads(*args) == legacy_tournaments(*args)
+
+
+@pytest.mark.parametrize("sport", ["Badminton", "Pickleball", "Captain Ball"])
+def test_team_payloads_match_the_iterrows_loop(frames, sport):
+    _, teams = frames
+    assert team_payloads(teams, 3, sport) == legacy_teams(teams, 3, sport)
+
+
+def test_formats_become_bracket_counts():
+    formats = pd.Series(["Full Round Robin", "2 Brackets", "4 Brackets"])
+    assert format_to_brackets(formats).tolist() == [0, 2, 4]
+
+
+def test_rows_left_empty_are_dropped():
+    tournaments = pd.DataFrame({"Tournament Name": ["Open", None], "Match Type": ["Standard"] * 2,
+                                "Format": ["2 Brackets"] * 2})
+    assert [t["name"] for t in tournament_payloads(tournaments, 1, "Badminton")] == ["Open"]
+    teams = pd.DataFrame({"Team Name": ["A", "B", None], "Player 1 Name": ["a1", None, "c1"],
+                          "Player 2 Name": ["a2", "b2", "c2"]})
+    assert [t["team_name"] for t in team_payloads(teams, 1, "Badminton")] == ["A"]
+
+
+def test_doubles_teams_need_player_columns():
+    assert team_payloads(pd.DataFrame({"Team Name": ["A"]}), 1, "Badminton") == []
+    assert team_payloads(pd.DataFrame({"Team Name": ["A"]}), 1, "Captain Ball") == [
+        {"tournament_id": 1, "team_name": "A"}
+    ]